@@ -1,5 +1,4 @@
 #!/usr/bin/env python
-import pandas as pd
 import sys
 import json
 from datetime import datetime
@@ -8,6 +7,9 @@ def analyze_excel(file_path):
     """
     Analyse le fichier Excel pour comprendre sa structure
     """
+    # pandas n'est importé que si un fichier est réellement analysé
+    import pandas as pd
+    
     try:
         # Lire le fichier Excel
         print(f"Lecture du fichier: {file_path}")
@@ -0,0 +1,393 @@
+"""
+Benchmark du pipeline d'import Excel.
+
+Pour chaque taille demandée, un classeur synthétique est généré (voir
+synthetic_workbook.py) puis traité dans un processus séparé, ce qui isole la
+mémoire maximale (RSS) de chaque mesure. Les étapes sont chronométrées
+séparément:
+
+    load_excel_data      lecture du classeur et construction des DataFrames
+    clean_data           nettoyage des DataFrames
+    process_course_data  extraction des cours
+    save_to_json         sérialisation JSON
+
+Le démarrage à froid est mesuré à part: durée de `excel_processor.py --help`
+et d'un import du plus petit classeur avec chaque moteur, et détail des
+imports relevé avec `python -X importtime`.
+
+L'analyse des titres de cours (excel_titles) peut être mesurée seule avec
+--titles N: N titres répétés, cache LRU vide puis chaud.
+
+Les résultats sont écrits en JSON (--output) et peuvent être comparés à ceux
+d'un autre commit (--compare).
+
+Usage:
+    python scripts/excel/benchmark.py --sizes 100,1000,10000 --output bench.json
+    python scripts/excel/benchmark.py --engine openpyxl --compare bench.json
+    python scripts/excel/benchmark.py --titles 100000
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROCESSOR_SCRIPT = os.path.join(SCRIPT_DIR, 'excel_processor.py')
+STAGES = ['load_excel_data', 'clean_data', 'process_course_data', 'save_to_json']
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+
+def run_pipeline(excel_path, output_dir, engine='pandas'):
+    """
+    Exécute le pipeline une fois en chronométrant chaque étape
+
+    Args:
+        excel_path (str): Classeur à traiter
+        output_dir (str): Répertoire de sortie du JSON
+        engine (str): Moteur de l'ExcelProcessor ('pandas' ou 'openpyxl')
+
+    Returns:
+        tuple: (durées par étape en secondes, nombre de cours)
+    """
+    from excel_processor import ExcelProcessor
+
+    processor = ExcelProcessor(excel_path, engine=engine)
+    timings = {}
+
+    start = time.perf_counter()
+    data_frames = processor.load_excel_data(clean=False)
+    timings['load_excel_data'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    data_frames = {name: processor.clean_data(df) for name, df in data_frames.items()}
+    timings['clean_data'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    courses = processor.process_course_data(data_frames)
+    timings['process_course_data'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    processor.save_to_json(courses, os.path.join(output_dir, 'courses.json'))
+    timings['save_to_json'] = time.perf_counter() - start
+
+    return timings, len(courses)
+
+
+def run_one(excel_path, repeat, keep_logs=False, engine='pandas'):
+    """
+    Mesure un classeur dans le processus courant (appelé par le processus parent)
+
+    Returns:
+        dict: Durées min/médiane par étape, nombre de cours et RSS maximale
+    """
+    import logging
+
+    if keep_logs:
+        # Conserver le coût de formatage des logs sans polluer la sortie
+        from excel_logging import configure_logging
+        configure_logging('INFO', stream=open(os.devnull, 'w'))
+    else:
+        logging.disable(logging.INFO)
+
+    samples = {stage: [] for stage in STAGES}
+    courses = 0
+    with tempfile.TemporaryDirectory() as output_dir:
+        for _ in range(repeat):
+            timings, courses = run_pipeline(excel_path, output_dir, engine)
+            for stage, duration in timings.items():
+                samples[stage].append(duration)
+
+    stages = {stage: {'min': min(values), 'median': statistics.median(values)}
+              for stage, values in samples.items()}
+    return {
+        'courses': courses,
+        'stages': stages,
+        'total': sum(stage['min'] for stage in stages.values()),
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def parse_importtime(stderr):
+    """
+    Relève les imports de premier niveau dans la sortie de `python -X importtime`
+
+    Args:
+        stderr (str): Sortie d'erreur du processus
+
+    Returns:
+        dict: Durée cumulée en microsecondes par module importé directement
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2]
+        # Les sous-imports sont indentés de deux espaces par niveau
+        if name.startswith(' ') and not name.startswith('  '):
+            modules[name.strip()] = modules.get(name.strip(), 0) + int(parts[1])
+    return modules
+
+
+def measure_startup(excel_path, repeat=3):
+    """
+    Mesure le démarrage à froid de excel_processor.py
+
+    Chaque commande est lancée `repeat` fois (la durée minimale est retenue),
+    puis une fois avec -X importtime pour le détail des imports.
+
+    Args:
+        excel_path (str): Petit classeur utilisé pour les imports complets
+        repeat (int): Nombre d'exécutions par commande
+
+    Returns:
+        dict: Par commande, durée, temps d'import, modules les plus coûteux et chargement de pandas
+    """
+    env = dict(os.environ, EXCEL_LOG_LEVEL='WARNING')
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        output_path = os.path.join(output_dir, 'courses.json')
+        commands = {
+            'help': ['--help'],
+            'engine_pandas': [excel_path, output_path, '--no-cache', '--engine', 'pandas'],
+            'engine_openpyxl': [excel_path, output_path, '--no-cache', '--engine', 'openpyxl'],
+        }
+        for label, arguments in commands.items():
+            durations = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, PROCESSOR_SCRIPT] + arguments, env=env, check=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                durations.append(time.perf_counter() - start)
+
+            traced = subprocess.run([sys.executable, '-X', 'importtime', PROCESSOR_SCRIPT] + arguments, env=env,
+                                    check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            modules = parse_importtime(traced.stderr)
+            top = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:10]
+            results[label] = {
+                'wall': min(durations),
+                'import_ms': sum(modules.values()) / 1000,
+                'pandas_imported': any(line.rstrip().endswith('| pandas') for line in traced.stderr.splitlines()),
+                'top_imports_ms': {name: micros / 1000 for name, micros in top},
+            }
+            print(f"démarrage {label}: {results[label]['wall']:.3f}s "
+                  f"(imports {results[label]['import_ms']:.0f} ms)", file=sys.stderr)
+    return results
+
+
+def measure_titles(count, repeat=3, seed=0):
+    """
+    Mesure l'analyse des titres de cours (TitleTokenizer)
+
+    Les titres sont tirés parmi quelques centaines de combinaisons, comme dans
+    un vrai classeur où le même cours revient d'une semaine à l'autre.
+
+    Args:
+        count (int): Nombre de titres analysés par exécution
+        repeat (int): Nombre d'exécutions (la durée minimale est retenue)
+        seed (int): Graine du générateur
+
+    Returns:
+        dict: Durées cache vide / cache chaud et statistiques du cache
+    """
+    import random
+
+    from excel_processor import ExcelProcessor
+    from excel_titles import TitleTokenizer
+
+    processor = ExcelProcessor(None)
+    rng = random.Random(seed)
+    coaches = [f"Coach{index} Name{index}" for index in range(40)]
+    distinct = [f"{rng.choice(coaches)} - {rng.choice(processor.course_level_patterns)} - "
+                f"{rng.choice(processor.schedule_patterns)} - {rng.randint(1, 12)}:{rng.choice(['00', '30'])}"
+                f"{rng.choice(['am', 'pm'])}"
+                for _ in range(300)]
+    titles = [rng.choice(distinct) for _ in range(count)]
+
+    cold, warm = [], []
+    for _ in range(repeat):
+        tokenizer = TitleTokenizer(processor.schedule_patterns, processor.course_level_patterns,
+                                   processor.time_pattern)
+        start = time.perf_counter()
+        tokenizer.parse_many(titles)
+        cold.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        tokenizer.parse_many(titles)
+        warm.append(time.perf_counter() - start)
+
+    info = tokenizer.cache_info()
+    result = {
+        'titles': count,
+        'distinct': len(set(titles)),
+        'cold': min(cold),
+        'warm': min(warm),
+        'titles_per_second': count / min(cold) if min(cold) else None,
+        'cache': {'hits': info.hits, 'misses': info.misses, 'currsize': info.currsize},
+    }
+    print(f"titres: {count} ({result['distinct']} distincts), cache vide {result['cold']:.4f}s, "
+          f"cache chaud {result['warm']:.4f}s", file=sys.stderr)
+    return result
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPT_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _package_version(name):
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return None
+
+
+def run_benchmark(sizes, repeat=3, workdir=None, seed=0, keep_logs=False, engine='pandas', startup=True):
+    """
+    Exécute le benchmark pour chaque taille, chacune dans un processus séparé
+
+    Args:
+        sizes (list): Nombres de lignes par feuille
+        repeat (int): Nombre d'exécutions par taille (la durée minimale est retenue)
+        workdir (str, optional): Répertoire des classeurs générés (réutilisés s'ils existent)
+        seed (int): Graine du générateur
+        keep_logs (bool): Mesurer avec les logs INFO activés (écrits vers /dev/null)
+        engine (str): Moteur de l'ExcelProcessor ('pandas' ou 'openpyxl')
+        startup (bool): Mesurer aussi le démarrage à froid (measure_startup)
+
+    Returns:
+        dict: Résultats {'meta': ..., 'results': [...]}
+    """
+    from synthetic_workbook import write_workbook
+
+    workdir = workdir or os.path.join(tempfile.gettempdir(), 'excel_benchmark')
+    os.makedirs(workdir, exist_ok=True)
+
+    results = []
+    for rows in sizes:
+        excel_path = os.path.join(workdir, f"synthetic_{rows}_{seed}.xlsx")
+        if not os.path.exists(excel_path):
+            write_workbook(excel_path, rows, seed)
+
+        command = [sys.executable, os.path.abspath(__file__), '--run-one', excel_path, '--repeat', str(repeat),
+                   '--engine', engine]
+        if keep_logs:
+            command.append('--keep-logs')
+        output = subprocess.check_output(command, text=True)
+        result = json.loads(output.strip().splitlines()[-1])
+        result['rows'] = rows
+        result['file_size'] = os.path.getsize(excel_path)
+        results.append(result)
+        print(f"{rows:>7} lignes: {result['total']:.3f}s, {result['courses']} cours, "
+              f"RSS max {result['peak_rss_mb']:.0f} Mo", file=sys.stderr)
+
+    smallest = os.path.join(workdir, f"synthetic_{min(sizes)}_{seed}.xlsx")
+    startup_results = measure_startup(smallest, repeat) if startup and sizes else None
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': _git_revision(),
+            'python': platform.python_version(),
+            'pandas': _package_version('pandas'),
+            'openpyxl': _package_version('openpyxl'),
+            'repeat': repeat,
+            'seed': seed,
+            'keep_logs': keep_logs,
+            'engine': engine,
+        },
+        'results': results,
+        'startup': startup_results,
+    }
+
+
+def compare(baseline, current):
+    """
+    Compare deux résultats de benchmark, taille par taille et étape par étape
+
+    Returns:
+        list: Lignes de texte du rapport
+    """
+    lines = [f"Référence: {baseline['meta'].get('git_revision')}  Actuel: {current['meta'].get('git_revision')}"]
+    baseline_by_rows = {result['rows']: result for result in baseline['results']}
+
+    for result in current['results']:
+        base = baseline_by_rows.get(result['rows'])
+        if base is None:
+            continue
+        lines.append(f"{result['rows']} lignes:")
+        for stage in STAGES + ['total']:
+            before = base['total'] if stage == 'total' else base['stages'][stage]['min']
+            after = result['total'] if stage == 'total' else result['stages'][stage]['min']
+            ratio = after / before if before else float('inf')
+            lines.append(f"  {stage:<20} {before:9.4f}s -> {after:9.4f}s  x{ratio:.2f}")
+        lines.append(f"  {'peak_rss_mb':<20} {base['peak_rss_mb']:9.1f}  -> {result['peak_rss_mb']:9.1f}")
+
+    if baseline.get('startup') and current.get('startup'):
+        lines.append("Démarrage à froid:")
+        for label, after in current['startup'].items():
+            before = baseline['startup'].get(label)
+            if before:
+                lines.append(f"  {label:<20} {before['wall']:9.4f}s -> {after['wall']:9.4f}s  "
+                             f"x{after['wall'] / before['wall']:.2f}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline d'import Excel")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="Nombres de lignes par feuille, séparés par des virgules")
+    parser.add_argument('--repeat', type=int, default=3, help="Exécutions par taille (défaut: 3)")
+    parser.add_argument('--seed', type=int, default=0, help="Graine du générateur (défaut: 0)")
+    parser.add_argument('--workdir', default=None, help="Répertoire des classeurs générés")
+    parser.add_argument('--output', default=None, help="Fichier JSON des résultats")
+    parser.add_argument('--compare', default=None, help="Résultats de référence à comparer")
+    parser.add_argument('--keep-logs', action='store_true', help="Mesurer avec les logs INFO activés")
+    parser.add_argument('--engine', choices=['pandas', 'openpyxl'], default='pandas',
+                        help="Moteur de l'ExcelProcessor mesuré (défaut: pandas)")
+    parser.add_argument('--skip-startup', action='store_true', help="Ne pas mesurer le démarrage à froid")
+    parser.add_argument('--titles', type=int, default=None,
+                        help="Mesurer seulement l'analyse de N titres de cours")
+    parser.add_argument('--run-one', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_one:
+        print(json.dumps(run_one(args.run_one, args.repeat, args.keep_logs, args.engine)))
+        return 0
+
+    if args.titles:
+        print(json.dumps(measure_titles(args.titles, args.repeat, args.seed), indent=2))
+        return 0
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    results = run_benchmark(sizes, repeat=args.repeat, workdir=args.workdir, seed=args.seed,
+                            keep_logs=args.keep_logs, engine=args.engine, startup=not args.skip_startup)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print('\n'.join(compare(baseline, results)), file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Import parallèle de plusieurs classeurs Excel.
+
+Chaque classeur est traité par un processus du pool (un par fichier). Les
+résultats sont transmis dès qu'un fichier est terminé, puis fusionnés dans
+l'ordre des chemins: le résultat final ne dépend pas de l'ordre d'arrivée.
+Un cours déjà fourni par un fichier précédent (même type de planning et même
+identité) n'est pas repris; de même pour un message programmé identique
+(même chat, même texte, même date d'envoi).
+"""
+import glob
+import logging
+import os
+
+from excel_diff import course_key
+
+logger = logging.getLogger('excel_processor.batch')
+
+
+def collect_workbooks(target):
+    """
+    Liste les classeurs d'un répertoire ou correspondant à un motif glob
+
+    Args:
+        target (str): Répertoire ou motif glob (ex: 'imports/*.xlsx')
+
+    Returns:
+        list: Chemins triés des fichiers .xlsx (fichiers verrous Excel '~$' exclus)
+    """
+    if os.path.isdir(target):
+        paths = glob.glob(os.path.join(target, '*.xlsx'))
+    else:
+        paths = glob.glob(target, recursive=True)
+
+    return sorted(path for path in paths
+                  if os.path.isfile(path) and not os.path.basename(path).startswith('~$'))
+
+
+def process_workbook(excel_path, cache_options=None, engine='pandas', sheet_executor=None):
+    """
+    Traite un classeur dans un processus du pool
+
+    Args:
+        excel_path (str): Chemin du fichier Excel
+        cache_options (dict, optional): Arguments de CourseCache, None pour désactiver le cache
+        engine (str): Moteur de l'ExcelProcessor ('pandas' ou 'openpyxl')
+        sheet_executor (str, optional): 'thread' ou 'process' pour traiter les feuilles en parallèle
+
+    Returns:
+        tuple: (liste des cours ou None en cas d'erreur, messages programmés)
+    """
+    from excel_processor import ExcelProcessor, open_cache
+
+    processor = ExcelProcessor(excel_path, cache=open_cache(cache_options), sheet_executor=sheet_executor,
+                               engine=engine)
+    courses = processor.process_with_error_handling()
+    return courses, processor.messages
+
+
+def merge_results(results):
+    """
+    Fusionne les cours de plusieurs fichiers en retirant les doublons entre fichiers
+
+    Args:
+        results (dict): Cours par chemin de fichier (None pour un fichier en échec)
+
+    Returns:
+        list: Cours fusionnés, dans l'ordre des chemins puis des cours
+    """
+    courses = []
+    seen = set()
+    for path in sorted(results):
+        file_courses = results[path] or []
+        file_keys = set()
+        for course in file_courses:
+            key = (course.get('schedule_type'),) + course_key(course)
+            if key in seen:
+                continue
+            file_keys.add(key)
+            courses.append(course)
+        seen |= file_keys
+    return courses
+
+
+def merge_messages(results):
+    """
+    Fusionne les messages programmés de plusieurs fichiers en retirant les doublons
+
+    Args:
+        results (dict): Messages (ScheduledMessage) par chemin de fichier
+
+    Returns:
+        list: Messages fusionnés, dans l'ordre des chemins puis des messages
+    """
+    messages = []
+    seen = set()
+    for path in sorted(results):
+        for message in results[path]:
+            if message not in seen:
+                seen.add(message)
+                messages.append(message)
+    return messages
+
+
+def process_batch(paths, workers=None, cache_options=None, on_result=None, engine='pandas', sheet_executor=None):
+    """
+    Traite plusieurs classeurs en parallèle
+
+    Args:
+        paths (list): Chemins des fichiers Excel
+        workers (int, optional): Nombre de processus (nombre de cœurs par défaut)
+        cache_options (dict, optional): Arguments de CourseCache, None pour désactiver le cache
+        on_result (callable, optional): Appelé avec (chemin, cours ou None, messages) dès qu'un fichier est traité
+        engine (str): Moteur de l'ExcelProcessor ('pandas' ou 'openpyxl')
+        sheet_executor (str, optional): 'thread' ou 'process' pour traiter les feuilles de chaque fichier en parallèle
+
+    Returns:
+        tuple: (cours fusionnés, messages fusionnés, liste des fichiers en échec)
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    results = {}
+    messages = {}
+    workers = min(workers or os.cpu_count() or 1, max(1, len(paths)))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_workbook, path, cache_options, engine, sheet_executor): path
+                   for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                courses, file_messages = future.result()
+            except Exception as e:
+                logger.error(f"Erreur lors du traitement de {path}: {str(e)}")
+                courses, file_messages = None, []
+
+            results[path] = courses
+            messages[path] = file_messages if courses is not None else []
+            if on_result:
+                on_result(path, courses, messages[path])
+
+    failed = sorted(path for path, courses in results.items() if courses is None)
+    merged = merge_results(results)
+    merged_messages = merge_messages(messages)
+    logger.info(f"Lot terminé: {len(paths)} fichier(s), {len(failed)} en échec, {len(merged)} cours, "
+                f"{len(merged_messages)} messages programmés")
+    return merged, merged_messages, failed
@@ -0,0 +1,271 @@
+"""
+Cache disque des cours (et messages programmés) extraits, indexé par l'empreinte du fichier Excel.
+
+L'empreinte combine la taille, la date de modification et le SHA-256 du
+contenu. Un index (chemin -> taille, mtime, sha256) évite de recalculer le
+hash d'un fichier dont la taille et la date n'ont pas changé; un fichier
+modifié puis restauré à l'identique est retrouvé par son hash.
+
+Pour chaque chemin de classeur, le cache garde aussi les cours produits par
+chaque ligne lors du dernier import (voir excel_rowcache): quand le fichier
+est modifié, seules les lignes changées sont réanalysées.
+
+Chaque entrée est un fichier JSON compact portant CACHE_SCHEMA_VERSION et
+EXTRACTOR_VERSION: incrémenter la première dès que le format des cours
+extraits change, la seconde dès que les règles d'extraction changent
+(lecture des feuilles, analyse des titres, détection des dispositions...).
+Incrémenter l'une ou l'autre invalide toutes les entrées existantes, cours
+par ligne compris. La taille totale du cache est bornée; les entrées les
+moins récemment utilisées sont supprimées en premier.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from excel_models import json_default
+
+logger = logging.getLogger('excel_processor.cache')
+
+CACHE_SCHEMA_VERSION = 2
+EXTRACTOR_VERSION = 3
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'cache', 'excel'
+)
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+_INDEX_FILE = 'index.json'
+_ENTRY_SUFFIX = '.courses.json'
+_ROWS_SUFFIX = '.rows.json'
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """
+    Calcule le SHA-256 d'un fichier par blocs
+
+    Args:
+        path (str): Chemin du fichier
+
+    Returns:
+        str: Hash hexadécimal
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'), default=json_default)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _is_current(entry):
+    # Entrée écrite avec le format et les règles d'extraction actuels
+    return (entry.get('schema_version') == CACHE_SCHEMA_VERSION
+            and entry.get('extractor_version') == EXTRACTOR_VERSION)
+
+
+class CourseCache:
+    """
+    Cache des listes de cours extraites, borné en taille (LRU)
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialise le cache.
+
+        Args:
+            cache_dir (str, optional): Répertoire du cache (data/cache/excel par défaut)
+            max_bytes (int): Taille totale maximale des entrées
+        """
+        self.cache_dir = os.path.abspath(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, _INDEX_FILE)
+
+    def _entry_path(self, sha256):
+        return os.path.join(self.cache_dir, sha256 + _ENTRY_SUFFIX)
+
+    def _rows_path(self, excel_path):
+        # Indexé par le chemin: le contenu du fichier est justement ce qui a changé
+        path_hash = hashlib.sha256(os.path.abspath(excel_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, path_hash + _ROWS_SUFFIX)
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get('schema_version') != CACHE_SCHEMA_VERSION:
+            return {}
+        return index.get('files', {})
+
+    def _save_index(self, files):
+        _write_atomic(self._index_path(), {'schema_version': CACHE_SCHEMA_VERSION, 'files': files})
+
+    def fingerprint(self, excel_path):
+        """
+        Calcule l'empreinte d'un fichier Excel (taille, mtime, SHA-256)
+
+        Le hash est repris de l'index si la taille et la date n'ont pas changé.
+
+        Args:
+            excel_path (str): Chemin du fichier Excel
+
+        Returns:
+            dict: Empreinte {'size', 'mtime_ns', 'sha256'}
+        """
+        path = os.path.abspath(excel_path)
+        stat = os.stat(path)
+        files = self._load_index()
+
+        known = files.get(path)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known
+
+        fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_sha256(path)}
+        files = {known_path: entry for known_path, entry in files.items() if os.path.exists(known_path)}
+        files[path] = fingerprint
+        self._save_index(files)
+        return fingerprint
+
+    def get_entry(self, excel_path):
+        """
+        Renvoie l'entrée en cache pour ce fichier, ou None
+
+        Args:
+            excel_path (str): Chemin du fichier Excel
+
+        Returns:
+            dict: Entrée {'courses', 'messages', ...}, ou None si absente ou obsolète
+        """
+        fingerprint = self.fingerprint(excel_path)
+        entry_path = self._entry_path(fingerprint['sha256'])
+
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not _is_current(entry) or entry.get('sha256') != fingerprint['sha256']:
+            return None
+
+        # Marquer l'entrée comme récemment utilisée pour l'éviction LRU
+        os.utime(entry_path)
+        return entry
+
+    def get(self, excel_path):
+        """
+        Renvoie les cours en cache pour ce fichier, ou None
+
+        Args:
+            excel_path (str): Chemin du fichier Excel
+
+        Returns:
+            list: Liste des cours, ou None si absente ou obsolète
+        """
+        entry = self.get_entry(excel_path)
+        return None if entry is None else entry['courses']
+
+    def put(self, excel_path, courses, messages=()):
+        """
+        Enregistre les cours extraits pour ce fichier puis applique la limite de taille
+
+        Args:
+            excel_path (str): Chemin du fichier Excel
+            courses (list): Liste des cours extraits
+            messages (list): Messages programmés (ScheduledMessage)
+        """
+        fingerprint = self.fingerprint(excel_path)
+        _write_atomic(self._entry_path(fingerprint['sha256']), {
+            'schema_version': CACHE_SCHEMA_VERSION,
+            'extractor_version': EXTRACTOR_VERSION,
+            'sha256': fingerprint['sha256'],
+            'size': fingerprint['size'],
+            'courses': courses,
+            'messages': [message.to_dict() for message in messages],
+        })
+        self.evict()
+
+    def get_rows(self, excel_path):
+        """
+        Renvoie les cours par ligne du dernier import de ce chemin, ou None
+
+        Args:
+            excel_path (str): Chemin du fichier Excel
+
+        Returns:
+            dict: Forme sérialisée d'un RowCache, ou None si absente ou obsolète
+        """
+        rows_path = self._rows_path(excel_path)
+        try:
+            with open(rows_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not _is_current(entry):
+            return None
+        os.utime(rows_path)
+        return entry.get('rows')
+
+    def put_rows(self, excel_path, rows):
+        """
+        Enregistre les cours par ligne de ce chemin (remplace l'import précédent)
+
+        Args:
+            excel_path (str): Chemin du fichier Excel
+            rows (dict): Forme sérialisée d'un RowCache (RowCache.to_dict)
+        """
+        _write_atomic(self._rows_path(excel_path), {'schema_version': CACHE_SCHEMA_VERSION,
+                                                    'extractor_version': EXTRACTOR_VERSION, 'rows': rows})
+        self.evict()
+
+    def evict(self):
+        """
+        Supprime les entrées les moins récemment utilisées au-delà de max_bytes
+
+        Returns:
+            int: Nombre d'entrées supprimées
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith((_ENTRY_SUFFIX, _ROWS_SUFFIX)):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"Cache: {removed} entrée(s) supprimée(s)")
+        return removed
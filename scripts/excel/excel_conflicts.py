@@ -0,0 +1,244 @@
+"""
+Détection des conflits d'horaires: coach réservé sur deux séances qui se
+chevauchent, ou lien Zoom partagé par deux séances simultanées.
+
+Le classeur ne donne que l'heure de début: chaque séance occupe
+[minute de la semaine, + durée) en heure française (voir excel_occurrences).
+Une séance qui finit après dimanche minuit se poursuit lundi matin.
+
+Un même cours apparaît souvent dans plusieurs feuilles (lien Zoom dans la
+feuille Dynamic, groupe Telegram dans la feuille Fix), avec une heure
+écrite différemment ("11:00am", "11:00 France"): les cours de même coach,
+niveau et pattern qui commencent à la même minute de la semaine sont une
+seule séance et ne sont jamais en conflit entre eux.
+
+Les séances sont groupées par coach et par lien Zoom, puis chaque groupe est
+balayé dans l'ordre des débuts en gardant les séances en cours dans un tas
+trié par fin: chaque chevauchement est trouvé en O(n log n + k) au lieu de
+comparer toutes les paires.
+"""
+import heapq
+import re
+from collections import defaultdict, namedtuple
+
+from excel_diff import normalize_value
+from excel_occurrences import MINUTES_PER_DAY, MINUTES_PER_WEEK, WEEKDAYS, minute_of_week
+
+DEFAULT_DURATION = 60
+
+CONFLICT_COACH = 'coach'
+CONFLICT_ZOOM = 'zoom'
+
+# Identifiant de réunion d'un lien Zoom (https://us02web.zoom.us/j/81234567890?pwd=...)
+_ZOOM_MEETING_RE = re.compile(r'zoom\.us/(?:j|my|w|s)/([\w.-]+)', re.IGNORECASE)
+
+Session = namedtuple('Session', ['start', 'end', 'positions', 'course'])
+
+
+def zoom_room(link):
+    """
+    Salle désignée par un lien Zoom (identifiant de réunion, mot de passe ignoré)
+
+    Args:
+        link: Lien tel qu'extrait
+
+    Returns:
+        str: Clé de comparaison, None si le lien est vide
+    """
+    text = normalize_value(link)
+    if not text:
+        return None
+    match = _ZOOM_MEETING_RE.search(text)
+    if match:
+        return match.group(1).lower()
+    return text.rstrip('/').lower()
+
+
+def session_key(course, start):
+    """
+    Identité d'une séance: (coach, niveau, pattern, minute de la semaine)
+    """
+    return (normalize_value(course['professorName']).casefold(), normalize_value(course['level']),
+            normalize_value(course['schedule']), start)
+
+
+def format_minute(minute):
+    """
+    Jour et heure d'une minute de la semaine ("Monday 19:30")
+    """
+    minute %= MINUTES_PER_WEEK
+    day, minutes = divmod(minute, MINUTES_PER_DAY)
+    return f"{WEEKDAYS[day]} {minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _segments(start, end):
+    # Une séance qui passe dimanche minuit est coupée en deux plages de la même semaine
+    if end <= MINUTES_PER_WEEK:
+        return [(start, end)]
+    return [(start, MINUTES_PER_WEEK), (0, end - MINUTES_PER_WEEK)]
+
+
+def sweep_overlaps(intervals):
+    """
+    Paires d'intervalles qui se chevauchent (balayage par ordre de début)
+
+    Args:
+        intervals (list): Triplets (début, fin exclue, identifiant)
+
+    Returns:
+        list: Triplets (identifiant, identifiant, (début, fin) du chevauchement),
+            dans l'ordre du balayage
+    """
+    overlaps = []
+    active = []
+    for start, end, ident in sorted(intervals, key=lambda interval: interval[:2]):
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for other_end, other in active:
+            overlaps.append((other, ident, (start, min(end, other_end))))
+        heapq.heappush(active, (end, ident))
+    return overlaps
+
+
+class ConflictDetector:
+    """
+    Séances hebdomadaires groupées par coach et par lien Zoom
+    """
+
+    def __init__(self, duration=DEFAULT_DURATION):
+        """
+        Args:
+            duration (int): Durée d'une séance en minutes
+        """
+        if duration <= 0:
+            raise ValueError(f"Durée de séance invalide: {duration}")
+        self.duration = duration
+        self.unscheduled = 0
+        self._sessions = {}
+        # Salles Zoom de chaque séance (les cours fusionnés peuvent en apporter plusieurs)
+        self._rooms = {}
+
+    @classmethod
+    def from_courses(cls, courses, duration=DEFAULT_DURATION):
+        """
+        Construit le détecteur d'une liste de cours
+
+        Args:
+            courses (iterable): Cours (Course ou dictionnaires), la position est leur rang
+            duration (int): Durée d'une séance en minutes
+
+        Returns:
+            ConflictDetector: Le détecteur
+        """
+        detector = cls(duration)
+        for position, course in enumerate(courses):
+            detector.add(position, course)
+        return detector
+
+    def add(self, position, course):
+        """
+        Ajoute la séance d'un cours
+
+        Args:
+            position (int): Rang du cours dans la sortie
+            course (Course | dict): Le cours
+
+        Returns:
+            bool: False si le jour ou l'heure du cours n'est pas reconnu
+        """
+        start = minute_of_week(course['dayOfWeek'], course['time'])
+        if start is None:
+            self.unscheduled += 1
+            return False
+        key = session_key(course, start)
+        session = self._sessions.get(key)
+        if session is None:
+            session = self._sessions[key] = Session(start, start + self.duration, [], course)
+        session.positions.append(position)
+        rooms = self._rooms.setdefault(key, [])
+        room = zoom_room(course['zoomLink'])
+        if room is not None and room not in rooms:
+            rooms.append(room)
+        return True
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _groups(self):
+        coaches = defaultdict(list)
+        rooms = defaultdict(list)
+        for key, session in self._sessions.items():
+            coach = key[0]
+            for segment in _segments(session.start, session.end):
+                if coach:
+                    coaches[coach].append((*segment, key))
+                for room in self._rooms.get(key, ()):
+                    rooms[room].append((*segment, key))
+        return coaches, rooms
+
+    def _conflict(self, kind, group, first, second, overlap):
+        start, end = overlap
+        return {
+            'kind': kind,
+            # Texte normalisé: un nom de coach numérique (42) reste comparable aux autres clés
+            'key': normalize_value(self._sessions[first].course['professorName']) if kind == CONFLICT_COACH else group,
+            'start': format_minute(start),
+            'end': format_minute(end),
+            'startMinute': start,
+            'endMinute': end,
+            'courses': [self._describe(first), self._describe(second)],
+        }
+
+    def _describe(self, key):
+        session = self._sessions[key]
+        return {
+            'name': session.course['name'],
+            'professorName': session.course['professorName'],
+            'dayOfWeek': session.course['dayOfWeek'],
+            'time': session.course['time'],
+            'positions': list(session.positions),
+        }
+
+    def conflicts(self):
+        """
+        Chevauchements de séances d'un même coach ou d'un même lien Zoom
+
+        Returns:
+            list: Conflits {'kind', 'key', 'start', 'end', 'startMinute', 'endMinute',
+                'courses': [séance, séance]}, par type puis par début du chevauchement
+        """
+        coaches, rooms = self._groups()
+        found = []
+        for kind, groups in ((CONFLICT_COACH, coaches), (CONFLICT_ZOOM, rooms)):
+            kind_conflicts = []
+            for group in sorted(groups):
+                seen = set()
+                for first, second, overlap in sweep_overlaps(groups[group]):
+                    pair = frozenset((first, second))
+                    if pair in seen:
+                        continue
+                    seen.add(pair)
+                    kind_conflicts.append(self._conflict(kind, group, first, second, overlap))
+            kind_conflicts.sort(key=lambda conflict: (conflict['startMinute'], conflict['key']))
+            found.extend(kind_conflicts)
+        return found
+
+    def to_dict(self):
+        """
+        Rapport des conflits
+
+        Returns:
+            dict: {'duration', 'sessions', 'unscheduled', 'summary': {'coach': n, 'zoom': n},
+                'conflicts': [...]}
+        """
+        conflicts = self.conflicts()
+        summary = {CONFLICT_COACH: 0, CONFLICT_ZOOM: 0}
+        for conflict in conflicts:
+            summary[conflict['kind']] += 1
+        return {
+            'duration': self.duration,
+            'sessions': len(self._sessions),
+            'unscheduled': self.unscheduled,
+            'summary': summary,
+            'conflicts': conflicts,
+        }
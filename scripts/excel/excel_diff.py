@@ -0,0 +1,205 @@
+"""
+Différentiel entre deux imports de cours.
+
+Les cours sont identifiés par une clé stable (coach, niveau, pattern, jour,
+heure). Le différentiel compare le résultat d'un import à un instantané
+précédent (fichier JSON produit par save_to_json, ou instantané en colonnes
+produit par save_to_snapshot) ou aux cours présents dans
+la base SQLite, et ne renvoie que les cours créés, modifiés ou supprimés.
+"""
+import json
+import math
+import os
+import re
+import sqlite3
+
+DEFAULT_DB_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'edutrack.db'
+)
+
+# Colonnes de la table courses comparées lors d'un différentiel avec la base
+DB_COURSE_COLUMNS = [
+    'name', 'instructor', 'professorName', 'level', 'schedule',
+    'dayOfWeek', 'time', 'zoomLink', 'telegramGroup',
+]
+
+_INTEGRAL_FLOAT_TEXT = re.compile(r'-?\d+\.0+')
+
+CHANGE_CREATED = 'created'
+CHANGE_UPDATED = 'updated'
+CHANGE_DELETED = 'deleted'
+
+
+def normalize_value(value):
+    """
+    Normalise une valeur pour la comparaison (vide, nombres entiers, texte)
+
+    La base stocke tout en texte: -1001280305339.0, -1001280305339 et
+    '-1001280305339' doivent être considérés comme égaux.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ''
+        if value.is_integer():
+            return str(int(value))
+        return str(value)
+    if isinstance(value, str):
+        text = value.strip()
+        if _INTEGRAL_FLOAT_TEXT.fullmatch(text):
+            return text.split('.')[0]
+        return text
+    return str(value)
+
+
+def course_key(course):
+    """
+    Clé d'identité stable d'un cours
+
+    Args:
+        course (dict): Le cours
+
+    Returns:
+        tuple: (coach, niveau, pattern, jour, heure)
+    """
+    return tuple(normalize_value(course.get(field)) for field in
+                 ('professorName', 'level', 'schedule', 'dayOfWeek', 'time'))
+
+
+def _is_empty(value):
+    return normalize_value(value) == ''
+
+
+def merge_by_key(courses):
+    """
+    Regroupe les cours partageant la même clé
+
+    Un même cours apparaît souvent dans la feuille Dynamic (lien Zoom) et dans
+    la feuille Fix (groupe Telegram): les valeurs non vides sont combinées,
+    la première occurrence fixant l'ordre et les valeurs prioritaires.
+
+    Args:
+        courses (list): Liste des cours
+
+    Returns:
+        dict: Cours fusionnés indexés par clé, dans l'ordre d'apparition
+    """
+    merged = {}
+    for course in courses:
+        key = course_key(course)
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = dict(course)
+            continue
+        for field, value in course.items():
+            if _is_empty(existing.get(field)) and not _is_empty(value):
+                existing[field] = value
+    return merged
+
+
+def load_snapshot(snapshot_path):
+    """
+    Charge un instantané (liste de cours) produit par un import précédent
+
+    Args:
+        snapshot_path (str): Chemin du fichier JSON ou de l'instantané en colonnes (.ksnap)
+
+    Returns:
+        list: Liste des cours
+    """
+    from excel_snapshot import is_snapshot, load_snapshot_courses
+
+    if is_snapshot(snapshot_path):
+        return [course.to_dict() for course in load_snapshot_courses(snapshot_path)]
+    with open(snapshot_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_courses_from_db(db_path=None):
+    """
+    Lit les cours actuellement présents dans la base SQLite
+
+    Args:
+        db_path (str, optional): Chemin de la base (data/edutrack.db par défaut)
+
+    Returns:
+        list: Liste des cours, chacun avec son 'id'
+    """
+    connection = sqlite3.connect(f"file:{db_path or DEFAULT_DB_PATH}?mode=ro", uri=True)
+    try:
+        return read_courses(connection)
+    finally:
+        connection.close()
+
+
+def read_courses(connection):
+    """
+    Lit les cours de la table courses sur une connexion ouverte
+
+    Args:
+        connection (sqlite3.Connection): Connexion à la base
+
+    Returns:
+        list: Liste des cours, chacun avec son 'id'
+    """
+    cursor = connection.execute(f"SELECT id, {', '.join(DB_COURSE_COLUMNS)} FROM courses ORDER BY id")
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def diff_courses(previous, current):
+    """
+    Calcule les changements entre deux listes de cours
+
+    Args:
+        previous (list): Cours de l'import précédent (ou de la base)
+        current (list): Cours du nouvel import
+
+    Returns:
+        list: Changements {'change', 'key', 'course', ['id'], ['changed_fields']}
+    """
+    # Les deux côtés sont fusionnés de la même façon; pour la base, l'id
+    # conservé est celui de la première ligne portant la clé
+    previous_by_key = merge_by_key(previous)
+    current_by_key = merge_by_key(current)
+
+    changes = []
+    for key, course in current_by_key.items():
+        old = previous_by_key.get(key)
+        if old is None:
+            changes.append({'change': CHANGE_CREATED, 'key': list(key), 'course': course})
+            continue
+
+        # Seuls les champs connus des deux côtés sont comparés (la base n'a pas de description)
+        compared = [field for field in course if field in old and field != 'id']
+        changed_fields = [field for field in compared
+                          if normalize_value(course.get(field)) != normalize_value(old.get(field))]
+        if changed_fields:
+            change = {'change': CHANGE_UPDATED, 'key': list(key), 'course': course,
+                      'changed_fields': changed_fields}
+            if 'id' in old:
+                change['id'] = old['id']
+            changes.append(change)
+
+    for key, old in previous_by_key.items():
+        if key not in current_by_key:
+            change = {'change': CHANGE_DELETED, 'key': list(key), 'course': old}
+            if 'id' in old:
+                change['id'] = old['id']
+            changes.append(change)
+
+    return changes
+
+
+def summarize(changes):
+    """
+    Compte les changements par type
+
+    Returns:
+        dict: {'created': n, 'updated': n, 'deleted': n}
+    """
+    summary = {CHANGE_CREATED: 0, CHANGE_UPDATED: 0, CHANGE_DELETED: 0}
+    for change in changes:
+        summary[change['change']] += 1
+    return summary
@@ -0,0 +1,229 @@
+"""
+Détection de la disposition d'une feuille d'après sa ligne d'en-tête.
+
+Quatre dispositions sont reconnues:
+    dynamic  'Coach', 'Topic ', 'Zoom Link', 'TIME (France)'... (Dynamic Schedule)
+    fixed    la première ligne est un cours ("Salma Choufani - ABG - SS - 2:00pm",
+             "Salma Choufani", ...) à côté des colonnes 'DAY' et 'TELEGRAM GROUP ID'
+    message  'Telegram Chat Id', 'Telegram Message', 'Sending Date'
+    grid     grille coach x créneaux de l'ancien script scripts/excel_processor.py:
+             'Unnamed: 0' (coach), 'Unnamed: 1' (email), 'Group ID'
+
+Les noms sont comparés sans tenir compte de la casse ni des espaces
+superflus; les colonnes reconnues sont renommées vers les noms qu'attendent
+les extracteurs ('topic' -> 'Topic ', titre du premier cours -> 'Salma
+Choufani - ABG - SS - 2:00pm'...). Une feuille est ainsi aiguillée vers le
+bon extracteur quel que soit son nom, avant la lecture de ses lignes.
+
+La détection est mémorisée par empreinte de l'en-tête: les feuilles d'un
+même modèle, et les imports suivants dans le même processus, ne la refont
+pas. Si l'en-tête n'est pas reconnu, le type est déduit du nom de la
+feuille, comme auparavant.
+"""
+import hashlib
+import json
+import re
+
+from excel_messages import MESSAGE_COLUMNS
+from excel_titles import TIME_PATTERN
+
+KIND_DYNAMIC = 'dynamic'
+KIND_FIXED = 'fixed'
+KIND_MESSAGE = 'message'
+KIND_GRID = 'grid'
+
+# Noms de colonnes attendus par les extracteurs de chaque disposition
+DYNAMIC_COLUMNS = ('Coach', 'Topic ', 'Zoom Link', 'TIME (France)', 'Start Date & Time')
+FIXED_COLUMNS = ('DAY', 'TIME (France)', 'TELEGRAM GROUP ID')
+GRID_COLUMNS = ('Unnamed: 0', 'Unnamed: 1', 'Group ID')
+
+# Noms attendus des deux premières colonnes d'une feuille Fix (le premier cours)
+FIXED_TITLE_COLUMN = 'Salma Choufani - ABG - SS - 2:00pm'
+FIXED_COACH_COLUMN = 'Salma Choufani'
+
+# (fragment du nom de feuille, type), pour les en-têtes non reconnus
+SHEET_NAME_KINDS = (
+    ('Dynamic', KIND_DYNAMIC),
+    ('Fix', KIND_FIXED),
+    ('Message', KIND_MESSAGE),
+)
+
+CACHE_SIZE = 256
+
+_TIME_RE = re.compile(TIME_PATTERN)
+_cache = {}
+
+
+def normalize_column(name):
+    """
+    Forme de comparaison d'un nom de colonne (casse et espaces ignorés)
+    """
+    return ' '.join(str(name).split()).casefold()
+
+
+def header_fingerprint(columns):
+    """
+    Empreinte d'une ligne d'en-tête (noms exacts, dans l'ordre)
+
+    Args:
+        columns (list): Noms des colonnes
+
+    Returns:
+        str: 16 caractères hexadécimaux
+    """
+    data = json.dumps(list(columns), ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def sheet_kind(sheet_name):
+    """
+    Type d'une feuille d'après son nom
+
+    Returns:
+        str: 'dynamic', 'fixed', 'message' ou None
+    """
+    for fragment, kind in SHEET_NAME_KINDS:
+        if fragment in sheet_name:
+            return kind
+    return None
+
+
+class SheetLayout:
+    """
+    Disposition détectée d'une feuille: type et renommage des colonnes
+    """
+
+    __slots__ = ('kind', 'fingerprint', 'renames', 'detected')
+
+    def __init__(self, kind, fingerprint, renames=None, detected=True):
+        """
+        Args:
+            kind (str): 'dynamic', 'fixed', 'message', 'grid' ou None
+            fingerprint (str): Empreinte de l'en-tête (header_fingerprint)
+            renames (dict, optional): {nom lu: nom attendu par l'extracteur}
+            detected (bool): Type reconnu d'après l'en-tête (False: d'après le nom de la feuille)
+        """
+        self.kind = kind
+        self.fingerprint = fingerprint
+        self.renames = renames or {}
+        self.detected = detected
+
+    def __repr__(self):
+        return f"SheetLayout({self.kind!r}, {self.fingerprint!r})"
+
+    def apply(self, columns):
+        """
+        Colonnes renommées vers les noms attendus par l'extracteur
+
+        Args:
+            columns (list): Colonnes lues dans la ligne d'en-tête
+
+        Returns:
+            list: Colonnes, dans le même ordre
+        """
+        if not self.renames:
+            return list(columns)
+        return [self.renames.get(column, column) for column in columns]
+
+    def to_dict(self):
+        return {
+            'kind': self.kind,
+            'fingerprint': self.fingerprint,
+            'renames': dict(self.renames),
+            'detected': self.detected,
+        }
+
+
+def _match_columns(columns, expected):
+    """
+    Colonnes lues correspondant aux noms attendus: {nom attendu: nom lu}
+    """
+    present = set(columns)
+    by_normalized = {}
+    for column in columns:
+        by_normalized.setdefault(normalize_column(column), column)
+    matches = {}
+    for name in expected:
+        if name in present:
+            matches[name] = name
+        elif normalize_column(name) in by_normalized:
+            matches[name] = by_normalized[normalize_column(name)]
+    return matches
+
+
+def _fixed_title_columns(columns):
+    """
+    Colonnes du premier cours d'une feuille Fix: (titre, coach), None si absent
+
+    Le titre est la première cellule de la forme "Coach - ... - 2:00pm"; le
+    coach est la cellule qui reprend le début du titre, sinon la suivante.
+    """
+    for idx, column in enumerate(columns):
+        if isinstance(column, str) and ' - ' in column and _TIME_RE.search(column):
+            coach = column.split(' - ', 1)[0].strip()
+            for candidate in columns:
+                if isinstance(candidate, str) and candidate.strip() == coach:
+                    return column, candidate
+            following = columns[idx + 1] if idx + 1 < len(columns) else None
+            return column, following
+    return None
+
+
+def _renames(matches):
+    return {actual: expected for expected, actual in matches.items() if actual != expected}
+
+
+def _detect(columns, fingerprint):
+    """
+    Type et renommages d'après l'en-tête seul, None si aucune disposition ne correspond
+    """
+    matches = _match_columns(columns, MESSAGE_COLUMNS)
+    if len(matches) == len(MESSAGE_COLUMNS):
+        return SheetLayout(KIND_MESSAGE, fingerprint, _renames(matches))
+
+    matches = _match_columns(columns, DYNAMIC_COLUMNS)
+    if 'Coach' in matches and 'Topic ' in matches:
+        return SheetLayout(KIND_DYNAMIC, fingerprint, _renames(matches))
+
+    matches = _match_columns(columns, FIXED_COLUMNS)
+    title = _fixed_title_columns(columns)
+    if 'DAY' in matches and title:
+        renames = _renames(matches)
+        title_column, coach_column = title
+        if coach_column in matches.values():
+            coach_column = None
+        if FIXED_TITLE_COLUMN not in columns and title_column != FIXED_TITLE_COLUMN:
+            renames[title_column] = FIXED_TITLE_COLUMN
+        if coach_column is not None and FIXED_COACH_COLUMN not in columns and coach_column != FIXED_COACH_COLUMN:
+            renames[coach_column] = FIXED_COACH_COLUMN
+        return SheetLayout(KIND_FIXED, fingerprint, renames)
+
+    matches = _match_columns(columns, GRID_COLUMNS)
+    if len(matches) == len(GRID_COLUMNS):
+        return SheetLayout(KIND_GRID, fingerprint, _renames(matches))
+
+    return None
+
+
+def detect_layout(sheet_name, columns):
+    """
+    Disposition d'une feuille d'après sa ligne d'en-tête, sinon d'après son nom
+
+    Args:
+        sheet_name (str): Nom de la feuille
+        columns (list): Colonnes lues dans la ligne d'en-tête
+
+    Returns:
+        SheetLayout: La disposition (kind None si ni l'en-tête ni le nom ne sont reconnus)
+    """
+    columns = list(columns)
+    fingerprint = header_fingerprint(columns)
+    layout = _cache.get(fingerprint)
+    if layout is None:
+        layout = _detect(columns, fingerprint) or SheetLayout(None, fingerprint, detected=False)
+        if len(_cache) >= CACHE_SIZE:
+            _cache.clear()
+        _cache[fingerprint] = layout
+    if layout.kind is None:
+        return SheetLayout(sheet_kind(sheet_name), fingerprint, detected=False)
+    return layout
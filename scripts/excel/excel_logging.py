@@ -0,0 +1,142 @@
+"""
+Configuration des logs de l'import Excel.
+
+Les modules se contentent de logging.getLogger('excel_processor...'); seul le
+point d'entrée (main) appelle configure_logging(). Par défaut seul un résumé
+par import est journalisé au niveau INFO, le détail par cours est au niveau
+DEBUG.
+
+Les enregistrements passent par une QueueHandler: le thread qui traite le
+classeur ne fait que déposer l'enregistrement dans une file, le formatage et
+l'écriture sur stderr sont faits par le thread d'un QueueListener.
+
+Format 'json': un objet JSON par ligne, avec les champs passés dans extra=
+(par exemple {"event": "run_summary", "metrics": {...}}), que le serveur Node
+peut analyser ligne par ligne.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR']
+LOG_FORMATS = ['text', 'json']
+
+# Valeurs par défaut modifiables par variables d'environnement (processus lancés par Node)
+DEFAULT_LEVEL = os.environ.get('EXCEL_LOG_LEVEL', 'INFO').upper()
+DEFAULT_FORMAT = os.environ.get('EXCEL_LOG_FORMAT', 'text').lower()
+
+# Attributs standard d'un LogRecord: tout le reste vient de extra=
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener = None
+_queue_handler = None
+_settings = (DEFAULT_LEVEL, DEFAULT_FORMAT)
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formate un enregistrement en une ligne JSON compacte
+    """
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _make_formatter(log_format):
+    if log_format == 'json':
+        return JSONFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def configure_logging(level=None, log_format=None, stream=None, use_queue=True):
+    """
+    Configure les logs du processus (à appeler une fois, depuis le point d'entrée)
+
+    Args:
+        level (str, optional): DEBUG, INFO, WARNING ou ERROR (défaut: EXCEL_LOG_LEVEL ou INFO)
+        log_format (str, optional): 'text' ou 'json' (défaut: EXCEL_LOG_FORMAT ou text)
+        stream (file, optional): Flux de sortie (stderr par défaut)
+        use_queue (bool): Écrire les logs depuis un thread dédié (QueueHandler)
+
+    Returns:
+        logging.Handler: Le handler installé sur le logger racine
+    """
+    global _listener, _queue_handler, _settings
+
+    shutdown_logging()
+
+    level = (level or DEFAULT_LEVEL).upper()
+    log_format = log_format or DEFAULT_FORMAT
+    _settings = (level, log_format)
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(_make_formatter(log_format))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.setLevel(level)
+
+    if not use_queue:
+        root.addHandler(handler)
+        return handler
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    root.addHandler(_queue_handler)
+    return _queue_handler
+
+
+def logging_settings():
+    """
+    Niveau et format passés au dernier configure_logging (pour configurer un processus enfant)
+
+    Returns:
+        tuple: (niveau, format)
+    """
+    return _settings
+
+
+def shutdown_logging():
+    """
+    Vide la file et arrête le thread d'écriture des logs
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_listener_in_child():
+    # Après un fork (ProcessPoolExecutor), le thread d'écriture n'existe pas dans
+    # l'enfant: il reçoit sa propre file et son propre thread
+    global _listener
+    if _listener is None or _queue_handler is None:
+        return
+    log_queue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
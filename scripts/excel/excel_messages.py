@@ -0,0 +1,299 @@
+"""
+Messages Telegram programmés, extraits des feuilles "Message".
+
+Chaque ligne valide ('Telegram Chat Id', 'Telegram Message', 'Sending Date')
+devient un ScheduledMessage. MessageQueue les trie par date d'envoi et les
+regroupe par chat: le planificateur de notifications lit les messages d'une
+fenêtre de temps par recherche dichotomique (bisect) au lieu de parcourir
+tous les messages à chaque tick.
+
+Les dates d'envoi sont naïves (heure locale du classeur), comme dans la feuille:
+une date avec fuseau est ramenée à l'heure française.
+"""
+import math
+import re
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+
+from excel_occurrences import FRANCE_TIMEZONE, zone
+
+MESSAGE_COLUMNS = ('Telegram Chat Id', 'Telegram Message', 'Sending Date')
+
+# Origine des numéros de série de date Excel (système 1900)
+EXCEL_EPOCH = datetime(1899, 12, 30)
+
+_CHAT_ID_RE = re.compile(r'^-?\d+$')
+
+
+def parse_chat_id(value):
+    """
+    Normalise un identifiant de chat Telegram
+
+    Args:
+        value: Cellule 'Telegram Chat Id' (entier, flottant ou texte)
+
+    Returns:
+        int | str: Identifiant numérique ou nom de canal (@...), None si la cellule est vide
+    """
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        # Colonne numérique incomplète: pandas la convertit en flottants
+        if math.isnan(value) or not value.is_integer():
+            return None
+        return int(value)
+    text = str(value).strip()
+    if not text:
+        return None
+    return int(text) if _CHAT_ID_RE.match(text) else text
+
+
+def _is_missing(value):
+    # None, NaN, pd.NaT et pd.NA: NaN et NaT sont différents d'eux-mêmes, pd.NA refuse la comparaison
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except (TypeError, ValueError):
+        return True
+
+
+def parse_sending_date(value):
+    """
+    Convertit une cellule 'Sending Date' en datetime
+
+    Args:
+        value: datetime, date, texte ISO (ou libre si dateutil est installé) ou numéro de série Excel
+
+    Returns:
+        datetime: La date d'envoi (naïve, heure française si la valeur a un fuseau),
+            None si la cellule est vide ou n'est pas une date
+    """
+    # pd.NaT (cellule vide d'une colonne de dates) est une sous-classe de datetime
+    if _is_missing(value):
+        return None
+    if hasattr(value, 'to_pydatetime'):  # pandas.Timestamp
+        value = value.to_pydatetime()
+    if isinstance(value, datetime):
+        return _naive(value)
+    if isinstance(value, date):
+        return datetime.combine(value, time())
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Cellule sans format de date: numéro de série Excel
+        if math.isnan(value) or value <= 0:
+            return None
+        return EXCEL_EPOCH + timedelta(days=value)
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return _naive(datetime.fromisoformat(value.strip()))
+    except ValueError:
+        pass
+    try:
+        from dateutil import parser
+    except ImportError:  # dépendance optionnelle
+        return None
+    try:
+        return _naive(parser.parse(value))
+    except (ValueError, OverflowError):
+        return None
+
+
+def _naive(value):
+    # Heure française sans fuseau, comme les dates saisies dans la feuille
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(zone(FRANCE_TIMEZONE)).replace(tzinfo=None)
+
+
+class ScheduledMessage:
+    """
+    Message à envoyer sur un chat Telegram à une date donnée
+    """
+
+    __slots__ = ('chat_id', 'text', 'send_at')
+
+    def __init__(self, chat_id, text, send_at):
+        """
+        Args:
+            chat_id (int | str): Identifiant du chat Telegram
+            text (str): Texte du message
+            send_at (datetime): Date d'envoi
+        """
+        self.chat_id = chat_id
+        self.text = text
+        self.send_at = send_at
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Reconstruit un message à partir de sa forme sérialisée (to_dict)
+        """
+        return cls(data['telegramChatId'], data['message'], datetime.fromisoformat(data['sendingDate']))
+
+    def sort_key(self):
+        return (self.send_at, str(self.chat_id), self.text)
+
+    def __eq__(self, other):
+        if not isinstance(other, ScheduledMessage):
+            return NotImplemented
+        return (self.chat_id, self.text, self.send_at) == (other.chat_id, other.text, other.send_at)
+
+    def __hash__(self):
+        return hash((self.chat_id, self.text, self.send_at))
+
+    def __repr__(self):
+        return f"ScheduledMessage({self.chat_id!r}, {self.send_at.isoformat()!r})"
+
+    def __reduce__(self):
+        return (ScheduledMessage, (self.chat_id, self.text, self.send_at))
+
+    def to_dict(self):
+        """
+        Forme sérialisable du message
+
+        Returns:
+            dict: {'telegramChatId', 'message', 'sendingDate'}
+        """
+        return {
+            'telegramChatId': self.chat_id,
+            'message': self.text,
+            'sendingDate': self.send_at.isoformat(),
+        }
+
+
+def extract_messages(chat_ids, texts, sending_dates):
+    """
+    Construit les messages d'une feuille à partir de ses trois colonnes
+
+    Args:
+        chat_ids (list): Colonne 'Telegram Chat Id'
+        texts (list): Colonne 'Telegram Message'
+        sending_dates (list): Colonne 'Sending Date'
+
+    Returns:
+        tuple: (liste des ScheduledMessage, {motif: nombre de lignes ignorées})
+    """
+    messages = []
+    skipped = {'missing_chat_or_message': 0, 'invalid_sending_date': 0}
+    dates = {}
+    for chat_value, text, date_value in zip(chat_ids, texts, sending_dates):
+        chat_id = parse_chat_id(chat_value)
+        if not isinstance(text, str):
+            text = '' if text is None or (isinstance(text, float) and math.isnan(text)) else str(text)
+        if chat_id is None or not text.strip():
+            skipped['missing_chat_or_message'] += 1
+            continue
+        # Les mêmes dates reviennent pour de nombreux chats
+        key = (type(date_value), date_value)
+        if key not in dates:
+            dates[key] = parse_sending_date(date_value)
+        send_at = dates[key]
+        if send_at is None:
+            skipped['invalid_sending_date'] += 1
+            continue
+        messages.append(ScheduledMessage(chat_id, text, send_at))
+    return messages, skipped
+
+
+class MessageQueue:
+    """
+    Messages triés par date d'envoi, avec un index par chat
+    """
+
+    def __init__(self, messages=()):
+        """
+        Args:
+            messages (iterable): ScheduledMessage dans un ordre quelconque
+        """
+        # Ordre total (date, chat, texte): la file ne dépend pas de l'ordre des feuilles
+        self.messages = sorted(messages, key=ScheduledMessage.sort_key)
+        self._times = [message.send_at for message in self.messages]
+        self.by_chat = {}
+        for message in self.messages:
+            self.by_chat.setdefault(message.chat_id, []).append(message)
+        self._chat_times = {chat_id: [message.send_at for message in chat_messages]
+                            for chat_id, chat_messages in self.by_chat.items()}
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def window(self, start=None, end=None, chat_id=None):
+        """
+        Messages dont la date d'envoi est dans [start, end)
+
+        Args:
+            start (datetime, optional): Début inclus (pas de borne par défaut)
+            end (datetime, optional): Fin exclue (pas de borne par défaut)
+            chat_id (optional): Limiter la recherche à un chat
+
+        Returns:
+            list: Messages triés par date d'envoi
+        """
+        if chat_id is None:
+            messages, times = self.messages, self._times
+        else:
+            messages, times = self.by_chat.get(chat_id, []), self._chat_times.get(chat_id, [])
+        lo = 0 if start is None else bisect_left(times, start)
+        hi = len(times) if end is None else bisect_left(times, end)
+        return messages[lo:hi]
+
+    def due(self, now, since=None):
+        """
+        Messages à envoyer à l'instant now (date d'envoi <= now), depuis since exclu
+
+        Args:
+            now (datetime): Instant courant
+            since (datetime, optional): Instant du tick précédent
+
+        Returns:
+            list: Messages triés par date d'envoi
+        """
+        lo = 0 if since is None else bisect_right(self._times, since)
+        return self.messages[lo:bisect_right(self._times, now)]
+
+    def batches(self, start=None, end=None):
+        """
+        Messages d'une fenêtre de temps groupés par chat
+
+        Args:
+            start (datetime, optional): Début inclus
+            end (datetime, optional): Fin exclue
+
+        Returns:
+            dict: {chat_id: [messages triés par date d'envoi]}
+        """
+        grouped = {}
+        for message in self.window(start, end):
+            grouped.setdefault(message.chat_id, []).append(message)
+        return grouped
+
+    def next_send_at(self, after=None):
+        """
+        Prochaine date d'envoi strictement après after (la première si after est None)
+
+        Returns:
+            datetime: La date, None si la file est épuisée
+        """
+        idx = 0 if after is None else bisect_right(self._times, after)
+        return self._times[idx] if idx < len(self._times) else None
+
+    def to_dict(self):
+        """
+        Forme sérialisable de la file
+
+        Returns:
+            dict: {'messages': [...] triés par date, 'chats': {chat_id: [index dans messages]}}
+        """
+        positions = {}
+        for idx, message in enumerate(self.messages):
+            positions.setdefault(str(message.chat_id), []).append(idx)
+        return {
+            'messages': [message.to_dict() for message in self.messages],
+            'chats': positions,
+        }
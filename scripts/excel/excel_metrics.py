@@ -0,0 +1,225 @@
+"""
+Instrumentation du pipeline d'import: durées par étape et compteurs.
+
+Chaque ExcelProcessor possède un ImportMetrics qui accumule:
+    - la durée de chaque étape (read, validate, clean, extract, serialize, ...)
+    - par feuille: lignes lues, lignes ignorées par motif, cours produits
+    - la taille du fichier lu et la mémoire maximale du processus
+
+Le résultat est exporté en JSON (trailer METRICS= sur stdout) ou au format
+texte Prometheus. profile_run() ajoute cProfile et tracemalloc à la demande.
+"""
+import logging
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger('excel_processor.metrics')
+
+PROMETHEUS_PREFIX = 'excel_import'
+
+
+def peak_rss_bytes():
+    """
+    Mémoire résidente maximale du processus, en octets
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sur macOS et en kilo-octets ailleurs
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class ImportMetrics:
+    """
+    Compteurs et chronomètres d'un import (utilisables depuis plusieurs threads)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.sheets = {}
+        self.counters = {}
+        self.bytes_read = 0
+        self.started_at = time.perf_counter()
+        self.tracemalloc_peak = None
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Chronomètre une étape; les durées d'une même étape s'additionnent
+
+        Args:
+            name (str): Nom de l'étape
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def _sheet(self, sheet_name):
+        sheet = self.sheets.get(sheet_name)
+        if sheet is None:
+            sheet = self.sheets[sheet_name] = {'rows_scanned': 0, 'rows_skipped': {}, 'courses': 0}
+        return sheet
+
+    def rows_scanned(self, sheet_name, value):
+        with self._lock:
+            self._sheet(sheet_name)['rows_scanned'] += value
+
+    def rows_skipped(self, sheet_name, reason, value):
+        """
+        Enregistre des lignes ignorées
+
+        Args:
+            sheet_name (str): Nom de la feuille
+            reason (str): Motif (empty_row, missing_coach_or_topic, ...)
+            value (int): Nombre de lignes
+        """
+        if not value:
+            return
+        with self._lock:
+            skipped = self._sheet(sheet_name)['rows_skipped']
+            skipped[reason] = skipped.get(reason, 0) + int(value)
+
+    def courses_emitted(self, sheet_name, value):
+        with self._lock:
+            self._sheet(sheet_name)['courses'] += value
+
+    def merge(self, other):
+        """
+        Ajoute les mesures d'un autre import (dictionnaire produit par to_dict)
+
+        Utilisé pour rapatrier les mesures d'une feuille traitée dans un autre processus.
+        """
+        with self._lock:
+            for name, seconds in other.get('stages', {}).items():
+                self.stages[name] = self.stages.get(name, 0.0) + seconds
+            for name, value in other.get('counters', {}).items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for sheet_name, sheet in other.get('sheets', {}).items():
+                target = self._sheet(sheet_name)
+                target['rows_scanned'] += sheet['rows_scanned']
+                target['courses'] += sheet['courses']
+                for reason, value in sheet['rows_skipped'].items():
+                    target['rows_skipped'][reason] = target['rows_skipped'].get(reason, 0) + value
+
+    def to_dict(self):
+        """
+        Mesures sous forme sérialisable en JSON
+
+        Returns:
+            dict: Durées (secondes), compteurs, détail par feuille et mémoire
+        """
+        with self._lock:
+            result = {
+                'elapsed': round(time.perf_counter() - self.started_at, 6),
+                'stages': {name: round(seconds, 6) for name, seconds in self.stages.items()},
+                'counters': dict(self.counters),
+                'sheets': {name: {'rows_scanned': sheet['rows_scanned'],
+                                  'rows_skipped': dict(sheet['rows_skipped']),
+                                  'courses': sheet['courses']}
+                           for name, sheet in self.sheets.items()},
+                'bytes_read': self.bytes_read,
+                'peak_rss_bytes': peak_rss_bytes(),
+            }
+        if self.tracemalloc_peak is not None:
+            result['tracemalloc_peak_bytes'] = self.tracemalloc_peak
+        return result
+
+    def to_prometheus(self):
+        """
+        Mesures au format texte d'exposition Prometheus
+
+        Returns:
+            str: Le texte à écrire (par exemple pour le textfile collector de node_exporter)
+        """
+        data = self.to_dict()
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}_stage_seconds Durée de chaque étape de l'import",
+            f"# TYPE {PROMETHEUS_PREFIX}_stage_seconds gauge",
+        ]
+        for name, seconds in data['stages'].items():
+            lines.append(f'{PROMETHEUS_PREFIX}_stage_seconds{{stage="{name}"}} {seconds}')
+
+        lines += [f"# TYPE {PROMETHEUS_PREFIX}_rows_scanned gauge"]
+        for sheet_name, sheet in data['sheets'].items():
+            lines.append(f'{PROMETHEUS_PREFIX}_rows_scanned{{sheet="{_escape(sheet_name)}"}} {sheet["rows_scanned"]}')
+
+        lines += [f"# TYPE {PROMETHEUS_PREFIX}_rows_skipped gauge"]
+        for sheet_name, sheet in data['sheets'].items():
+            for reason, value in sheet['rows_skipped'].items():
+                lines.append(f'{PROMETHEUS_PREFIX}_rows_skipped{{sheet="{_escape(sheet_name)}",reason="{reason}"}} {value}')
+
+        lines += [f"# TYPE {PROMETHEUS_PREFIX}_courses gauge"]
+        for sheet_name, sheet in data['sheets'].items():
+            lines.append(f'{PROMETHEUS_PREFIX}_courses{{sheet="{_escape(sheet_name)}"}} {sheet["courses"]}')
+
+        for name, value in data['counters'].items():
+            lines += [f"# TYPE {PROMETHEUS_PREFIX}_{name} gauge", f"{PROMETHEUS_PREFIX}_{name} {value}"]
+
+        lines += [
+            f"# TYPE {PROMETHEUS_PREFIX}_elapsed_seconds gauge",
+            f"{PROMETHEUS_PREFIX}_elapsed_seconds {data['elapsed']}",
+            f"# TYPE {PROMETHEUS_PREFIX}_bytes_read gauge",
+            f"{PROMETHEUS_PREFIX}_bytes_read {data['bytes_read']}",
+            f"# TYPE {PROMETHEUS_PREFIX}_peak_rss_bytes gauge",
+            f"{PROMETHEUS_PREFIX}_peak_rss_bytes {data['peak_rss_bytes']}",
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(label_value):
+    return str(label_value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+@contextmanager
+def profile_run(stats_path, metrics=None, top=20):
+    """
+    Exécute le bloc sous cProfile et tracemalloc puis enregistre les statistiques
+
+    Le profil cProfile est écrit dans stats_path (lisible avec pstats ou
+    snakeviz); les fonctions les plus coûteuses et les plus gros
+    allocateurs sont journalisés.
+
+    Args:
+        stats_path (str): Fichier de sortie du profil cProfile
+        metrics (ImportMetrics, optional): Reçoit le pic mémoire mesuré par tracemalloc
+        top (int): Nombre de lignes affichées dans les résumés
+    """
+    # Modules chargés seulement avec --profile
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        profiler.dump_stats(stats_path)
+        if metrics is not None:
+            metrics.tracemalloc_peak = peak
+
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(top)
+        logger.info(f"Profil cProfile enregistré dans {stats_path}\n{summary.getvalue()}")
+
+        allocations = '\n'.join(str(stat) for stat in snapshot.statistics('lineno')[:top])
+        logger.info(f"Pic mémoire tracemalloc: {peak} octets; principaux allocateurs:\n{allocations}")
@@ -0,0 +1,144 @@
+"""
+Représentation compacte des cours extraits.
+
+Un Course n'a pas de __dict__ (__slots__): seuls les champs propres au cours
+sont stockés, les champs catégoriels (niveau, pattern, jour, type de planning)
+sont internés et partagés entre tous les cours, et le nom et la description
+sont construits à la demande, lors de la sérialisation.
+
+Course se comporte comme un dictionnaire en lecture (course['name'],
+course.get('zoomLink'), dict(course)) avec les mêmes clés, dans le même ordre,
+que les dictionnaires produits auparavant: la sortie JSON est inchangée.
+"""
+import sys
+from collections.abc import Mapping
+
+COURSE_FIELDS = (
+    'name', 'instructor', 'professorName', 'level', 'schedule', 'dayOfWeek',
+    'time', 'zoomLink', 'telegramGroup', 'schedule_type', 'description',
+)
+
+DEFAULT_INSTRUCTOR = "Kodjo"
+
+
+# Clé sérialisée -> attribut du Course
+_FIELD_ATTRIBUTES = {
+    'name': 'name',
+    'instructor': 'instructor',
+    'professorName': 'professor_name',
+    'level': 'level',
+    'schedule': 'schedule',
+    'dayOfWeek': 'day_of_week',
+    'time': 'time',
+    'zoomLink': 'zoom_link',
+    'telegramGroup': 'telegram_group',
+    'schedule_type': 'schedule_type',
+    'description': 'description',
+}
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class Course(Mapping):
+    """
+    Cours extrait d'une feuille de planning
+    """
+
+    instructor = DEFAULT_INSTRUCTOR
+
+    __slots__ = ('professor_name', 'level', 'schedule', 'day_of_week', 'time',
+                 'zoom_link', 'telegram_group', 'schedule_type')
+
+    def __init__(self, professor_name, level, schedule, day_of_week, time,
+                 zoom_link='', telegram_group='', schedule_type='fixed'):
+        """
+        Args:
+            professor_name (str): Nom du coach
+            level (str): Niveau (BBG, ABG, IG)
+            schedule (str): Pattern du cours (MW, TT, FS, SS)
+            day_of_week (str): Nom du jour (Monday ... Sunday)
+            time: Heure du cours, telle qu'extraite
+            zoom_link: Lien Zoom
+            telegram_group: Identifiant du groupe Telegram
+            schedule_type (str): Type de planning (dynamic/fixed)
+        """
+        self.professor_name = _intern(professor_name)
+        self.level = _intern(level)
+        self.schedule = _intern(schedule)
+        self.day_of_week = _intern(day_of_week)
+        self.time = _intern(time)
+        self.zoom_link = zoom_link
+        self.telegram_group = telegram_group
+        self.schedule_type = _intern(schedule_type)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Reconstruit un cours à partir de sa forme sérialisée (to_dict)
+        """
+        return cls(data.get('professorName'), data.get('level'), data.get('schedule'),
+                   data.get('dayOfWeek'), data.get('time'), data.get('zoomLink', ''),
+                   data.get('telegramGroup', ''), data.get('schedule_type', 'fixed'))
+
+    @property
+    def name(self):
+        return f"{self.professor_name} - {self.level} - {self.schedule} - {self.time}"
+
+    @property
+    def description(self):
+        return f"Cours de {self.level} avec {self.professor_name}, {self.schedule} à {self.time}"
+
+    def __getitem__(self, field):
+        try:
+            attribute = _FIELD_ATTRIBUTES[field]
+        except KeyError:
+            raise KeyError(field) from None
+        return getattr(self, attribute)
+
+    def __iter__(self):
+        return iter(COURSE_FIELDS)
+
+    def __len__(self):
+        return len(COURSE_FIELDS)
+
+    def __repr__(self):
+        return f"Course({self.name!r}, {self.day_of_week!r}, {self.schedule_type!r})"
+
+    def __reduce__(self):
+        return (Course, (self.professor_name, self.level, self.schedule, self.day_of_week,
+                         self.time, self.zoom_link, self.telegram_group, self.schedule_type))
+
+    def to_dict(self):
+        """
+        Forme sérialisable du cours (mêmes clés et même ordre que l'ancien format)
+
+        Returns:
+            dict: Le cours sous forme de dictionnaire
+        """
+        return {
+            'name': self.name,
+            'instructor': self.instructor,
+            'professorName': self.professor_name,
+            'level': self.level,
+            'schedule': self.schedule,
+            'dayOfWeek': self.day_of_week,
+            'time': self.time,
+            'zoomLink': self.zoom_link,
+            'telegramGroup': self.telegram_group,
+            'schedule_type': self.schedule_type,
+            'description': self.description,
+        }
+
+
+def json_default(value):
+    """
+    Fonction 'default' pour json.dump: sérialise les Course à la volée
+
+    Raises:
+        TypeError: Pour tout autre type non sérialisable
+    """
+    if isinstance(value, Course):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
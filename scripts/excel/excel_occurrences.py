@@ -0,0 +1,253 @@
+"""
+Index hebdomadaire des séances de cours, en minutes depuis lundi 00:00.
+
+Chaque cours a lieu une fois par semaine (dayOfWeek + time). Son heure,
+écrite librement dans le classeur ("7:30pm", "11:00 France", "19h30"), est
+convertie une seule fois en minute de la semaine dans le fuseau
+Europe/Paris: les heures du classeur sont des heures françaises (colonne
+'TIME (France)'), changement d'heure compris.
+
+OccurrenceIndex garde les couples (minute de la semaine, position du cours)
+triés: les séances qui commencent dans une fenêtre de temps ("dans les 15
+prochaines minutes") sont trouvées par recherche dichotomique au lieu de
+réanalyser et parcourir tous les cours.
+"""
+import re
+from bisect import bisect_left
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+
+FRANCE_TIMEZONE = 'Europe/Paris'
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+_WEEKDAY_INDEX = {name: idx for idx, name in enumerate(WEEKDAYS)}
+
+# "7:30pm", "7:30 PM", "19:30", "19h30", "11h 00 France", "7pm"
+_TIME_RE = re.compile(r'(\d{1,2})(?:\s*[:hH.]\s*(\d{2}))?\s*([AaPp][Mm])?')
+
+Occurrence = namedtuple('Occurrence', ['start', 'position', 'minute_of_week'])
+
+
+@lru_cache(maxsize=1024)
+def _parse_time_text(text):
+    for match in _TIME_RE.finditer(text):
+        hours, minutes, meridiem = match.groups()
+        if minutes is None and meridiem is None:
+            # Un nombre seul (durée, identifiant...) n'est pas une heure
+            continue
+        hours, minutes = int(hours), int(minutes or 0)
+        if meridiem:
+            if not 1 <= hours <= 12:
+                continue
+            hours = hours % 12 + (12 if meridiem.lower() == 'pm' else 0)
+        if hours < 24 and minutes < 60:
+            return hours * 60 + minutes
+    return None
+
+
+def parse_time_minutes(value):
+    """
+    Minutes depuis minuit d'une heure de cours
+
+    Args:
+        value: Heure telle qu'extraite (texte libre, datetime.time ou datetime)
+
+    Returns:
+        int: Minutes depuis minuit, None si aucune heure n'est reconnue
+    """
+    if isinstance(value, (time, datetime)):
+        return value.hour * 60 + value.minute
+    if not isinstance(value, str):
+        return None
+    return _parse_time_text(value)
+
+
+def minute_of_week(day_of_week, value):
+    """
+    Minute de la semaine (0 = lundi 00:00) d'un jour et d'une heure
+
+    Args:
+        day_of_week (str): Nom du jour (Monday ... Sunday)
+        value: Heure du cours
+
+    Returns:
+        int: Minute de la semaine, None si le jour ou l'heure est invalide
+    """
+    day = _WEEKDAY_INDEX.get(day_of_week)
+    minutes = parse_time_minutes(value)
+    if day is None or minutes is None:
+        return None
+    return day * MINUTES_PER_DAY + minutes
+
+
+def zone(name):
+    """
+    Fuseau horaire IANA ('Europe/Paris')
+    """
+    # zoneinfo (Python 3.9+) lit la base des fuseaux du système ou le paquet tzdata
+    from zoneinfo import ZoneInfo
+    return ZoneInfo(name)
+
+
+class OccurrenceIndex:
+    """
+    Séances hebdomadaires triées par minute de la semaine
+    """
+
+    def __init__(self, timezone=FRANCE_TIMEZONE):
+        """
+        Args:
+            timezone (str): Fuseau des heures du classeur
+        """
+        self.timezone = timezone
+        self.tz = zone(timezone)
+        self.unscheduled = 0
+        self._entries = []
+        self._minutes = []
+        self._sorted = True
+
+    @classmethod
+    def from_courses(cls, courses, timezone=FRANCE_TIMEZONE):
+        """
+        Construit l'index d'une liste de cours
+
+        Args:
+            courses (iterable): Cours (Course ou dictionnaires), la position est leur rang
+            timezone (str): Fuseau des heures du classeur
+
+        Returns:
+            OccurrenceIndex: L'index
+        """
+        index = cls(timezone)
+        for position, course in enumerate(courses):
+            index.add(position, course)
+        return index
+
+    def add(self, position, course):
+        """
+        Ajoute la séance d'un cours
+
+        Args:
+            position (int): Rang du cours dans la sortie
+            course (Course | dict): Le cours
+
+        Returns:
+            bool: False si le jour ou l'heure du cours n'est pas reconnu
+        """
+        minute = minute_of_week(course['dayOfWeek'], course['time'])
+        if minute is None:
+            self.unscheduled += 1
+            return False
+        self._entries.append((minute, position))
+        self._sorted = False
+        return True
+
+    def sort(self):
+        """
+        Trie les séances ajoutées (fait automatiquement avant chaque requête)
+        """
+        if not self._sorted:
+            self._entries.sort()
+            self._minutes = [minute for minute, _ in self._entries]
+            self._sorted = True
+
+    def __len__(self):
+        return len(self._entries)
+
+    def between_minutes(self, start, end):
+        """
+        Séances dont la minute de la semaine est dans [start, end)
+
+        Args:
+            start (int): Minute de début (0 à 10079)
+            end (int): Minute de fin exclue; si end <= start, la plage passe par dimanche minuit
+
+        Returns:
+            list: Couples (minute de la semaine, position du cours)
+        """
+        self.sort()
+        if end <= start:
+            return self.between_minutes(start, MINUTES_PER_WEEK) + self.between_minutes(0, end)
+        return self._entries[bisect_left(self._minutes, start):bisect_left(self._minutes, end)]
+
+    def _local(self, moment):
+        # Heure murale française; une date naïve est considérée comme déjà française
+        if moment.tzinfo is None:
+            return moment
+        return moment.astimezone(self.tz).replace(tzinfo=None)
+
+    def window(self, start, end):
+        """
+        Séances qui commencent dans [start, end)
+
+        Args:
+            start (datetime): Début inclus (avec fuseau, ou naïf en heure française)
+            end (datetime): Fin exclue
+
+        Returns:
+            list: Occurrence(start, position, minute_of_week) triées par date de début
+        """
+        local_start, local_end = self._local(start), self._local(end)
+        if local_end <= local_start:
+            return []
+        self.sort()
+
+        week_start = datetime.combine(local_start.date() - timedelta(days=local_start.weekday()), time())
+        first = (local_start - week_start) // timedelta(minutes=1)
+        last = -(-(local_end - week_start) // timedelta(minutes=1))
+
+        occurrences = []
+        week = 0
+        while week * MINUTES_PER_WEEK < last:
+            offset = week * MINUTES_PER_WEEK
+            lo = bisect_left(self._minutes, max(first - offset, 0))
+            hi = bisect_left(self._minutes, min(last - offset, MINUTES_PER_WEEK))
+            for minute, position in self._entries[lo:hi]:
+                moment = week_start + timedelta(minutes=offset + minute)
+                if local_start <= moment < local_end:
+                    occurrences.append(Occurrence(moment.replace(tzinfo=self.tz), position, minute))
+            week += 1
+        return occurrences
+
+    def upcoming(self, now, minutes=15):
+        """
+        Séances qui commencent dans les prochaines minutes
+
+        Args:
+            now (datetime): Instant courant (avec fuseau, ou naïf en heure française)
+            minutes (int): Largeur de la fenêtre
+
+        Returns:
+            list: Occurrence triées par date de début
+        """
+        return self.window(now, now + timedelta(minutes=minutes))
+
+    def next_occurrence(self, now):
+        """
+        Première séance qui commence à partir de now
+
+        Returns:
+            Occurrence: La séance, None si l'index est vide
+        """
+        if not self._entries:
+            return None
+        occurrences = self.window(now, now + timedelta(weeks=1))
+        return occurrences[0] if occurrences else None
+
+    def to_dict(self):
+        """
+        Forme sérialisable de l'index
+
+        Returns:
+            dict: {'timezone', 'occurrences': [[minute de la semaine, position], ...], 'unscheduled'}
+        """
+        self.sort()
+        return {
+            'timezone': self.timezone,
+            'occurrences': [[minute, position] for minute, position in self._entries],
+            'unscheduled': self.unscheduled,
+        }
@@ -0,0 +1,221 @@
+"""
+Sortie en flux NDJSON (un objet JSON compact par ligne).
+
+Chaque ligne porte un champ "type"; les cours sont écrits à plat:
+    {"type": "course", "name": "...", "instructor": "Kodjo", ...}
+
+Les messages Telegram programmés (feuilles "Message") suivent les cours,
+triés par date d'envoi:
+    {"type": "message", "telegramChatId": -100..., "message": "...", "sendingDate": "2025-03-03T20:30:00"}
+
+puis l'index hebdomadaire des séances (voir excel_occurrences), dont les
+positions renvoient au rang des cours dans le flux:
+    {"type": "occurrence_index", "timezone": "Europe/Paris", "occurrences": [[1230, 0], ...]}
+
+et le rapport des conflits d'horaires (voir excel_conflicts):
+    {"type": "conflicts", "duration": 60, "summary": {"coach": 0, "zoom": 0}, "conflicts": [...]}
+
+Le flux se termine par les mesures de l'import:
+    {"type": "metrics", "stages": {...}, "sheets": {...}, ...}
+
+Les lignes sont écrites sur stdout ou sur un descripteur de fichier dès que
+les cours sont produits, ce qui permet au consommateur de commencer le
+traitement avant la fin de l'analyse. orjson est utilisé s'il est installé;
+sinon le module json standard produit la même sortie. Les valeurs NaN
+(cellules numériques vides) sont écrites null pour rester du JSON valide.
+"""
+import json
+import math
+import os
+import sys
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle
+    orjson = None
+
+from excel_messages import ScheduledMessage
+from excel_models import Course
+
+RECORD_COURSE = 'course'
+RECORD_MESSAGE = 'message'
+RECORD_OCCURRENCE_INDEX = 'occurrence_index'
+RECORD_CONFLICTS = 'conflicts'
+RECORD_METRICS = 'metrics'
+
+
+def _clean(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def course_record(course):
+    """
+    Ligne NDJSON d'un cours
+
+    Args:
+        course (Course | dict): Le cours
+
+    Returns:
+        dict: {'type': 'course', <champs du cours>}
+    """
+    fields = course.to_dict() if isinstance(course, Course) else course
+    record = {'type': RECORD_COURSE}
+    for field, value in fields.items():
+        record[field] = _clean(value)
+    return record
+
+
+def message_record(message):
+    """
+    Ligne NDJSON d'un message programmé
+
+    Args:
+        message (ScheduledMessage | dict): Le message
+
+    Returns:
+        dict: {'type': 'message', <champs du message>}
+    """
+    fields = message.to_dict() if isinstance(message, ScheduledMessage) else message
+    return {'type': RECORD_MESSAGE, **fields}
+
+
+def occurrence_index_record(index):
+    """
+    Ligne NDJSON de l'index des séances
+
+    Args:
+        index (OccurrenceIndex): L'index des cours écrits
+
+    Returns:
+        dict: {'type': 'occurrence_index', 'timezone', 'occurrences', 'unscheduled'}
+    """
+    return {'type': RECORD_OCCURRENCE_INDEX, **index.to_dict()}
+
+
+def conflicts_record(report):
+    """
+    Ligne NDJSON du rapport des conflits d'horaires
+
+    Args:
+        report (dict): Rapport (ConflictDetector.to_dict)
+
+    Returns:
+        dict: {'type': 'conflicts', 'duration', 'sessions', 'unscheduled', 'summary', 'conflicts'}
+    """
+    return {'type': RECORD_CONFLICTS, **report}
+
+
+def metrics_record(metrics):
+    """
+    Ligne NDJSON finale contenant les mesures de l'import
+
+    Args:
+        metrics (dict): Mesures (ImportMetrics.to_dict)
+
+    Returns:
+        dict: {'type': 'metrics', <mesures>}
+    """
+    return {'type': RECORD_METRICS, **metrics}
+
+
+def _default(value):
+    # Dates et heures en ISO 8601 (comme orjson), scalaires numpy en types Python
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def encode_record(record):
+    """
+    Encode un enregistrement en une ligne JSON compacte (octets UTF-8, '\\n' final)
+    """
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE, default=_default)
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=_default) + '\n').encode('utf-8')
+
+
+class NDJSONWriter:
+    """
+    Écrit des enregistrements NDJSON sur un flux binaire, ligne par ligne
+    """
+
+    def __init__(self, stream, owned=False):
+        """
+        Args:
+            stream: Flux binaire (sys.stdout.buffer, fichier ouvert en 'wb', ...)
+            owned (bool): Fermer le flux avec le writer
+        """
+        self.stream = stream
+        self.owned = owned
+        self.count = 0
+        self.bytes_written = 0
+
+    @classmethod
+    def open(cls, destination=None, fd=None):
+        """
+        Ouvre un writer vers stdout ('-' ou None), un descripteur ou un fichier
+
+        Args:
+            destination (str, optional): Chemin du fichier, '-' pour stdout
+            fd (int, optional): Descripteur de fichier déjà ouvert (prioritaire)
+
+        Returns:
+            NDJSONWriter: Le writer
+        """
+        if fd is not None:
+            return cls(os.fdopen(fd, 'wb', closefd=False), owned=True)
+        if destination in (None, '-'):
+            return cls(sys.stdout.buffer)
+        return cls(open(destination, 'wb'), owned=True)
+
+    def write(self, record):
+        line = encode_record(record)
+        self.stream.write(line)
+        self.bytes_written += len(line)
+        self.count += 1
+
+    def write_courses(self, courses):
+        """
+        Écrit les cours au fur et à mesure qu'ils sont produits
+
+        Args:
+            courses (iterable): Cours (liste ou générateur)
+
+        Returns:
+            int: Nombre de cours écrits
+        """
+        written = 0
+        for course in courses:
+            self.write(course_record(course))
+            written += 1
+        self.flush()
+        return written
+
+    def write_messages(self, messages):
+        """
+        Écrit les messages programmés (déjà triés, voir MessageQueue)
+
+        Args:
+            messages (iterable): ScheduledMessage
+
+        Returns:
+            int: Nombre de messages écrits
+        """
+        written = 0
+        for message in messages:
+            self.write(message_record(message))
+            written += 1
+        self.flush()
+        return written
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+        if self.owned:
+            self.stream.close()
@@ -0,0 +1,179 @@
+"""
+Vérification rapide des en-têtes d'un classeur, avant toute analyse complète.
+
+Seules la liste des feuilles et la première ligne non vide de chaque feuille
+sont lues (excel_reader.read_headers): un fichier mal formé est rejeté en
+quelques millisecondes, sans analyser les données.
+
+Le rapport indique, pour chaque feuille, les colonnes obligatoires absentes
+et les colonnes présentes qui leur ressemblent (difflib), par exemple une
+colonne 'Zoom link ' qui remplace 'Zoom Link'.
+
+Le type de chaque feuille est déterminé d'après sa ligne d'en-tête (voir
+excel_layouts), puis d'après son nom si l'en-tête n'est pas reconnu.
+"""
+import difflib
+import time
+
+from excel_layouts import (FIXED_TITLE_COLUMN, GRID_COLUMNS, KIND_DYNAMIC, KIND_FIXED, KIND_GRID,
+                           KIND_MESSAGE, MESSAGE_COLUMNS, detect_layout, sheet_kind)
+from excel_reader import read_headers
+
+# Colonnes obligatoires par type de feuille
+REQUIRED_COLUMNS = {
+    KIND_DYNAMIC: ['Coach', 'Zoom Link', 'TIME (France)'],
+    KIND_FIXED: [FIXED_TITLE_COLUMN, 'DAY', 'TIME (France)', 'TELEGRAM GROUP ID'],
+    KIND_MESSAGE: list(MESSAGE_COLUMNS),
+    KIND_GRID: list(GRID_COLUMNS),
+}
+
+# Types de feuilles qui contiennent des cours
+COURSE_KINDS = (KIND_DYNAMIC, KIND_FIXED, KIND_GRID)
+
+SUGGESTION_CUTOFF = 0.6
+RENAMED_CUTOFF = 0.8
+
+
+def required_columns(sheet_name, kind=None):
+    """
+    Colonnes obligatoires d'une feuille selon son type
+
+    Args:
+        sheet_name (str): Nom de la feuille Excel
+        kind (str, optional): Type détecté (sinon déduit du nom de la feuille)
+
+    Returns:
+        list: Noms des colonnes requises
+    """
+    return list(REQUIRED_COLUMNS.get(kind or sheet_kind(sheet_name), []))
+
+
+def _normalize(name):
+    return ' '.join(str(name).split()).casefold()
+
+
+def suggest_columns(missing, candidates, limit=3):
+    """
+    Colonnes présentes qui ressemblent à une colonne manquante
+
+    La comparaison ignore la casse et les espaces superflus.
+
+    Args:
+        missing (str): Colonne obligatoire absente
+        candidates (list): Colonnes présentes dans la feuille
+        limit (int): Nombre maximal de suggestions
+
+    Returns:
+        list: Tuples (colonne, similarité) du plus au moins proche
+    """
+    target = _normalize(missing)
+    scored = []
+    for candidate in candidates:
+        ratio = difflib.SequenceMatcher(None, target, _normalize(candidate)).ratio()
+        if ratio >= SUGGESTION_CUTOFF:
+            scored.append((candidate, round(ratio, 3)))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[:limit]
+
+
+def check_columns(sheet_name, columns, layout=None):
+    """
+    Vérifie les colonnes d'une feuille
+
+    Args:
+        sheet_name (str): Nom de la feuille
+        columns (list): Colonnes lues dans la ligne d'en-tête
+        layout (SheetLayout, optional): Disposition déjà détectée (detect_layout)
+
+    Returns:
+        dict: {'name', 'kind', 'layout', 'ok', 'missing', 'suggestions', 'renamed'}
+    """
+    if layout is None:
+        layout = detect_layout(sheet_name, columns)
+    columns = layout.apply(columns)
+    required = required_columns(sheet_name, layout.kind)
+    present = set(columns)
+    missing = [column for column in required if column not in present]
+
+    # Les colonnes obligatoires déjà présentes ne peuvent pas être le nouveau nom d'une autre
+    candidates = [column for column in columns if column not in required and isinstance(column, str)]
+    suggestions = {}
+    renamed = {}
+    for column in missing:
+        matches = suggest_columns(column, candidates)
+        if matches:
+            suggestions[column] = [candidate for candidate, _ in matches]
+            best, ratio = matches[0]
+            if ratio >= RENAMED_CUTOFF:
+                renamed[column] = best
+
+    return {
+        'name': sheet_name,
+        'kind': layout.kind,
+        'layout': layout.to_dict(),
+        'ok': not missing,
+        'missing': missing,
+        'suggestions': suggestions,
+        'renamed': renamed,
+    }
+
+
+def describe_problems(sheet_report):
+    """
+    Message lisible pour une feuille invalide
+
+    Returns:
+        str: Colonnes manquantes et renommages probables
+    """
+    parts = []
+    for column in sheet_report['missing']:
+        if column in sheet_report['renamed']:
+            parts.append(f"'{column}' (renommée en '{sheet_report['renamed'][column]}' ?)")
+        elif column in sheet_report['suggestions']:
+            parts.append(f"'{column}' (proches: {', '.join(repr(c) for c in sheet_report['suggestions'][column])})")
+        else:
+            parts.append(f"'{column}'")
+    return f"Colonnes manquantes dans la feuille '{sheet_report['name']}': {', '.join(parts)}"
+
+
+def preflight(excel_path, sheet_filter=None):
+    """
+    Vérifie les en-têtes de toutes les feuilles sans lire leurs données
+
+    Le classeur est valide s'il contient au moins une feuille de cours
+    (Dynamic, Fix ou grille) dont toutes les colonnes obligatoires sont présentes.
+
+    Args:
+        excel_path (str): Chemin vers le fichier Excel
+        sheet_filter (callable, optional): Prédicat sur le nom des feuilles à vérifier
+
+    Returns:
+        dict: {'ok', 'excel_path', 'sheets': [...], 'errors': [...], 'elapsed'}
+    """
+    start = time.perf_counter()
+    sheets = []
+    errors = []
+
+    try:
+        for sheet_name, columns in read_headers(excel_path, sheet_filter=sheet_filter):
+            sheets.append(check_columns(sheet_name, columns))
+    except Exception as e:
+        errors.append(f"Lecture du classeur impossible: {str(e)}")
+
+    for sheet_report in sheets:
+        if not sheet_report['ok']:
+            errors.append(describe_problems(sheet_report))
+
+    course_sheets = [s for s in sheets if s['kind'] in COURSE_KINDS and s['ok']]
+    if sheets and not course_sheets:
+        errors.append("Aucune feuille de cours valide (Dynamic, Fix ou grille) dans le fichier Excel")
+    elif not sheets and not errors:
+        errors.append("Aucune feuille valide trouvée dans le fichier Excel")
+
+    return {
+        'ok': bool(course_sheets),
+        'excel_path': excel_path,
+        'sheets': sheets,
+        'errors': errors,
+        'elapsed': round(time.perf_counter() - start, 6),
+    }
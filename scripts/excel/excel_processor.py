@@ -1,24 +1,81 @@
-import pandas as pd
 import json
 import os
-import re
+import sys
+import threading
+import time
 from datetime import datetime, timedelta
 import logging
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO, 
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from excel_batch import collect_workbooks, process_batch
+from excel_cache import CourseCache, DEFAULT_MAX_BYTES
+from excel_diff import DEFAULT_DB_PATH, diff_courses, load_courses_from_db, load_snapshot, summarize
+from excel_layouts import KIND_DYNAMIC, KIND_FIXED, KIND_GRID, KIND_MESSAGE, detect_layout, sheet_kind
+from excel_logging import DEFAULT_FORMAT, DEFAULT_LEVEL, LOG_FORMATS, LOG_LEVELS, configure_logging
+from excel_messages import MESSAGE_COLUMNS, MessageQueue, ScheduledMessage, extract_messages
+from excel_metrics import ImportMetrics, profile_run
+from excel_models import Course, json_default
+from excel_conflicts import DEFAULT_DURATION, ConflictDetector
+from excel_occurrences import FRANCE_TIMEZONE, OccurrenceIndex
+from excel_output import NDJSONWriter, conflicts_record, metrics_record, occurrence_index_record
+from excel_preflight import check_columns, describe_problems, preflight, required_columns
+from excel_reader import iter_sheets, pad_rows, read_headers, sheet_sizes
+from excel_rowcache import RowCache, frame_signature
+from excel_rows import SheetTable, parse_weekday
+from excel_snapshot import SNAPSHOT_SUFFIX, write_snapshot
+from excel_titles import TitleTokenizer
+from excel_sqlite import write_courses
+
+# Les handlers sont installés par main() (voir excel_logging.configure_logging)
 logger = logging.getLogger('excel_processor')
 
+# pandas, numpy et openpyxl ne sont importés qu'à la lecture d'un classeur
+# (imports locaux), pour que --help, --serve ou le moteur openpyxl démarrent vite
+ENGINES = ['pandas', 'openpyxl']
+
+# Un événement d'avancement toutes les PROGRESS_ROWS lignes lues
+PROGRESS_ROWS = 1000
+
+
+class ImportCancelled(Exception):
+    """
+    Levée par le rappel d'avancement pour interrompre un import en cours
+    """
+
+
 class ExcelProcessor:
-    def __init__(self, excel_path):
+    def __init__(self, excel_path, cache=None, sheet_executor=None, engine='pandas', progress=None):
         """
         Initialise le processeur Excel.
         
         Args:
             excel_path (str): Chemin vers le fichier Excel à traiter
+            cache (CourseCache, optional): Cache des résultats par empreinte du fichier
+            sheet_executor (str, optional): 'thread' ou 'process' pour traiter les feuilles en parallèle
+            engine (str): 'pandas' (DataFrames) ou 'openpyxl' (lignes Python, sans importer pandas)
+            progress (callable, optional): Reçoit les événements d'avancement (dict); peut lever
+                ImportCancelled pour interrompre l'import
         """
         self.excel_path = excel_path
+        self.cache = cache
+        self.sheet_executor = sheet_executor
+        self.engine = engine
+        self.progress = progress
+        self._progress_lock = threading.Lock()
+        self._progress_sizes = {}
+        self._progress_done = 0
+        
+        # Durées par étape et compteurs de l'import (voir excel_metrics)
+        self.metrics = ImportMetrics()
+        
+        # Messages Telegram programmés des feuilles "Message" (voir message_queue)
+        self.messages = []
+        
+        # Disposition détectée de chaque feuille lue (voir excel_layouts)
+        self.sheet_layouts = {}
+        
+        # Cours de chaque ligne lors de l'import précédent du même fichier (voir excel_rowcache);
+        # chargé depuis le cache quand le fichier a changé
+        self.row_cache = None
         
         # Mappage des colonnes pour chaque feuille
         self.dynamic_sheet_columns = {
@@ -31,11 +88,33 @@ class ExcelProcessor:
             'zoom_link': 'Zoom Link'
         }
         
+        # Colonnes d'une grille coach x créneaux (disposition de scripts/excel_processor.py)
+        self.grid_sheet_columns = {
+            'coach_name': 'Unnamed: 0',
+            'coach_email': 'Unnamed: 1',
+            'telegram_group': 'Group ID'
+        }
+        
         # Patterns pour l'extraction des données
         self.course_level_patterns = ['BBG', 'ABG', 'IG']
         self.schedule_patterns = ['MW', 'TT', 'SS', 'FS']
         self.time_pattern = r'(\d+:\d+\s*(?:AM|PM|am|pm))'
         
+        # Analyse des titres en une passe (mots entiers, résultats mémorisés)
+        self.title_tokenizer = TitleTokenizer(self.schedule_patterns, self.course_level_patterns,
+                                              self.time_pattern)
+        
+        # Correspondance des noms de jours (anglais et français) vers leur index
+        self.day_map = {
+            'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
+            'Friday': 4, 'Saturday': 5, 'Sunday': 6,
+            'Lundi': 0, 'Mardi': 1, 'Mercredi': 2, 'Jeudi': 3,
+            'Vendredi': 4, 'Samedi': 5, 'Dimanche': 6
+        }
+        
+        # Pattern par défaut d'un cours fixe selon son jour
+        self.day_to_pattern = {0: "MW", 2: "MW", 1: "TT", 3: "TT", 4: "FS", 5: "FS", 6: "SS"}
+        
     def validate_excel_structure(self, df, sheet_name):
         """
         Vérifie la structure du fichier Excel
@@ -47,58 +126,86 @@ class ExcelProcessor:
         Returns:
             bool: True si la structure est valide, False sinon
         """
-        # Définir les colonnes requises en fonction de la feuille
-        required_columns = []
+        return self.validate_columns(df.columns, sheet_name)
+    
+    @staticmethod
+    def required_columns(sheet_name):
+        """
+        Colonnes obligatoires d'une feuille selon son type
         
-        if "Dynamic" in sheet_name:
-            required_columns = ['Coach', 'Zoom Link', 'TIME (France)']
-        elif "Fix" in sheet_name:
-            required_columns = ['Salma Choufani - ABG - SS - 2:00pm', 'DAY', 'TIME (France)', 'TELEGRAM GROUP ID']
-        elif "Message" in sheet_name:
-            required_columns = ['Telegram Chat Id', 'Telegram Message', 'Sending Date']
+        Args:
+            sheet_name (str): Nom de la feuille Excel
+            
+        Returns:
+            list: Noms des colonnes requises
+        """
+        return required_columns(sheet_name)
+    
+    def validate_columns(self, columns, sheet_name, layout=None):
+        """
+        Vérifie que les colonnes requises d'une feuille sont présentes
         
-        # Vérifier si les colonnes requises sont présentes
-        missing_columns = []
-        for col in required_columns:
-            if col not in df.columns:
-                missing_columns.append(col)
+        Les colonnes manquantes sont journalisées avec les colonnes présentes
+        qui leur ressemblent (colonne probablement renommée).
         
-        if missing_columns:
-            logger.error(f"Colonnes manquantes dans la feuille '{sheet_name}': {missing_columns}")
+        Args:
+            columns (list): Noms des colonnes de la feuille
+            sheet_name (str): Nom de la feuille Excel
+            layout (SheetLayout, optional): Disposition détectée (sinon détectée ici)
+            
+        Returns:
+            bool: True si la structure est valide, False sinon
+        """
+        report = check_columns(sheet_name, list(columns), layout)
+        if not report['ok']:
+            logger.error(describe_problems(report))
             return False
         
         return True
     
-    def load_excel_data(self):
+    def preflight(self):
+        """
+        Vérifie les en-têtes des feuilles de planning sans lire leurs données
+        
+        Returns:
+            dict: Rapport de validation (voir excel_preflight.preflight)
+        """
+        with self.metrics.stage('validate'):
+            return preflight(self.excel_path)
+    
+    def check_workbook(self):
+        """
+        Rejette en quelques millisecondes un classeur sans feuille de cours valide
+        
+        Returns:
+            list: Erreurs de validation (vide si le traitement peut continuer)
+        """
+        report = self.preflight()
+        if report['ok']:
+            return []
+        for error in report['errors']:
+            logger.error(error)
+        return report['errors']
+    
+    def load_excel_data(self, clean=True):
         """
         Charge et valide les données Excel
         
+        Args:
+            clean (bool): Nettoyer les DataFrames (clean_data) après chargement
+            
         Returns:
             dict: Un dictionnaire contenant les DataFrames pour chaque feuille pertinente
         """
         try:
-            # Lire le fichier Excel
-            excel_data = pd.ExcelFile(self.excel_path, engine='openpyxl')
-            sheet_names = excel_data.sheet_names
-            
             data_frames = {}
+            self._record_input_size()
             
-            # Traiter chaque feuille
-            for sheet_name in sheet_names:
-                if "Schedule" in sheet_name:
-                    df = pd.read_excel(
-                        self.excel_path,
-                        sheet_name=sheet_name,
-                        engine='openpyxl'
-                    )
-                    
-                    # Valider la structure
-                    if self.validate_excel_structure(df, sheet_name):
-                        # Nettoyer les données
-                        df = self.clean_data(df)
-                        data_frames[sheet_name] = df
-                    else:
-                        logger.warning(f"Structure invalide pour la feuille '{sheet_name}', ignorée")
+            # Ouvrir le classeur une seule fois et lire chaque feuille en flux
+            for sheet in iter_sheets(self.excel_path):
+                df = self.load_sheet_frame(sheet, clean=clean)
+                if df is not None:
+                    data_frames[sheet.name] = df
             
             if not data_frames:
                 logger.error("Aucune feuille valide trouvée dans le fichier Excel")
@@ -106,10 +213,174 @@ class ExcelProcessor:
                 
             return data_frames
             
+        except ImportCancelled:
+            raise
         except Exception as e:
             logger.error(f"Erreur lors du chargement Excel: {str(e)}")
             return None
     
+    @staticmethod
+    def is_schedule_sheet(sheet_name):
+        """
+        Indique si le nom d'une feuille est celui d'un planning de cours ou de messages
+        
+        Toutes les feuilles sont aiguillées d'après leur en-tête (detect_layout);
+        le nom ne sert que si l'en-tête n'est pas reconnu: une telle feuille est
+        signalée comme non reconnue, les autres sont ignorées sans avertissement.
+        """
+        return "Schedule" in sheet_name or "Message" in sheet_name
+    
+    def routed_sheet_names(self):
+        """
+        Feuilles dont la disposition est reconnue d'après l'en-tête, sinon d'après le nom
+        
+        Returns:
+            list: Noms des feuilles dans l'ordre du classeur
+        """
+        return [name for name, columns in read_headers(self.excel_path)
+                if self.is_schedule_sheet(name) or detect_layout(name, columns).kind is not None]
+    
+    def _record_input_size(self):
+        """
+        Enregistre la taille du classeur lu dans les mesures
+        """
+        try:
+            self.metrics.bytes_read = os.path.getsize(self.excel_path)
+        except OSError:
+            pass
+    
+    def detect_layout(self, sheet_name, columns):
+        """
+        Détecte la disposition d'une feuille d'après sa ligne d'en-tête
+        
+        La détection est mémorisée par empreinte de l'en-tête: celle faite
+        par preflight() est réutilisée à la lecture de la feuille.
+        
+        Args:
+            sheet_name (str): Nom de la feuille
+            columns (list): Colonnes lues dans la ligne d'en-tête
+            
+        Returns:
+            SheetLayout: La disposition (voir excel_layouts)
+        """
+        layout = detect_layout(sheet_name, columns)
+        self.sheet_layouts[sheet_name] = layout
+        return layout
+    
+    def sheet_kind(self, sheet_name):
+        """
+        Type d'une feuille: disposition détectée à la lecture, sinon d'après son nom
+        
+        Returns:
+            str: 'dynamic', 'fixed', 'message', 'grid' ou None
+        """
+        layout = self.sheet_layouts.get(sheet_name)
+        return layout.kind if layout is not None else sheet_kind(sheet_name)
+    
+    def start_progress(self):
+        """
+        Prépare le suivi d'avancement: le pourcentage est estimé d'après la
+        taille du XML des feuilles déjà lues (la lecture domine la durée d'un import)
+        """
+        if self.progress is None:
+            return
+        self._progress_sizes = sheet_sizes(self.excel_path)
+        self._progress_done = 0
+        self.report_progress('start')
+    
+    def report_progress(self, stage, sheet_name=None, rows=0, sheet_done=False):
+        """
+        Transmet un événement d'avancement au rappel 'progress' (sans effet s'il est absent)
+        
+        Le rappel peut lever ImportCancelled: chaque appel est un point d'annulation.
+        
+        Args:
+            stage (str): Étape en cours (start, read, extract)
+            sheet_name (str, optional): Feuille en cours
+            rows (int): Lignes traitées dans la feuille
+            sheet_done (bool): La feuille est entièrement lue
+        """
+        if self.progress is None:
+            return
+        with self._progress_lock:
+            if sheet_done:
+                self._progress_done += self._progress_sizes.get(sheet_name, 0)
+            total = sum(self._progress_sizes.values())
+            percent = round(100.0 * self._progress_done / total, 1) if total else None
+        self.progress({'stage': stage, 'sheet': sheet_name, 'rows': rows, 'percent': percent})
+    
+    def _rows_with_progress(self, sheet):
+        rows = 0
+        for row in sheet.rows:
+            yield row
+            rows += 1
+            if rows % PROGRESS_ROWS == 0:
+                self.report_progress('read', sheet.name, rows)
+    
+    def load_sheet_frame(self, sheet, clean=True):
+        """
+        Construit, valide et nettoie le DataFrame d'une feuille lue en flux
+        
+        La disposition est détectée et les en-têtes sont validés avant la
+        lecture des lignes: une feuille invalide ou non reconnue n'est jamais
+        décompressée. Les colonnes reconnues prennent les noms attendus par
+        l'extracteur. Avec le moteur 'openpyxl', la feuille est gardée en
+        lignes (SheetTable) au lieu d'un DataFrame.
+        
+        Args:
+            sheet (SheetRows): Feuille en cours de lecture
+            clean (bool): Appliquer clean_data au DataFrame
+            
+        Returns:
+            DataFrame: Le DataFrame nettoyé (ou SheetTable), None si la structure est invalide
+        """
+        # Détecter la disposition et valider la structure d'après la ligne d'en-tête seule
+        with self.metrics.stage('validate'):
+            layout = self.detect_layout(sheet.name, sheet.columns)
+            valid = layout.kind is not None and self.validate_columns(sheet.columns, sheet.name, layout)
+        if layout.kind is None:
+            if self.is_schedule_sheet(sheet.name):
+                logger.warning(f"Disposition non reconnue pour la feuille '{sheet.name}', ignorée")
+                self.metrics.count('sheets_unrecognized')
+            else:
+                logger.debug(f"Feuille '{sheet.name}' sans planning reconnu, ignorée")
+            self.report_progress('read', sheet.name, sheet_done=True)
+            return None
+        if not valid:
+            logger.warning(f"Structure invalide pour la feuille '{sheet.name}', ignorée")
+            self.metrics.count('sheets_invalid')
+            self.report_progress('read', sheet.name, sheet_done=True)
+            return None
+        self.metrics.count('sheets_loaded')
+        columns = layout.apply(sheet.columns)
+        
+        if self.engine != 'openpyxl':
+            # Importé hors du chronomètre pour ne pas compter l'import dans l'étape 'read'
+            import pandas as pd
+        
+        rows = sheet.rows if self.progress is None else self._rows_with_progress(sheet)
+        
+        # La décompression et l'analyse XML ont lieu pendant la consommation des lignes
+        with self.metrics.stage('read'):
+            records = list(rows)
+            if sheet.width > len(columns):
+                # Cellules à droite du dernier en-tête: colonnes 'Unnamed: N', comme avec pandas
+                columns = layout.apply(sheet.all_columns())
+                records = pad_rows(records, len(columns))
+            if self.engine == 'openpyxl':
+                df = SheetTable(sheet.name, columns, records)
+            else:
+                df = pd.DataFrame.from_records(records, columns=columns)
+        self.metrics.rows_scanned(sheet.name, len(df) + sheet.empty_rows)
+        self.metrics.rows_skipped(sheet.name, 'empty_row', sheet.empty_rows)
+        self.report_progress('read', sheet.name, len(df), sheet_done=True)
+        
+        # Nettoyer les données
+        if not clean:
+            return df
+        with self.metrics.stage('clean'):
+            return self.clean_data(df)
+    
     def clean_data(self, df):
         """
         Nettoie et structure les données
@@ -120,6 +391,10 @@ class ExcelProcessor:
         Returns:
             DataFrame: Le DataFrame nettoyé
         """
+        # Les SheetTable sont normalisées colonne par colonne, à la lecture
+        if isinstance(df, SheetTable):
+            return df
+        
         # Supprimer les lignes entièrement vides
         df = df.dropna(how='all')
         
@@ -139,10 +414,7 @@ class ExcelProcessor:
         Returns:
             str: Le pattern du cours ou None si non trouvé
         """
-        for pattern in self.schedule_patterns:
-            if pattern in course_text:
-                return pattern
-        return None
+        return self.title_tokenizer.parse(course_text)[0]
     
     def extract_course_level(self, course_text):
         """
@@ -154,10 +426,7 @@ class ExcelProcessor:
         Returns:
             str: Le niveau du cours ou None si non trouvé
         """
-        for level in self.course_level_patterns:
-            if level in course_text:
-                return level
-        return None
+        return self.title_tokenizer.parse(course_text)[1]
     
     def extract_time(self, course_text):
         """
@@ -169,10 +438,7 @@ class ExcelProcessor:
         Returns:
             str: L'heure du cours ou None si non trouvée
         """
-        time_match = re.search(self.time_pattern, course_text)
-        if time_match:
-            return time_match.group(1)
-        return None
+        return self.title_tokenizer.parse(course_text)[2]
     
     def extract_days_from_pattern(self, pattern):
         """
@@ -219,177 +485,633 @@ class ExcelProcessor:
         courses = []
         
         for sheet_name, df in data_frames.items():
-            schedule_type = "dynamic" if "Dynamic" in sheet_name else "fixed"
+            courses.extend(self.process_sheet_frame(sheet_name, df))
+        
+        return courses
+    
+    def process_sheet_frame(self, sheet_name, df):
+        """
+        Extrait les cours d'une feuille selon son type (disposition détectée)
+        
+        Args:
+            sheet_name (str): Nom de la feuille
+            df (DataFrame): Le DataFrame nettoyé de la feuille
             
-            # Traitement différent selon le type de feuille
-            if "Dynamic" in sheet_name:
-                courses.extend(self.process_dynamic_schedule(df, schedule_type))
-            elif "Fix" in sheet_name:
-                courses.extend(self.process_fixed_schedule(df, schedule_type))
+        Returns:
+            list: Liste des cours de la feuille
+        """
+        kind = self.sheet_kind(sheet_name)
+        if kind in (KIND_DYNAMIC, KIND_FIXED):
+            schedule_type = kind
+        else:
+            schedule_type = "dynamic" if "Dynamic" in sheet_name else "fixed"
+        
+        # Traitement différent selon le type de feuille
+        with self.metrics.stage('extract'):
+            if kind in (KIND_DYNAMIC, KIND_FIXED, KIND_GRID) and self.row_cache is not None:
+                courses = self.extract_changed_rows(df, kind, schedule_type, sheet_name)
+            elif kind in (KIND_DYNAMIC, KIND_FIXED, KIND_GRID):
+                courses = self.extract_courses(df, kind, schedule_type, sheet_name)
+            elif kind == KIND_MESSAGE:
+                self.messages.extend(self.process_message_sheet(df, sheet_name))
+                courses = []
+            else:
+                self.metrics.rows_skipped(sheet_name, 'not_a_course_sheet', len(df))
+                courses = []
         
+        self.metrics.courses_emitted(sheet_name, len(courses))
+        self.report_progress('extract', sheet_name, len(df))
         return courses
     
-    def process_dynamic_schedule(self, df, schedule_type):
+    def extract_courses(self, df, kind, schedule_type, sheet_name, origins=None):
         """
-        Traite les données de la feuille Dynamic Schedule
+        Extrait les cours d'une feuille avec l'extracteur de sa disposition et du moteur
         
         Args:
-            df (DataFrame): Le DataFrame contenant les données
+            df (DataFrame | SheetTable): La feuille nettoyée
+            kind (str): Disposition ('dynamic', 'fixed' ou 'grid')
             schedule_type (str): Type de planning (dynamic/fixed)
+            sheet_name (str): Nom de la feuille (pour les mesures)
+            origins (list, optional): Reçoit la position de la ligne de chaque cours
             
         Returns:
-            list: Liste des cours traités
+            list: Liste des cours de la feuille
         """
-        courses = []
+        rows_engine = isinstance(df, SheetTable)
+        if kind == KIND_DYNAMIC:
+            extractor = self.process_dynamic_rows if rows_engine else self.process_dynamic_schedule
+        elif kind == KIND_FIXED:
+            extractor = self.process_fixed_rows if rows_engine else self.process_fixed_schedule
+        else:
+            extractor = self.process_grid_schedule
+        return extractor(df, schedule_type, sheet_name, origins)
+    
+    def extract_changed_rows(self, df, kind, schedule_type, sheet_name):
+        """
+        Extrait les cours d'une feuille en reprenant ceux des lignes inchangées depuis l'import précédent
         
-        # Parcourir toutes les lignes
-        for idx, row in df.iterrows():
-            coach = row.get('Coach', '')
-            
-            # Ignorer les lignes sans coach
-            if not isinstance(coach, str) or not coach.strip():
-                continue
+        Seules les lignes nouvelles ou modifiées passent par l'extracteur (voir
+        excel_rowcache); les lignes ignorées des mesures ne concernent donc
+        que ces lignes.
+        
+        Args:
+            df (DataFrame | SheetTable): La feuille nettoyée
+            kind (str): Disposition ('dynamic', 'fixed' ou 'grid')
+            schedule_type (str): Type de planning (dynamic/fixed)
+            sheet_name (str): Nom de la feuille
             
-            # Extraire les informations
-            zoom_link = row.get('Zoom Link', '')
-            time_france = row.get('TIME (France)', '')
+        Returns:
+            list: Liste des cours de la feuille, dans l'ordre des lignes
+        """
+        signature = frame_signature(df, self.engine)
+        signature.update(kind=kind, schedule_type=schedule_type)
+        courses = self.row_cache.extract(
+            sheet_name, df, signature,
+            lambda frame, origins: self.extract_courses(frame, kind, schedule_type, sheet_name, origins)
+        )
+        
+        changes = self.row_cache.changes[sheet_name]
+        for name in ('reused', 'added', 'removed'):
+            self.metrics.count(f'rows_{name}', changes[name])
+        if not changes['full']:
+            logger.info(f"Feuille '{sheet_name}': {changes['reused']} ligne(s) inchangée(s), "
+                        f"{changes['added']} ajoutée(s) ou modifiée(s), {changes['removed']} supprimée(s)")
+        return courses
+    
+    def process_message_sheet(self, df, sheet_name='Message Schedule'):
+        """
+        Extrait les messages Telegram programmés d'une feuille "Message"
+        
+        Args:
+            df (DataFrame | SheetTable): La feuille nettoyée
+            sheet_name (str): Nom de la feuille (pour les mesures)
             
-            # Identifier le pattern et le niveau à partir du titre
-            course_name = row.get('Topic ', '')
+        Returns:
+            list: ScheduledMessage de la feuille, dans l'ordre des lignes
+        """
+        if any(column not in df.columns for column in MESSAGE_COLUMNS):
+            self.metrics.rows_skipped(sheet_name, 'missing_columns', len(df))
+            return []
+        
+        if isinstance(df, SheetTable):
+            columns = [df.column(column) for column in MESSAGE_COLUMNS]
+        else:
+            columns = [self._column_values(df, column) for column in MESSAGE_COLUMNS]
+        messages, skipped = extract_messages(*columns)
+        for reason, value in skipped.items():
+            self.metrics.rows_skipped(sheet_name, reason, value)
+        self.metrics.count('messages', len(messages))
+        return messages
+    
+    def message_queue(self):
+        """
+        File des messages programmés extraits, triée par date d'envoi et indexée par chat
+        
+        Returns:
+            MessageQueue: La file
+        """
+        return MessageQueue(self.messages)
+    
+    def process_sheet(self, sheet_name):
+        """
+        Lit et traite une seule feuille du classeur, indépendamment des autres
+        
+        Args:
+            sheet_name (str): Nom de la feuille
             
-            # Vérifier si c'est une ligne de cours valide
-            if not isinstance(course_name, str) or not course_name.strip():
-                continue
+        Returns:
+            list: Liste des cours de la feuille, ou None si sa structure est invalide
+        """
+        for sheet in iter_sheets(self.excel_path, sheet_filter=lambda name: name == sheet_name):
+            df = self.load_sheet_frame(sheet)
+            if df is None:
+                return None
+            return self.process_sheet_frame(sheet_name, df)
+        return None
+    
+    def process_sheets_in_parallel(self, executor_kind='thread', workers=None):
+        """
+        Traite les feuilles du classeur en parallèle, une feuille par worker
+        
+        Chaque worker rouvre le fichier et ne décompresse que sa feuille avec
+        son propre processeur (mesures, messages et cache par ligne); les
+        résultats sont fusionnés par le thread appelant, dans l'ordre des
+        feuilles. Les processus contournent le GIL (analyse XML en Python pur);
+        les threads évitent le coût de démarrage et de sérialisation des résultats.
+        
+        Args:
+            executor_kind (str): 'thread' ou 'process'
+            workers (int, optional): Nombre de workers (une par feuille par défaut)
             
-            course_pattern = self.extract_course_pattern(course_name)
-            course_level = self.extract_course_level(course_name)
-            course_time = self.extract_time(course_name) or time_france
-            
-            # Si les informations essentielles sont présentes
-            if coach and (course_pattern or course_level):
-                # Utiliser le pattern pour déterminer les jours
-                days = []
-                if course_pattern:
-                    days = self.extract_days_from_pattern(course_pattern)
-                elif 'Start Date & Time' in row:
-                    # Si pas de pattern, essayer d'extraire le jour à partir de la date de début
-                    try:
-                        start_date = pd.to_datetime(row['Start Date & Time'])
-                        day_number = start_date.weekday()  # 0=Monday, 6=Sunday
-                        days = [day_number]
-                    except:
-                        # Fallback sur lundi si pas de date valide
-                        days = [0]
-                else:
-                    # Fallback sur lundi si pas de date
-                    days = [0]
-                
-                # Pattern et niveau par défaut si non trouvés
-                if not course_pattern:
-                    course_pattern = "MW"  # Pattern par défaut
-                if not course_level:
-                    course_level = "ABG"  # Niveau par défaut
-                
-                # Créer un cours pour chaque jour
-                for day in days:
-                    course = {
-                        'name': f"{coach} - {course_level} - {course_pattern} - {course_time}",
-                        'instructor': "Kodjo",
-                        'professorName': coach,
-                        'level': course_level,
-                        'schedule': course_pattern,
-                        'dayOfWeek': self.get_day_name(day),
-                        'time': course_time,
-                        'zoomLink': zoom_link,
-                        'telegramGroup': '',
-                        'schedule_type': schedule_type,
-                        'description': f"Cours de {course_level} avec {coach}, {course_pattern} à {course_time}"
-                    }
-                    
-                    courses.append(course)
-                    logger.info(f"Cours extrait (Dynamic): {course['name']} (Jour {day})")
+        Returns:
+            list: Liste des cours ou None si aucune feuille valide
+        """
+        self._record_input_size()
+        sheet_names = self.routed_sheet_names()
+        if not sheet_names:
+            logger.error("Aucune feuille valide trouvée dans le fichier Excel")
+            return None
+        
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        
+        executor_class = ProcessPoolExecutor if executor_kind == 'process' else ThreadPoolExecutor
+        with executor_class(max_workers=workers or len(sheet_names)) as executor:
+            if executor_kind == 'process':
+                results = []
+                # Les mesures de chaque processus sont rapatriées avec ses cours
+                for result, messages, metrics in executor.map(_process_sheet_in_worker,
+                                                              [self.excel_path] * len(sheet_names),
+                                                              sheet_names, [self.engine] * len(sheet_names)):
+                    results.append(result)
+                    self.messages.extend(messages)
+                    self.metrics.merge(metrics)
+                    self.report_progress('extract', sheet_names[len(results) - 1], sheet_done=True)
+            else:
+                results = []
+                row_caches = [None if self.row_cache is None else self.row_cache.for_sheet(name)
+                              for name in sheet_names]
+                for result, processor in executor.map(self._process_sheet_in_thread, sheet_names, row_caches):
+                    results.append(result)
+                    self.messages.extend(processor.messages)
+                    self.metrics.merge(processor.metrics.to_dict())
+                    self.sheet_layouts.update(processor.sheet_layouts)
+                    if self.row_cache is not None:
+                        self.row_cache.merge(processor.row_cache)
+        
+        if all(result is None for result in results):
+            logger.error("Aucune feuille valide trouvée dans le fichier Excel")
+            return None
         
+        courses = []
+        for result in results:
+            courses.extend(result or [])
         return courses
     
-    def process_fixed_schedule(self, df, schedule_type):
+    def _process_sheet_in_thread(self, sheet_name, row_cache=None):
         """
-        Traite les données de la feuille Fix Schedule
+        Traite une feuille dans un thread avec un processeur qui ne partage aucun état mutable
+        
+        Args:
+            sheet_name (str): Nom de la feuille
+            row_cache (RowCache, optional): Cache par ligne réduit à la feuille (RowCache.for_sheet)
+            
+        Returns:
+            tuple: (cours de la feuille ou None, processeur de la feuille)
+        """
+        processor = ExcelProcessor(self.excel_path, engine=self.engine, progress=self.progress)
+        processor.row_cache = row_cache
+        # L'avancement (et l'annulation) passe par ce processeur, sous son verrou
+        processor.report_progress = self.report_progress
+        return processor.process_sheet(sheet_name), processor
+    
+    def extract_title_fields(self, titles):
+        """
+        Extrait le pattern, le niveau et l'heure pour toute une colonne de titres
+        
+        Chaque titre distinct est analysé une seule fois par le TitleTokenizer
+        (voir excel_titles); les priorités sont celles de extract_course_pattern,
+        extract_course_level et extract_time.
+        
+        Args:
+            titles (Series | list): Titres des cours (chaînes de caractères)
+            
+        Returns:
+            tuple: (patterns, niveaux, heures) sous forme de listes, None si non trouvé
+        """
+        if not isinstance(titles, list):
+            titles = titles.tolist()
+        return self.title_tokenizer.parse_many(titles)
+    
+    @staticmethod
+    def _non_blank_text_mask(series):
+        """
+        Masque des cellules contenant une chaîne non vide
+        """
+        import pandas as pd
+        
+        if not pd.api.types.is_object_dtype(series) and not pd.api.types.is_string_dtype(series):
+            return pd.Series(False, index=series.index)
+        return series.str.strip().str.len().gt(0).fillna(False).astype(bool)
+    
+    @staticmethod
+    def _truthy_mask(series):
+        """
+        Masque des cellules dont la valeur est vraie au sens Python
+        """
+        import numpy as np
+        import pandas as pd
+        
+        return pd.Series(np.fromiter(map(bool, series.tolist()), dtype=bool, count=len(series)),
+                         index=series.index)
+    
+    @staticmethod
+    def _column_values(df, column, default=''):
+        """
+        Valeurs brutes d'une colonne sous forme de liste, ou valeur par défaut si la colonne est absente
+        """
+        if column in df.columns:
+            return df[column].tolist()
+        return [default] * len(df)
+    
+    def _weekday_from_start_date(self, value):
+        """
+        Jour de la semaine d'après la colonne 'Start Date & Time' (lundi par défaut)
+        """
+        import pandas as pd
+        
+        try:
+            start_date = pd.to_datetime(value)
+            if pd.isna(start_date):
+                return 0
+            return start_date.weekday()  # 0=Monday, 6=Sunday
+        except Exception:
+            return 0
+    
+    def _build_course(self, coach, course_level, course_pattern, day, course_time,
+                      zoom_link, telegram_group, schedule_type):
+        return Course(coach, course_level, course_pattern, self.get_day_name(day), course_time,
+                      zoom_link, telegram_group, schedule_type)
+    
+    def process_dynamic_schedule(self, df, schedule_type, sheet_name='Dynamic Schedule', origins=None):
+        """
+        Traite les données de la feuille Dynamic Schedule
         
         Args:
             df (DataFrame): Le DataFrame contenant les données
             schedule_type (str): Type de planning (dynamic/fixed)
+            sheet_name (str): Nom de la feuille (pour les mesures)
+            origins (list, optional): Reçoit la position (dans la feuille) de la ligne de chaque cours
             
         Returns:
             list: Liste des cours traités
         """
+        import pandas as pd
+        
+        if 'Coach' not in df.columns or 'Topic ' not in df.columns:
+            self.metrics.rows_skipped(sheet_name, 'missing_columns', len(df))
+            return []
+        
+        # Ignorer les lignes sans coach ou sans titre de cours
+        valid = self._non_blank_text_mask(df['Coach']) & self._non_blank_text_mask(df['Topic '])
+        self.metrics.rows_skipped(sheet_name, 'missing_coach_or_topic', len(df) - int(valid.sum()))
+        positions = valid.to_numpy().nonzero()[0].tolist()
+        df = df[valid]
+        
+        # Identifier le pattern, le niveau et l'heure pour toute la colonne
+        patterns, levels, times = self.extract_title_fields(df['Topic '])
+        
+        rows = pd.DataFrame({
+            'coach': df['Coach'].tolist(),
+            'pattern': patterns,
+            'level': levels,
+            'time': times,
+            'time_france': self._column_values(df, 'TIME (France)'),
+            'zoom_link': self._column_values(df, 'Zoom Link'),
+            'start_date': self._column_values(df, 'Start Date & Time', default=None),
+            'position': positions,
+        }, dtype=object)
+        
+        # Seules les lignes avec un pattern ou un niveau sont des cours
+        is_course = rows['pattern'].notna() | rows['level'].notna()
+        self.metrics.rows_skipped(sheet_name, 'no_pattern_or_level', len(rows) - int(is_course.sum()))
+        rows = rows[is_course]
+        if rows.empty:
+            return []
+        
+        # Jours d'après le pattern, sinon d'après la date de début (lundi par défaut);
+        # chaque date distincte n'est analysée qu'une fois
+        has_start_date = 'Start Date & Time' in df.columns
+        start_weekdays = {}
+        days = []
+        for pattern, start_date in zip(rows['pattern'].tolist(), rows['start_date'].tolist()):
+            if pattern:
+                days.append(self.extract_days_from_pattern(pattern))
+            elif has_start_date:
+                key = (type(start_date), start_date)
+                if key not in start_weekdays:
+                    start_weekdays[key] = self._weekday_from_start_date(start_date)
+                days.append([start_weekdays[key]])
+            else:
+                days.append([0])
+        rows['day'] = days
+        rows = rows.explode('day', ignore_index=True)
+        
         courses = []
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for coach, course_pattern, course_level, course_time, time_france, zoom_link, day, position in zip(
+                rows['coach'].tolist(), rows['pattern'].tolist(), rows['level'].tolist(),
+                rows['time'].tolist(), rows['time_france'].tolist(), rows['zoom_link'].tolist(),
+                rows['day'].tolist(), rows['position'].tolist()):
+            course = self._build_course(
+                coach, course_level or "ABG", course_pattern or "MW", day,
+                course_time or time_france, zoom_link, '', schedule_type
+            )
+            courses.append(course)
+            if origins is not None:
+                origins.append(position)
+            if debug:
+                logger.debug(f"Cours extrait (Dynamic): {course.name} (Jour {day})")
+        
+        return courses
+    
+    def process_fixed_schedule(self, df, schedule_type, sheet_name='Fix Schedule', origins=None):
+        """
+        Traite les données de la feuille Fix Schedule
         
+        Args:
+            df (DataFrame): Le DataFrame contenant les données
+            schedule_type (str): Type de planning (dynamic/fixed)
+            sheet_name (str): Nom de la feuille (pour les mesures)
+            origins (list, optional): Reçoit la position (dans la feuille) de la ligne de chaque cours
+            
+        Returns:
+            list: Liste des cours traités
+        """
         # Récupérer le premier nom de colonne qui est aussi le titre du cours
         course_title_col = self.dynamic_sheet_columns['course_name']
         
-        # Parcourir toutes les lignes
-        for idx, row in df.iterrows():
-            # Ignorer les lignes vides ou sans données importantes
-            if not row.get(course_title_col) or not row.get('DAY'):
+        if course_title_col not in df.columns or 'DAY' not in df.columns:
+            self.metrics.rows_skipped(sheet_name, 'missing_columns', len(df))
+            return []
+        
+        # Ignorer les lignes vides ou sans données importantes
+        valid = self._truthy_mask(df[course_title_col]) & self._truthy_mask(df['DAY'])
+        self.metrics.rows_skipped(sheet_name, 'missing_title_or_day', len(df) - int(valid.sum()))
+        positions = valid.to_numpy().nonzero()[0].tolist()
+        df = df[valid]
+        if df.empty:
+            return []
+        
+        # Extraire le pattern, le niveau et l'heure pour toute la colonne
+        patterns, levels, times = self.extract_title_fields(df[course_title_col].map(str))
+        
+        # Convertir le jour en entier (lundi si jour non reconnu)
+        days = [self.day_map.get(day_str, 0) for day_str in df['DAY'].tolist()]
+        
+        courses = []
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for coach_name, course_pattern, course_level, course_time, time_france, telegram_group, day, position in zip(
+                self._column_values(df, 'Salma Choufani'), patterns, levels, times,
+                self._column_values(df, 'TIME (France)'), self._column_values(df, 'TELEGRAM GROUP ID'),
+                days, positions):
+            # Pattern par défaut déterminé à partir du jour
+            course = self._build_course(
+                coach_name, course_level or "ABG", course_pattern or self.day_to_pattern.get(day, "MW"),
+                day, course_time or time_france, '', telegram_group, schedule_type
+            )
+            courses.append(course)
+            if origins is not None:
+                origins.append(position)
+            if debug:
+                logger.debug(f"Cours extrait (Fixed): {course.name} (Jour {day})")
+        
+        return courses
+    
+    def process_dynamic_rows(self, table, schedule_type, sheet_name='Dynamic Schedule', origins=None):
+        """
+        Équivalent de process_dynamic_schedule pour une feuille en lignes (moteur openpyxl)
+        
+        Args:
+            table (SheetTable): La feuille
+            schedule_type (str): Type de planning (dynamic/fixed)
+            sheet_name (str): Nom de la feuille (pour les mesures)
+            origins (list, optional): Reçoit la position (dans la feuille) de la ligne de chaque cours
+            
+        Returns:
+            list: Liste des cours traités
+        """
+        if 'Coach' not in table.columns or 'Topic ' not in table.columns:
+            self.metrics.rows_skipped(sheet_name, 'missing_columns', len(table))
+            return []
+        
+        # Ignorer les lignes sans coach ou sans titre de cours
+        rows = [row for row in zip(table.column('Coach'), table.column('Topic '), table.column('TIME (France)'),
+                                   table.column('Zoom Link'), table.column('Start Date & Time', default=None),
+                                   range(len(table)))
+                if isinstance(row[0], str) and row[0].strip() and isinstance(row[1], str) and row[1].strip()]
+        self.metrics.rows_skipped(sheet_name, 'missing_coach_or_topic', len(table) - len(rows))
+        
+        patterns, levels, times = self.extract_title_fields([row[1] for row in rows])
+        
+        has_start_date = 'Start Date & Time' in table.columns
+        start_weekdays = {}
+        courses = []
+        skipped = 0
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for (coach, _, time_france, zoom_link, start_date, position), course_pattern, course_level, course_time in zip(
+                rows, patterns, levels, times):
+            # Seules les lignes avec un pattern ou un niveau sont des cours
+            if course_pattern is None and course_level is None:
+                skipped += 1
                 continue
             
-            # Extraire les informations
-            coach_name = row.get('Salma Choufani', '')
-            day_str = row.get('DAY', '')
-            time_france = row.get('TIME (France)', '')
-            telegram_group = row.get('TELEGRAM GROUP ID', '')
-            
-            # Extraire le pattern et le niveau à partir du titre du cours
-            course_title = str(row.get(course_title_col, ''))
-            course_pattern = self.extract_course_pattern(course_title)
-            course_level = self.extract_course_level(course_title)
-            course_time = self.extract_time(course_title) or time_france
-            
-            # Convertir le jour en entier
-            day_map = {
-                'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
-                'Friday': 4, 'Saturday': 5, 'Sunday': 6,
-                'Lundi': 0, 'Mardi': 1, 'Mercredi': 2, 'Jeudi': 3,
-                'Vendredi': 4, 'Samedi': 5, 'Dimanche': 6
-            }
-            
-            day = day_map.get(day_str, 0)  # Fallback à lundi si jour non reconnu
-            
-            # Pattern et niveau par défaut si non trouvés
-            if not course_pattern:
-                # Déterminer le pattern à partir du jour
-                if day in [0, 2]:  # Lundi ou Mercredi
-                    course_pattern = "MW"
-                elif day in [1, 3]:  # Mardi ou Jeudi
-                    course_pattern = "TT"
-                elif day in [4, 5]:  # Vendredi ou Samedi
-                    course_pattern = "FS"
-                elif day == 6:  # Dimanche
-                    course_pattern = "SS"
-                else:
-                    course_pattern = "MW"  # Fallback
-            
-            if not course_level:
-                course_level = "ABG"  # Niveau par défaut
-            
-            # Créer le cours
-            course = {
-                'name': f"{coach_name} - {course_level} - {course_pattern} - {course_time}",
-                'instructor': "Kodjo",
-                'professorName': coach_name,
-                'level': course_level,
-                'schedule': course_pattern,
-                'dayOfWeek': self.get_day_name(day),
-                'time': course_time,
-                'zoomLink': '',
-                'telegramGroup': telegram_group,
-                'schedule_type': schedule_type,
-                'description': f"Cours de {course_level} avec {coach_name}, {course_pattern} à {course_time}"
-            }
+            # Jours d'après le pattern, sinon d'après la date de début (lundi par défaut)
+            if course_pattern:
+                days = self.extract_days_from_pattern(course_pattern)
+            elif has_start_date:
+                key = (type(start_date), start_date)
+                if key not in start_weekdays:
+                    start_weekdays[key] = parse_weekday(start_date) or 0
+                days = [start_weekdays[key]]
+            else:
+                days = [0]
             
+            for day in days:
+                course = self._build_course(
+                    coach, course_level or "ABG", course_pattern or "MW", day,
+                    course_time or time_france, zoom_link, '', schedule_type
+                )
+                courses.append(course)
+                if origins is not None:
+                    origins.append(position)
+                if debug:
+                    logger.debug(f"Cours extrait (Dynamic): {course.name} (Jour {day})")
+        
+        self.metrics.rows_skipped(sheet_name, 'no_pattern_or_level', skipped)
+        return courses
+    
+    def process_fixed_rows(self, table, schedule_type, sheet_name='Fix Schedule', origins=None):
+        """
+        Équivalent de process_fixed_schedule pour une feuille en lignes (moteur openpyxl)
+        
+        Args:
+            table (SheetTable): La feuille
+            schedule_type (str): Type de planning (dynamic/fixed)
+            sheet_name (str): Nom de la feuille (pour les mesures)
+            origins (list, optional): Reçoit la position (dans la feuille) de la ligne de chaque cours
+            
+        Returns:
+            list: Liste des cours traités
+        """
+        course_title_col = self.dynamic_sheet_columns['course_name']
+        
+        if course_title_col not in table.columns or 'DAY' not in table.columns:
+            self.metrics.rows_skipped(sheet_name, 'missing_columns', len(table))
+            return []
+        
+        # Ignorer les lignes vides ou sans données importantes
+        rows = [row for row in zip(table.column(course_title_col), table.column('DAY'),
+                                   table.column('Salma Choufani'), table.column('TIME (France)'),
+                                   table.column('TELEGRAM GROUP ID'), range(len(table)))
+                if row[0] and row[1]]
+        self.metrics.rows_skipped(sheet_name, 'missing_title_or_day', len(table) - len(rows))
+        
+        patterns, levels, times = self.extract_title_fields([str(row[0]) for row in rows])
+        
+        courses = []
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for row, course_pattern, course_level, course_time in zip(rows, patterns, levels, times):
+            _, day_str, coach_name, time_france, telegram_group, position = row
+            # Jour en entier (lundi si non reconnu), pattern par défaut d'après le jour
+            day = self.day_map.get(day_str, 0)
+            course = self._build_course(
+                coach_name, course_level or "ABG", course_pattern or self.day_to_pattern.get(day, "MW"),
+                day, course_time or time_france, '', telegram_group, schedule_type
+            )
             courses.append(course)
-            logger.info(f"Cours extrait (Fixed): {course['name']} (Jour {day})")
+            if origins is not None:
+                origins.append(position)
+            if debug:
+                logger.debug(f"Cours extrait (Fixed): {course.name} (Jour {day})")
+        
+        return courses
+    
+    def _grid_course_cells(self, df, rows):
+        """
+        Cellules texte des lignes données qui contiennent un pattern de cours
+        
+        Avec pandas, les colonnes texte des lignes retenues sont mises à plat
+        (ligne par ligne) et filtrées en une seule passe vectorisée: le coût
+        suit le nombre de cellules remplies plutôt que la surface de la grille.
+        
+        Args:
+            df (DataFrame | SheetTable): La feuille nettoyée
+            rows (list): Positions des lignes à examiner
+            
+        Returns:
+            list: Couples (position de la ligne, texte de la cellule), dans l'ordre lignes puis colonnes
+        """
+        if not rows:
+            return []
+        search = self.title_tokenizer.pattern_regex.search
+        
+        if isinstance(df, SheetTable):
+            grid = [df.column(column) for column in df.columns]
+            return [(row, values[row]) for row in rows for values in grid
+                    if isinstance(values[row], str) and search(values[row])]
+        
+        import pandas as pd
+        
+        # Seules les colonnes de type object peuvent contenir du texte
+        text_columns = [column for column in df.columns if df[column].dtype == object]
+        if not text_columns:
+            return []
+        cells = pd.Series(df[text_columns].to_numpy(dtype=object)[rows].ravel())
+        try:
+            matches = cells.str.contains(self.title_tokenizer.pattern_regex, na=False)
+        except AttributeError:
+            # Aucune cellule texte
+            return []
+        
+        values = cells.to_numpy()
+        width = len(text_columns)
+        return [(rows[position // width], values[position]) for position in matches.to_numpy().nonzero()[0]]
+    
+    def process_grid_schedule(self, df, schedule_type, sheet_name='Schedule', origins=None):
+        """
+        Traite une grille coach x créneaux (disposition de scripts/excel_processor.py)
+        
+        Chaque ligne de coach porte ses cours dans des cellules libres
+        ("ABG MW 7:30pm"); une cellule avec un pattern, un niveau et une
+        heure donne un cours par jour du pattern.
+        
+        Args:
+            df (DataFrame | SheetTable): La feuille nettoyée
+            schedule_type (str): Type de planning (dynamic/fixed)
+            sheet_name (str): Nom de la feuille (pour les mesures)
+            origins (list, optional): Reçoit la position (dans la feuille) de la ligne de chaque cours
+            
+        Returns:
+            list: Liste des cours traités
+        """
+        coach_column = self.grid_sheet_columns['coach_name']
+        group_column = self.grid_sheet_columns['telegram_group']
+        if coach_column not in df.columns:
+            self.metrics.rows_skipped(sheet_name, 'missing_columns', len(df))
+            return []
         
+        if isinstance(df, SheetTable):
+            coaches, groups = df.column(coach_column), df.column(group_column)
+        else:
+            coaches, groups = self._column_values(df, coach_column), self._column_values(df, group_column)
+        
+        # Ignorer les lignes sans coach
+        coach_rows = [idx for idx, coach in enumerate(coaches) if isinstance(coach, str) and coach.strip()]
+        self.metrics.rows_skipped(sheet_name, 'missing_coach', len(df) - len(coach_rows))
+        
+        cells = self._grid_course_cells(df, coach_rows)
+        patterns, levels, times = self.extract_title_fields([text for _, text in cells])
+        
+        courses = []
+        incomplete = 0
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for (row, _), course_pattern, course_level, course_time in zip(cells, patterns, levels, times):
+            # Le pattern, le niveau et l'heure sont tous nécessaires
+            if not (course_pattern and course_level and course_time):
+                incomplete += 1
+                continue
+            for day in self.extract_days_from_pattern(course_pattern):
+                course = self._build_course(
+                    coaches[row], course_level, course_pattern, day, course_time, '', groups[row], schedule_type
+                )
+                courses.append(course)
+                if origins is not None:
+                    origins.append(row)
+                if debug:
+                    logger.debug(f"Cours extrait (Grid): {course.name} (Jour {day})")
+        
+        if incomplete:
+            self.metrics.count('grid_cells_incomplete', incomplete)
         return courses
     
     def save_to_json(self, courses, output_path=None):
@@ -403,37 +1125,403 @@ class ExcelProcessor:
         Returns:
             str: Chemin du fichier JSON créé
         """
+        with self.metrics.stage('serialize'):
+            return write_courses_json(courses, output_path)
+    
+    def save_to_snapshot(self, courses, output_path=None):
+        """
+        Sauvegarde les cours dans un instantané binaire en colonnes (voir excel_snapshot)
+        
+        Args:
+            courses (list): Liste des cours à sauvegarder
+            output_path (str, optional): Chemin de sortie (.ksnap)
+            
+        Returns:
+            str: Chemin du fichier créé
+        """
         if not output_path:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_path = f"temp_courses_{timestamp}.json"
+            output_path = f"temp_courses_{timestamp}{SNAPSHOT_SUFFIX}"
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(courses, f, indent=2, ensure_ascii=False)
+        with self.metrics.stage('serialize'):
+            size = write_snapshot(courses, output_path)
         
-        logger.info(f"Données sauvegardées dans {output_path}")
+        logger.info(f"Instantané de {len(courses)} cours sauvegardé dans {output_path} ({size} octets)")
         return output_path
     
+    def save_messages_json(self, output_path):
+        """
+        Sauvegarde la file des messages programmés au format JSON
+        
+        Args:
+            output_path (str): Chemin du fichier JSON
+            
+        Returns:
+            str: Chemin du fichier JSON créé
+        """
+        with self.metrics.stage('serialize'):
+            return write_messages_json(self.messages, output_path)
+    
+    def build_occurrence_index(self, courses):
+        """
+        Index hebdomadaire des séances (minute de la semaine, heure française)
+        
+        Args:
+            courses (list): Liste des cours, la position de chaque séance est le rang du cours
+            
+        Returns:
+            OccurrenceIndex: L'index trié
+        """
+        with self.metrics.stage('index'):
+            index = OccurrenceIndex.from_courses(courses, FRANCE_TIMEZONE)
+            index.sort()
+        self._record_index(index)
+        return index
+    
+    def _record_index(self, index):
+        self.metrics.count('occurrences', len(index))
+        if index.unscheduled:
+            self.metrics.count('courses_unscheduled', index.unscheduled)
+            logger.warning(f"{index.unscheduled} cours sans jour ou heure reconnus, absents de l'index des séances")
+    
+    def save_occurrence_index(self, courses, output_path):
+        """
+        Sauvegarde l'index des séances au format JSON
+        
+        Args:
+            courses (list): Liste des cours sauvegardés (dans le même ordre)
+            output_path (str): Chemin du fichier JSON
+            
+        Returns:
+            str: Chemin du fichier JSON créé
+        """
+        index = self.build_occurrence_index(courses)
+        with self.metrics.stage('serialize'), open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(index.to_dict(), f, separators=(',', ':'))
+        
+        logger.info(f"Index de {len(index)} séances sauvegardé dans {output_path}")
+        return output_path
+    
+    def detect_conflicts(self, courses, duration=DEFAULT_DURATION):
+        """
+        Conflits d'horaires: coach sur deux séances qui se chevauchent, lien Zoom partagé
+        
+        Args:
+            courses (list): Liste des cours, chaque conflit renvoie au rang des cours concernés
+            duration (int): Durée d'une séance en minutes
+            
+        Returns:
+            dict: Rapport (voir ConflictDetector.to_dict), None en cas d'erreur (le rapport est facultatif)
+        """
+        try:
+            with self.metrics.stage('conflicts'):
+                report = ConflictDetector.from_courses(courses, duration).to_dict()
+        except Exception as e:
+            logger.error(f"Erreur lors de la détection des conflits d'horaires: {str(e)}")
+            return None
+        self._record_conflicts(report)
+        return report
+    
+    def _record_conflicts(self, report):
+        summary = report['summary']
+        for kind, count in summary.items():
+            if count:
+                self.metrics.count(f'conflicts_{kind}', count)
+        if report['conflicts']:
+            logger.warning(f"Conflits d'horaires: {summary['coach']} double(s) réservation(s) de coach, "
+                           f"{summary['zoom']} lien(s) Zoom partagé(s)")
+        for conflict in report['conflicts']:
+            names = ' / '.join(course['name'] for course in conflict['courses'])
+            logger.debug(f"Conflit {conflict['kind']} ({conflict['key']}) "
+                         f"{conflict['start']}-{conflict['end']}: {names}")
+    
+    def save_conflicts(self, report, output_path):
+        """
+        Sauvegarde le rapport des conflits d'horaires au format JSON
+        
+        Args:
+            report (dict): Rapport (detect_conflicts)
+            output_path (str): Chemin du fichier JSON
+            
+        Returns:
+            str: Chemin du fichier JSON créé
+        """
+        with self.metrics.stage('serialize'), open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=json_default)
+        
+        logger.info(f"Rapport de {len(report['conflicts'])} conflits sauvegardé dans {output_path}")
+        return output_path
+    
+    def save_to_ndjson(self, courses, destination=None, fd=None, conflict_duration=DEFAULT_DURATION):
+        """
+        Écrit les cours en NDJSON compact, au fur et à mesure qu'ils sont produits
+        
+        Les messages programmés suivent les cours, triés par date d'envoi, puis
+        l'index des séances et le rapport des conflits d'horaires construits au
+        passage (omis si la détection des conflits échoue); le flux se termine par un
+        enregistrement {"type": "metrics", ...} contenant les mesures de l'import.
+        
+        Args:
+            courses (iterable): Cours à écrire (liste ou générateur, voir iter_courses)
+            destination (str, optional): Chemin du fichier, '-' ou None pour stdout
+            fd (int, optional): Descripteur de fichier de sortie (prioritaire)
+            conflict_duration (int): Durée d'une séance en minutes, pour les conflits
+            
+        Returns:
+            int: Nombre de cours écrits
+        """
+        writer = NDJSONWriter.open(destination, fd=fd)
+        index = OccurrenceIndex(FRANCE_TIMEZONE)
+        detector = ConflictDetector(conflict_duration)
+        
+        def indexed(courses):
+            nonlocal detector
+            for position, course in enumerate(courses):
+                index.add(position, course)
+                if detector is not None:
+                    try:
+                        detector.add(position, course)
+                    except Exception as e:
+                        logger.error(f"Erreur lors de la détection des conflits d'horaires: {str(e)}")
+                        detector = None
+                yield course
+        
+        try:
+            # Les cours sont produits pendant l'écriture: le temps de sérialisation
+            # est le temps total moins celui des étapes mesurées entre-temps
+            measured = sum(self.metrics.stages.values())
+            start = time.perf_counter()
+            count = writer.write_courses(indexed(courses))
+            message_count = writer.write_messages(self.message_queue())
+            writer.write(occurrence_index_record(index))
+            report = None
+            if detector is not None:
+                try:
+                    with self.metrics.stage('conflicts'):
+                        report = detector.to_dict()
+                except Exception as e:
+                    logger.error(f"Erreur lors de la détection des conflits d'horaires: {str(e)}")
+            if report is not None:
+                writer.write(conflicts_record(report))
+            elapsed = time.perf_counter() - start
+            self.metrics.add_time('serialize', elapsed - (sum(self.metrics.stages.values()) - measured))
+            self._record_index(index)
+            if report is not None:
+                self._record_conflicts(report)
+            writer.write(metrics_record(self.metrics.to_dict()))
+        finally:
+            writer.close()
+        logger.info(f"{count} cours et {message_count} messages écrits en NDJSON ({writer.bytes_written} octets)")
+        return count
+    
+    def save_to_sqlite(self, courses, db_path=None):
+        """
+        Écrit les cours directement dans la base SQLite (une seule transaction)
+        
+        Args:
+            courses (list): Liste des cours à écrire
+            db_path (str, optional): Chemin de la base (data/edutrack.db par défaut)
+            
+        Returns:
+            dict: Résumé {'created': n, 'updated': n, 'unchanged': n}
+        """
+        with self.metrics.stage('write_db'):
+            summary = write_courses(courses, db_path)
+        logger.info(f"Données écrites dans {db_path or DEFAULT_DB_PATH}")
+        return summary
+    
+    def load_from_cache(self):
+        """
+        Charge les cours (et les messages programmés) depuis le cache si l'empreinte du fichier correspond
+        
+        Returns:
+            list: Liste des cours en cache ou None
+        """
+        if self.cache is None:
+            return None
+        try:
+            with self.metrics.stage('cache'):
+                cached = self.cache.get_entry(self.excel_path)
+                if cached is None:
+                    self.metrics.count('cache_misses')
+                    # Fichier modifié: reprendre les cours des lignes inchangées (les workers
+                    # d'un pool de processus n'ont pas accès au cache par ligne)
+                    if self.sheet_executor != 'process':
+                        self.row_cache = RowCache.from_dict(self.cache.get_rows(self.excel_path))
+                    return None
+                self.metrics.count('cache_hits')
+                self.messages = [ScheduledMessage.from_dict(message) for message in cached['messages']]
+                return [Course.from_dict(course) for course in cached['courses']]
+        except Exception as e:
+            logger.warning(f"Lecture du cache impossible: {str(e)}")
+            return None
+    
+    def store_in_cache(self, courses):
+        """
+        Enregistre les cours extraits dans le cache (sans effet en cas d'erreur)
+        
+        Args:
+            courses (list): Liste des cours extraits
+        """
+        if self.cache is None or not courses:
+            return
+        try:
+            with self.metrics.stage('cache'):
+                self.cache.put(self.excel_path, courses, self.messages)
+                if self.row_cache is not None:
+                    self.cache.put_rows(self.excel_path, self.row_cache.to_dict())
+        except Exception as e:
+            logger.warning(f"Écriture du cache impossible: {str(e)}")
+    
+    def process_incremental(self, snapshot_path=None, db_path=None):
+        """
+        Traite le fichier et ne renvoie que les cours créés, modifiés ou supprimés
+        
+        La référence est soit un instantané JSON d'un import précédent, soit les
+        cours présents dans la base SQLite.
+        
+        Args:
+            snapshot_path (str, optional): Instantané JSON de l'import précédent
+            db_path (str, optional): Base SQLite à comparer (si pas d'instantané)
+            
+        Returns:
+            list: Liste des changements ou None en cas d'erreur
+        """
+        courses = self.process_with_error_handling()
+        if courses is None:
+            return None
+        
+        try:
+            if snapshot_path:
+                previous = load_snapshot(snapshot_path)
+            else:
+                previous = load_courses_from_db(db_path)
+        except Exception as e:
+            logger.error(f"Impossible de charger les cours de référence: {str(e)}")
+            return None
+        
+        with self.metrics.stage('diff'):
+            changes = diff_courses(previous, courses)
+        logger.info(f"Différentiel: {summarize(changes)}")
+        return changes
+    
+    def log_run_summary(self, count, from_cache=False):
+        """
+        Journalise le résumé de l'import (avec les mesures en champs structurés)
+        
+        Args:
+            count (int): Nombre de cours produits
+            from_cache (bool): Résultat lu depuis le cache
+        """
+        metrics = self.metrics.to_dict()
+        if from_cache:
+            message = f"Traitement terminé: {count} cours (cache)"
+        else:
+            scanned = sum(sheet['rows_scanned'] for sheet in metrics['sheets'].values())
+            skipped = sum(sum(sheet['rows_skipped'].values()) for sheet in metrics['sheets'].values())
+            message = (f"Traitement terminé: {count} cours traités en {metrics['elapsed']:.2f}s "
+                       f"({scanned} lignes lues, {skipped} ignorées)")
+        if self.messages:
+            message += f", {len(self.messages)} messages programmés"
+        logger.info(message, extra={'event': 'run_summary', 'excel_path': self.excel_path,
+                                    'courses': count, 'messages': len(self.messages),
+                                    'from_cache': from_cache, 'metrics': metrics})
+    
+    def iter_courses(self):
+        """
+        Produit les cours feuille par feuille, dès que chaque feuille est traitée
+        
+        Le classeur est lu en flux: les cours de la première feuille peuvent être
+        consommés avant que la feuille suivante ne soit décompressée.
+        
+        Yields:
+            Course: Les cours extraits, dans l'ordre des feuilles
+            
+        Raises:
+            ValueError: Si aucune feuille valide n'est trouvée
+        """
+        cached_courses = self.load_from_cache()
+        if cached_courses is not None:
+            self.log_run_summary(len(cached_courses), from_cache=True)
+            yield from cached_courses
+            return
+        
+        errors = self.check_workbook()
+        if errors:
+            # Le détail a déjà été journalisé; le dernier message résume le problème
+            raise ValueError(errors[-1])
+        
+        courses = [] if self.cache is not None else None
+        count = 0
+        valid_sheets = 0
+        self.messages = []
+        self._record_input_size()
+        self.start_progress()
+        
+        for sheet in iter_sheets(self.excel_path):
+            df = self.load_sheet_frame(sheet)
+            if df is None:
+                continue
+            valid_sheets += 1
+            
+            sheet_courses = self.process_sheet_frame(sheet.name, df)
+            count += len(sheet_courses)
+            if courses is not None:
+                courses.extend(sheet_courses)
+            yield from sheet_courses
+        
+        if not valid_sheets:
+            raise ValueError("Aucune feuille valide trouvée dans le fichier Excel")
+        
+        self.store_in_cache(courses)
+        self.log_run_summary(count)
+    
     def process_with_error_handling(self):
         """
         Traite les données avec gestion des erreurs
         
         Returns:
             list: Liste des cours traités ou None en cas d'erreur
+            
+        Raises:
+            ImportCancelled: Si le rappel d'avancement a interrompu l'import
         """
         try:
-            # Charger les données
-            data_frames = self.load_excel_data()
-            if not data_frames:
+            # Réutiliser le résultat si le fichier n'a pas changé
+            cached_courses = self.load_from_cache()
+            if cached_courses is not None:
+                self.log_run_summary(len(cached_courses), from_cache=True)
+                return cached_courses
+            
+            # Vérifier les en-têtes avant d'analyser le classeur
+            if self.check_workbook():
                 return None
             
-            # Traiter les données
-            courses = self.process_course_data(data_frames)
+            self.messages = []
+            self.start_progress()
+            if self.sheet_executor:
+                # Charger et traiter chaque feuille dans son propre worker
+                courses = self.process_sheets_in_parallel(self.sheet_executor)
+                if courses is None:
+                    return None
+            else:
+                # Charger les données
+                data_frames = self.load_excel_data()
+                if not data_frames:
+                    return None
+                
+                # Traiter les données
+                courses = self.process_course_data(data_frames)
+            
+            self.store_in_cache(courses)
             
-            # Log des résultats
-            logger.info(f"Traitement terminé: {len(courses)} cours traités")
+            # Un seul message de résumé par import (le détail par cours est au niveau DEBUG)
+            self.log_run_summary(len(courses))
             
             return courses
             
+        except ImportCancelled:
+            raise
         except Exception as e:
             logger.error(f"Erreur lors du traitement: {str(e)}")
             import traceback
@@ -441,25 +1529,382 @@ class ExcelProcessor:
             return None
 
 
-if __name__ == "__main__":
-    import sys
+def _process_sheet_in_worker(excel_path, sheet_name, engine='pandas'):
+    """
+    Traite une feuille dans un processus séparé (seul le chemin est transmis)
     
-    if len(sys.argv) < 2:
-        print("Usage: python excel_processor.py <path_to_excel_file>")
-        sys.exit(1)
+    Returns:
+        tuple: (cours de la feuille ou None, messages programmés, mesures du worker)
+    """
+    processor = ExcelProcessor(excel_path, engine=engine)
+    return processor.process_sheet(sheet_name), processor.messages, processor.metrics.to_dict()
+
+
+def open_cache(cache_options):
+    """
+    Ouvre le cache des résultats, ou renvoie None s'il est désactivé ou inutilisable
     
-    excel_path = sys.argv[1]
+    Args:
+        cache_options (dict): Arguments de CourseCache, None pour désactiver le cache
+        
+    Returns:
+        CourseCache: Le cache ou None
+    """
+    if cache_options is None:
+        return None
+    try:
+        return CourseCache(**cache_options)
+    except OSError as e:
+        logger.warning(f"Cache désactivé: {str(e)}")
+        return None
+
+
+def write_courses_json(courses, output_path=None):
+    """
+    Écrit des cours au format JSON (sortie d'un import ou d'un lot)
+    
+    Args:
+        courses (list): Liste des cours à sauvegarder
+        output_path (str, optional): Chemin du fichier (temp_courses_<horodatage>.json par défaut)
+        
+    Returns:
+        str: Chemin du fichier JSON créé
+    """
+    if not output_path:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_path = f"temp_courses_{timestamp}.json"
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(courses, f, indent=2, ensure_ascii=False, default=json_default)
     
+    logger.info(f"Données sauvegardées dans {output_path}")
+    return output_path
+
+
+def write_messages_json(messages, output_path):
+    """
+    Écrit la file des messages programmés au format JSON
+    
+    Args:
+        messages (list): ScheduledMessage, dans n'importe quel ordre
+        output_path (str): Chemin du fichier JSON
+        
+    Returns:
+        str: Chemin du fichier JSON créé
+    """
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(MessageQueue(messages).to_dict(), f, indent=2, ensure_ascii=False)
+    
+    logger.info(f"{len(messages)} messages programmés sauvegardés dans {output_path}")
+    return output_path
+
+
+def run_batch(target, workers=None, cache_options=None, engine='pandas', sheet_executor=None,
+              messages_output=None):
+    """
+    Traite un lot de classeurs et affiche chaque résultat dès qu'il est prêt
+    
+    Args:
+        target (str): Répertoire ou motif glob
+        workers (int, optional): Nombre de processus
+        cache_options (dict, optional): Arguments de CourseCache, None pour désactiver le cache
+        engine (str): Moteur de l'ExcelProcessor ('pandas' ou 'openpyxl')
+        sheet_executor (str, optional): 'thread' ou 'process' pour traiter les feuilles en parallèle
+        messages_output (str, optional): Fichier JSON de la file des messages programmés fusionnés
+        
+    Returns:
+        int: Code de sortie
+    """
+    paths = collect_workbooks(target)
+    if not paths:
+        print(f"Error: No Excel file found for {target}")
+        return 1
+    
+    def report(path, courses, messages):
+        result = {'path': path, 'ok': courses is not None, 'count': len(courses or []), 'messages': len(messages)}
+        print(f"FILE_RESULT={json.dumps(result, ensure_ascii=False)}", flush=True)
+    
+    courses, messages, failed = process_batch(paths, workers=workers, cache_options=cache_options, on_result=report,
+                                              engine=engine, sheet_executor=sheet_executor)
+    
+    if not courses:
+        print("Error: Processing failed")
+        return 1
+    
+    print(f"OUTPUT_PATH={write_courses_json(courses)}")
+    print(f"MESSAGE_COUNT={len(messages)}")
+    if messages_output:
+        print(f"MESSAGES_PATH={write_messages_json(messages, messages_output)}")
+    return 1 if failed else 0
+
+
+def run_watch(directory, args, cache_options=None):
+    """
+    Réimporte chaque classeur créé ou modifié dans un répertoire, jusqu'à Ctrl+C
+    
+    Chaque import passe par run_single: la sortie est celle des options de la
+    ligne de commande (JSON, NDJSON sur stdout, --write-db, --diff-db...),
+    précédée d'une ligne WATCH_EVENT= et suivie de la ligne METRICS=.
+    
+    Args:
+        directory (str): Répertoire de dépôt
+        args (Namespace): Arguments de la ligne de commande
+        cache_options (dict, optional): Arguments de CourseCache, None pour désactiver le cache
+        
+    Returns:
+        int: Code de sortie
+    """
+    from excel_watch import WorkbookWatcher
+    
+    try:
+        watcher = WorkbookWatcher(directory, debounce=args.debounce, poll_interval=args.poll_interval)
+    except OSError as e:
+        print(f"Error: {str(e)}")
+        return 1
+    
+    def on_change(path):
+        print(f"WATCH_EVENT={json.dumps({'path': path, 'mode': watcher.mode}, ensure_ascii=False)}", flush=True)
+        processor = ExcelProcessor(path, cache=open_cache(cache_options), sheet_executor=args.parallel_sheets,
+                                   engine=args.engine)
+        try:
+            run_single(processor, args)
+            report_metrics(processor, args)
+        except Exception as e:
+            # Un classeur en erreur n'arrête pas la surveillance
+            logger.error(f"Erreur lors de l'import de {path}: {str(e)}")
+            print("Error: Processing failed")
+        sys.stdout.flush()
+    
+    with watcher:
+        try:
+            watcher.run(on_change)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def main(argv=None):
+    """
+    Point d'entrée en ligne de commande
+
+    Args:
+        argv (list, optional): Arguments (sys.argv[1:] par défaut)
+
+    Returns:
+        int: Code de sortie
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Extraction des cours depuis un fichier Excel")
+    parser.add_argument('excel_path', nargs='?', help="Chemin vers le fichier Excel à traiter")
+    parser.add_argument('output_path', nargs='?', help="Chemin du fichier de sortie (optionnel)")
+    parser.add_argument('--format', dest='output_format', choices=['json', 'ndjson', 'snapshot'], default='json',
+                        help="json: fichier JSON indenté (défaut); ndjson: un cours par ligne, écrit en flux; "
+                             "snapshot: instantané binaire en colonnes (.ksnap)")
+    parser.add_argument('--output', default=None,
+                        help="Fichier de sortie; '-' pour stdout (ndjson uniquement)")
+    parser.add_argument('--output-fd', type=int, default=None,
+                        help="Descripteur de fichier sur lequel écrire le NDJSON")
+    parser.add_argument('--serve', action='store_true',
+                        help="Mode worker résident: jobs JSON (un par ligne) sur stdin ou --socket")
+    parser.add_argument('--socket', dest='socket_path',
+                        help="Socket Unix sur laquelle écouter en mode --serve")
+    parser.add_argument('--batch', metavar='DIR_OR_GLOB',
+                        help="Traiter en parallèle tous les classeurs d'un répertoire ou d'un motif glob")
+    parser.add_argument('--watch', metavar='DIR', nargs='?', const='attached_assets',
+                        help="Surveiller un répertoire de dépôt (défaut: attached_assets) et réimporter chaque "
+                             "classeur créé ou modifié vers la sortie configurée")
+    parser.add_argument('--debounce', type=float, default=1.0,
+                        help="Secondes sans écriture avant de réimporter un classeur avec --watch (défaut: 1)")
+    parser.add_argument('--poll-interval', type=float, default=None,
+                        help="Surveiller par relecture du répertoire à cet intervalle au lieu d'inotify")
+    parser.add_argument('--job-timeout', type=float, default=None,
+                        help="Durée maximale d'un job en secondes avec --serve (le job peut fixer son propre \"timeout\")")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Nombre de processus worker (défaut: 1 avec --serve, nombre de cœurs avec --batch)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Ignorer le cache et retraiter le fichier")
+    parser.add_argument('--cache-dir', default=None,
+                        help="Répertoire du cache (défaut: data/cache/excel)")
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help="Taille maximale du cache en Mo (défaut: 50)")
+    diff_group = parser.add_mutually_exclusive_group()
+    diff_group.add_argument('--diff-from', metavar='SNAPSHOT',
+                            help="N'émettre que les changements par rapport à cet instantané JSON")
+    diff_group.add_argument('--diff-db', metavar='DB', nargs='?', const=DEFAULT_DB_PATH,
+                            help="N'émettre que les changements par rapport à la base SQLite (défaut: data/edutrack.db)")
+    parser.add_argument('--write-db', metavar='DB', nargs='?', const=DEFAULT_DB_PATH,
+                        help="Écrire les cours directement dans la base SQLite au lieu d'un fichier JSON")
+    parser.add_argument('--parallel-sheets', choices=['thread', 'process'], default=None,
+                        help="Traiter les feuilles du classeur en parallèle avec des threads ou des processus")
+    parser.add_argument('--messages-output', metavar='PATH', default=None,
+                        help="Écrire aussi la file des messages Telegram programmés (triée par date d'envoi) en JSON")
+    parser.add_argument('--index-output', metavar='PATH', default=None,
+                        help="Écrire aussi l'index hebdomadaire des séances (minute de la semaine, heure française) en JSON")
+    parser.add_argument('--conflicts-output', metavar='PATH', default=None,
+                        help="Écrire aussi le rapport des conflits d'horaires (coach, lien Zoom) en JSON")
+    parser.add_argument('--course-duration', type=int, default=DEFAULT_DURATION,
+                        help="Durée d'une séance en minutes pour la détection des conflits (défaut: 60)")
+    parser.add_argument('--validate-only', action='store_true',
+                        help="Vérifier uniquement les en-têtes des feuilles (VALIDATION=...) sans traiter le fichier")
+    parser.add_argument('--engine', choices=ENGINES, default='pandas',
+                        help="pandas: DataFrames vectorisés (défaut); openpyxl: lignes Python, sans importer pandas")
+    parser.add_argument('--log-level', choices=LOG_LEVELS, type=str.upper, default=DEFAULT_LEVEL,
+                        help="Niveau des logs sur stderr; DEBUG détaille chaque cours (défaut: INFO)")
+    parser.add_argument('--log-format', choices=LOG_FORMATS, default=DEFAULT_FORMAT,
+                        help="text: lignes lisibles (défaut); json: un objet JSON par ligne")
+    parser.add_argument('--metrics-prometheus', metavar='PATH', default=None,
+                        help="Écrire aussi les mesures de l'import au format texte Prometheus")
+    parser.add_argument('--profile', metavar='PATH', nargs='?', const='',
+                        help="Profiler l'import (cProfile + tracemalloc) et enregistrer le profil (défaut: excel_profile_<date>.prof)")
+    args = parser.parse_args(argv)
+    if args.course_duration <= 0:
+        parser.error("--course-duration doit être un nombre de minutes positif")
+
+    configure_logging(args.log_level, args.log_format)
+
+    cache_options = None
+    if not args.no_cache:
+        cache_options = {'cache_dir': args.cache_dir, 'max_bytes': int(args.cache_max_mb * 1024 * 1024)}
+
+    if args.serve:
+        from excel_worker import serve
+        serve(workers=args.workers or 1, socket_path=args.socket_path, cache_options=cache_options,
+              timeout=args.job_timeout)
+        return 0
+
+    if args.batch:
+        return run_batch(args.batch, workers=args.workers, cache_options=cache_options, engine=args.engine,
+                         sheet_executor=args.parallel_sheets, messages_output=args.messages_output)
+
+    if args.watch:
+        return run_watch(args.watch, args, cache_options)
+
+    if not args.excel_path:
+        print("Usage: python excel_processor.py <path_to_excel_file>")
+        return 1
+
+    excel_path = args.excel_path
+
     if not os.path.exists(excel_path):
         print(f"Error: Excel file not found at {excel_path}")
-        sys.exit(1)
+        return 1
+
+    if args.validate_only:
+        report = ExcelProcessor(excel_path).preflight()
+        for error in report['errors']:
+            logger.error(error)
+        print(f"VALIDATION={json.dumps(report, ensure_ascii=False)}")
+        return 0 if report['ok'] else 1
+
+    processor = ExcelProcessor(excel_path, cache=open_cache(cache_options), sheet_executor=args.parallel_sheets,
+                               engine=args.engine)
+
+    if args.profile is None:
+        exit_code = run_single(processor, args)
+    else:
+        stats_path = args.profile or f"excel_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof"
+        with profile_run(stats_path, processor.metrics):
+            exit_code = run_single(processor, args)
+
+    report_metrics(processor, args)
+    return exit_code
+
+
+def report_metrics(processor, args):
+    """
+    Affiche les mesures de l'import (ligne METRICS=) et écrit le fichier Prometheus demandé
     
-    processor = ExcelProcessor(excel_path)
-    courses = processor.process_with_error_handling()
+    En NDJSON sur stdout, les mesures terminent déjà le flux et ne sont pas répétées.
     
+    Args:
+        processor (ExcelProcessor): Le processeur ayant traité le fichier
+        args (Namespace): Arguments de la ligne de commande
+    """
+    ndjson_to_stdout = (args.output_format == 'ndjson' and args.output_fd is None
+                        and (args.output or args.output_path) in (None, '-'))
+    if not ndjson_to_stdout:
+        print(f"METRICS={json.dumps(processor.metrics.to_dict(), ensure_ascii=False)}")
+    if args.metrics_prometheus:
+        try:
+            with open(args.metrics_prometheus, 'w', encoding='utf-8') as f:
+                f.write(processor.metrics.to_prometheus())
+        except OSError as e:
+            logger.warning(f"Écriture des mesures Prometheus impossible: {str(e)}")
+
+
+def run_single(processor, args):
+    """
+    Traite un classeur selon les options de la ligne de commande
+    
+    Args:
+        processor (ExcelProcessor): Le processeur du classeur
+        args (Namespace): Arguments de la ligne de commande
+        
+    Returns:
+        int: Code de sortie
+    """
+    if args.diff_from or args.diff_db:
+        changes = processor.process_incremental(snapshot_path=args.diff_from, db_path=args.diff_db)
+        if changes is None:
+            print("Error: Processing failed")
+            return 1
+        output_path = processor.save_to_json(changes)
+        print(f"OUTPUT_PATH={output_path}")
+        print(f"DIFF_SUMMARY={json.dumps(summarize(changes))}")
+        return 0
+
+    output_path = args.output or args.output_path
+
+    if args.output_format == 'ndjson':
+        to_stdout = args.output_fd is None and output_path in (None, '-')
+        try:
+            count = processor.save_to_ndjson(processor.iter_courses(), output_path, fd=args.output_fd,
+                                             conflict_duration=args.course_duration)
+        except Exception as e:
+            logger.error(f"Erreur lors du traitement: {str(e)}")
+            print("Error: Processing failed", file=sys.stderr if to_stdout else sys.stdout)
+            return 1
+        if to_stdout:
+            return 0
+        print(f"OUTPUT_PATH={output_path if args.output_fd is None else f'fd:{args.output_fd}'}")
+        print(f"COURSE_COUNT={count}")
+        print(f"MESSAGE_COUNT={len(processor.messages)}")
+        return 0
+
+    courses = processor.process_with_error_handling()
+
+    if courses and args.write_db:
+        try:
+            summary = processor.save_to_sqlite(courses, args.write_db)
+        except Exception as e:
+            print(f"Error: Database write failed: {str(e)}")
+            return 1
+        print(f"DB_SUMMARY={json.dumps(summary)}")
+        return 0
+
     if courses:
-        output_path = processor.save_to_json(courses)
+        if args.output_format == 'snapshot':
+            output_path = processor.save_to_snapshot(courses, output_path)
+        else:
+            output_path = processor.save_to_json(courses, output_path)
         print(f"OUTPUT_PATH={output_path}")
-    else:
-        print("Error: Processing failed")
-        sys.exit(1)
\ No newline at end of file
+        if processor.row_cache is not None and processor.row_cache.changes:
+            print(f"ROW_CHANGES={json.dumps(processor.row_cache.changes, ensure_ascii=False)}")
+        if args.messages_output:
+            print(f"MESSAGES_PATH={processor.save_messages_json(args.messages_output)}")
+        if args.index_output:
+            print(f"INDEX_PATH={processor.save_occurrence_index(courses, args.index_output)}")
+        report = processor.detect_conflicts(courses, args.course_duration)
+        if report is not None:
+            print(f"CONFLICT_SUMMARY={json.dumps(report['summary'])}")
+            if args.conflicts_output:
+                print(f"CONFLICTS_PATH={processor.save_conflicts(report, args.conflicts_output)}")
+        return 0
+
+    print("Error: Processing failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
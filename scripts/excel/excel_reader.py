@@ -0,0 +1,387 @@
+"""
+Lecture en flux des classeurs Excel via openpyxl en mode read-only.
+
+Le classeur est ouvert une seule fois et chaque feuille est parcourue
+paresseusement: les lignes sont produites une par une, déjà typées, sans
+construire de DataFrame intermédiaire ni re-décompresser le fichier .xlsx
+pour chaque feuille.
+
+openpyxl n'est importé qu'à l'ouverture du premier classeur.
+
+Pour la liste des feuilles et les lignes d'en-tête (read_headers), le
+fichier .xlsx est lu directement (zipfile + analyse XML incrémentale): à
+l'ouverture, openpyxl analyse tout le XML d'une feuille qui ne déclare pas
+ses dimensions, et charge toutes les chaînes partagées.
+"""
+import posixpath
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+# Codes d'erreur Excel (openpyxl.cell.cell.ERROR_CODES), recopiés pour ne pas importer openpyxl ici
+ERROR_CODES = ('#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A')
+
+# Valeurs texte interprétées comme manquantes (mêmes valeurs par défaut que pandas.read_excel)
+NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null',
+]) | frozenset(ERROR_CODES)
+
+
+class SheetRows:
+    """
+    Feuille en cours de lecture: nom, colonnes et itérateur paresseux des lignes
+    """
+
+    def __init__(self, name, columns, rows, header=()):
+        """
+        Args:
+            name (str): Nom de la feuille
+            columns (list): Noms des colonnes (ligne d'en-tête)
+            rows (iterator): Itérateur de tuples typés, un par ligne non vide; une
+                ligne peut être plus longue que l'en-tête (voir width)
+            header (tuple): Valeurs brutes de la ligne d'en-tête
+        """
+        self.name = name
+        self.columns = columns
+        self.rows = rows
+        self.header = header
+        # Lignes vides ignorées et largeur de la ligne la plus longue (connues une fois la feuille consommée)
+        self.empty_rows = 0
+        self.width = len(columns)
+
+    def __iter__(self):
+        return self.rows
+
+    def all_columns(self):
+        """
+        Colonnes de la feuille consommée, y compris les cellules à droite du dernier en-tête
+
+        Comme avec pandas, chaque colonne sans en-tête devient 'Unnamed: <index>'.
+
+        Returns:
+            list: Noms des colonnes (self.width noms)
+        """
+        if self.width <= len(self.columns):
+            return list(self.columns)
+        header = tuple(self.header[:len(self.columns)]) + (None,) * (self.width - len(self.columns))
+        return make_columns(header, keep_trailing=True)
+
+
+def convert_cell(value):
+    """
+    Convertit une valeur brute openpyxl comme le ferait pandas.read_excel
+
+    Args:
+        value: Valeur de la cellule
+
+    Returns:
+        La valeur typée (None pour une cellule vide, int pour un flottant entier)
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return None if value in NA_STRINGS else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def make_columns(header, keep_trailing=False):
+    """
+    Construit les noms de colonnes à partir de la ligne d'en-tête
+
+    Les cellules vides deviennent 'Unnamed: <index>' et les doublons sont
+    suffixés ('.1', '.2', ...), comme avec pandas.
+
+    Args:
+        header (tuple): Valeurs brutes de la ligne d'en-tête
+        keep_trailing (bool): Garder les cellules vides en fin de ligne (colonnes
+            dont seules les lignes de données ont des valeurs)
+
+    Returns:
+        list: Noms des colonnes
+    """
+    header = list(header)
+    while header and header[-1] is None and not keep_trailing:
+        header.pop()
+
+    columns = []
+    seen = {}
+    for idx, value in enumerate(header):
+        name = f"Unnamed: {idx}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            candidate = f"{name}.{seen[name]}"
+            while candidate in seen:
+                seen[name] += 1
+                candidate = f"{name}.{seen[name]}"
+            seen[candidate] = 0
+            name = candidate
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def pad_rows(rows, width):
+    """
+    Complète par des cellules vides les lignes plus courtes que width
+
+    Args:
+        rows (list): Tuples de valeurs
+        width (int): Nombre de colonnes
+
+    Returns:
+        list: Les lignes, toutes de longueur width
+    """
+    return [row if len(row) >= width else row + (None,) * (width - len(row)) for row in rows]
+
+
+def _iter_typed_rows(raw_rows, width, sheet):
+    for raw in raw_rows:
+        # Comme pandas, les cellules vides en fin de ligne ne comptent pas dans la largeur
+        end = len(raw)
+        while end and (raw[end - 1] is None or raw[end - 1] == ''):
+            end -= 1
+        row = tuple(convert_cell(value) for value in raw[:end])
+        if not any(value is not None for value in row):
+            sheet.empty_rows += 1
+            continue
+        if len(row) < width:
+            row = row + (None,) * (width - len(row))
+        elif len(row) > sheet.width:
+            sheet.width = len(row)
+        yield row
+
+
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PACKAGE_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def _read_relationships(archive, part):
+    """
+    Relations d'une partie du paquet: {Id: chemin de la cible dans l'archive}
+    """
+    directory, name = posixpath.split(part)
+    rels_path = posixpath.join(directory, '_rels', name + '.rels')
+    relationships = {}
+    for _, element in iterparse(archive.open(rels_path)):
+        if element.tag == _PACKAGE_REL_NS + 'Relationship':
+            target = element.get('Target')
+            if target.startswith('/'):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(directory, target))
+            relationships[element.get('Id')] = (element.get('Type', ''), target)
+    return relationships
+
+
+def _workbook_parts(archive):
+    """
+    Feuilles du classeur dans l'ordre: liste de (nom, chemin du XML), et chemin des chaînes partagées
+    """
+    office_document = 'xl/workbook.xml'
+    for rel_type, target in _read_relationships(archive, '').values():
+        if rel_type.endswith('/officeDocument'):
+            office_document = target
+
+    relationships = _read_relationships(archive, office_document)
+    shared_strings = next((target for rel_type, target in relationships.values()
+                           if rel_type.endswith('/sharedStrings')), None)
+
+    sheets = []
+    for _, element in iterparse(archive.open(office_document)):
+        if element.tag == _MAIN_NS + 'sheet':
+            _, target = relationships[element.get(_REL_NS + 'id')]
+            sheets.append((element.get('name'), target))
+    return sheets, shared_strings
+
+
+class _SharedStrings:
+    """
+    Table des chaînes partagées, lue seulement jusqu'au dernier index demandé
+    """
+
+    def __init__(self, archive, part):
+        self._values = []
+        self._events = iterparse(archive.open(part), events=('end',)) if part else iter(())
+
+    def __getitem__(self, index):
+        while len(self._values) <= index:
+            try:
+                _, element = next(self._events)
+            except StopIteration:
+                raise IndexError(index) from None
+            if element.tag == _MAIN_NS + 'si':
+                # Texte simple (<t>) ou portions mises en forme (<r><t>), sans les indications phonétiques
+                parts = [child.text or '' for child in element if child.tag == _MAIN_NS + 't']
+                parts += [run.findtext(_MAIN_NS + 't') or '' for run in element.findall(_MAIN_NS + 'r')]
+                self._values.append(''.join(parts))
+                element.clear()
+        return self._values[index]
+
+
+def _column_index(reference):
+    index = 0
+    for char in reference:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - 64
+    return index - 1
+
+
+def _cell_value(cell, shared_strings):
+    cell_type = cell.get('t', 'n')
+    if cell_type == 'inlineStr':
+        return ''.join(text.text or '' for text in cell.iter(_MAIN_NS + 't'))
+    value = cell.findtext(_MAIN_NS + 'v')
+    if value is None:
+        return None
+    if cell_type == 's':
+        return shared_strings[int(value)]
+    if cell_type == 'b':
+        return value == '1'
+    if cell_type in ('str', 'e'):
+        return value
+    # Comme openpyxl: entier sauf si le nombre est écrit avec une virgule ou un exposant
+    if any(char in value for char in '.eE'):
+        return float(value)
+    return int(value)
+
+
+def _first_row(archive, part, shared_strings):
+    """
+    Première ligne non vide d'une feuille; l'analyse s'arrête à cette ligne
+    """
+    for _, element in iterparse(archive.open(part), events=('end',)):
+        if element.tag != _MAIN_NS + 'row':
+            continue
+        values = {}
+        for position, cell in enumerate(element.iter(_MAIN_NS + 'c')):
+            reference = cell.get('r')
+            values[_column_index(reference) if reference else position] = _cell_value(cell, shared_strings)
+        element.clear()
+        if any(value is not None for value in values.values()):
+            width = max(values) + 1
+            return tuple(values.get(idx) for idx in range(width))
+    return ()
+
+
+def _read_headers_xlsx(excel_path, sheet_filter=None):
+    with zipfile.ZipFile(excel_path) as archive:
+        sheets, shared_strings_part = _workbook_parts(archive)
+        shared_strings = _SharedStrings(archive, shared_strings_part)
+        return [(name, make_columns(_first_row(archive, part, shared_strings)))
+                for name, part in sheets if not sheet_filter or sheet_filter(name)]
+
+
+def read_headers(excel_path, sheet_filter=None):
+    """
+    Lit les colonnes (ligne d'en-tête) de chaque feuille sans lire les données
+
+    Seuls workbook.xml, le début de chaque feuille et le début de la table des
+    chaînes partagées sont analysés. Si le fichier n'a pas la structure
+    attendue, la lecture passe par openpyxl (iter_sheets).
+
+    Args:
+        excel_path (str): Chemin vers le fichier Excel
+        sheet_filter (callable, optional): Prédicat sur le nom de la feuille
+
+    Returns:
+        list: Tuples (nom de la feuille, colonnes) dans l'ordre du classeur
+    """
+    try:
+        return _read_headers_xlsx(excel_path, sheet_filter)
+    except (KeyError, ValueError, IndexError, SyntaxError):
+        # SyntaxError couvre xml.etree.ElementTree.ParseError
+        return [(sheet.name, sheet.columns) for sheet in iter_sheets(excel_path, sheet_filter)]
+
+
+def list_sheet_names(excel_path):
+    """
+    Liste les feuilles d'un classeur sans en lire le contenu
+
+    Args:
+        excel_path (str): Chemin vers le fichier Excel
+
+    Returns:
+        list: Noms des feuilles dans l'ordre du classeur
+    """
+    try:
+        with zipfile.ZipFile(excel_path) as archive:
+            sheets, _ = _workbook_parts(archive)
+            return [name for name, _ in sheets]
+    except (KeyError, ValueError, SyntaxError):
+        pass
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(excel_path, read_only=True, keep_links=False)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def sheet_sizes(excel_path, sheet_filter=None):
+    """
+    Taille décompressée du XML de chaque feuille (pour estimer l'avancement d'un import)
+
+    Args:
+        excel_path (str): Chemin vers le fichier Excel
+        sheet_filter (callable, optional): Prédicat sur le nom de la feuille
+
+    Returns:
+        dict: {nom de la feuille: taille en octets}, vide si le fichier n'a pas la structure attendue
+    """
+    try:
+        with zipfile.ZipFile(excel_path) as archive:
+            sheets, _ = _workbook_parts(archive)
+            return {name: archive.getinfo(part).file_size for name, part in sheets
+                    if not sheet_filter or sheet_filter(name)}
+    except (OSError, KeyError, ValueError, SyntaxError, zipfile.BadZipFile):
+        return {}
+
+
+def iter_sheets(excel_path, sheet_filter=None):
+    """
+    Parcourt les feuilles d'un classeur en l'ouvrant une seule fois
+
+    Les feuilles écartées par le filtre ne sont jamais décompressées. Chaque
+    SheetRows doit être consommé avant de passer à la feuille suivante. Les
+    dimensions déclarées par la feuille (<dimension>) sont ignorées: elles
+    peuvent être périmées et tronqueraient la lecture.
+
+    Args:
+        excel_path (str): Chemin vers le fichier Excel
+        sheet_filter (callable, optional): Prédicat sur le nom de la feuille
+
+    Yields:
+        SheetRows: Une entrée par feuille retenue
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(excel_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        for worksheet in workbook.worksheets:
+            if sheet_filter and not sheet_filter(worksheet.title):
+                continue
+
+            worksheet.reset_dimensions()
+            raw_rows = worksheet.iter_rows(values_only=True)
+
+            # La première ligne non vide sert d'en-tête
+            header = ()
+            for raw in raw_rows:
+                if any(value is not None for value in raw):
+                    header = raw
+                    break
+
+            columns = make_columns(header)
+            sheet = SheetRows(worksheet.title, columns, None, header)
+            sheet.rows = _iter_typed_rows(raw_rows, len(columns), sheet)
+            yield sheet
+    finally:
+        workbook.close()
@@ -0,0 +1,196 @@
+"""
+Réextraction partielle d'un classeur modifié, ligne par ligne.
+
+Pour chaque feuille de cours, l'import précédent garde l'empreinte du
+contenu de chaque ligne (valeurs après nettoyage) et les cours qu'elle a
+produits. Au nouvel import, une ligne dont l'empreinte est connue reprend
+ses cours sans analyse; seules les lignes nouvelles ou modifiées passent par
+l'extracteur, puis les cours sont réassemblés dans l'ordre des lignes.
+
+L'empreinte sert d'identité stable à la ligne: insérer, supprimer ou
+déplacer des lignes ne change pas celle des autres, contrairement à leur
+position. Une ligne modifiée compte comme une ligne supprimée et une ligne
+ajoutée; des lignes identiques sont appariées dans l'ordre.
+
+Les cours d'une ligne ne dépendent que de ses valeurs, des colonnes de la
+feuille et de leurs types: si les colonnes, leurs types ou le moteur
+changent, la feuille est réextraite entièrement.
+"""
+import hashlib
+from collections import defaultdict, deque
+
+from excel_models import Course
+from excel_rows import SheetTable
+
+ROW_CACHE_VERSION = 1
+
+
+def frame_signature(df, engine):
+    """
+    Ce dont dépendent les cours d'une ligne, en dehors de ses valeurs
+
+    Args:
+        df (DataFrame | SheetTable): La feuille nettoyée
+        engine (str): Moteur de l'ExcelProcessor
+
+    Returns:
+        dict: {'version', 'engine', 'columns', 'dtypes'}
+    """
+    dtypes = None if isinstance(df, SheetTable) else [str(dtype) for dtype in df.dtypes]
+    return {
+        'version': ROW_CACHE_VERSION,
+        'engine': engine,
+        'columns': [str(column) for column in df.columns],
+        'dtypes': dtypes,
+    }
+
+
+def row_hashes(df):
+    """
+    Empreinte du contenu de chaque ligne, stable d'un processus à l'autre
+
+    Avec pandas, le hachage est vectorisé (hash_pandas_object); les cellules
+    des colonnes de type object sont hachées par leur repr, pour distinguer
+    1, 1.0 et '1'.
+
+    Args:
+        df (DataFrame | SheetTable): La feuille nettoyée
+
+    Returns:
+        list: Une empreinte hexadécimale par ligne
+    """
+    if isinstance(df, SheetTable):
+        if not df.columns:
+            return [''] * len(df)
+        columns = [df.column(column) for column in df.columns]
+        return [hashlib.blake2b(repr(values).encode('utf-8'), digest_size=8).hexdigest()
+                for values in zip(*columns)]
+
+    import pandas as pd
+
+    if len(df.columns) == 0:
+        return [''] * len(df)
+    typed = {}
+    for position in range(len(df.columns)):
+        series = df.iloc[:, position]
+        typed[position] = series.map(repr) if series.dtype == object else series
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(typed), index=False)
+    return [format(value, '016x') for value in hashes.tolist()]
+
+
+def take_rows(df, positions):
+    """
+    Sous-ensemble de lignes d'une feuille (types et normalisation inchangés)
+    """
+    if isinstance(df, SheetTable):
+        return df.take(positions)
+    return df.iloc[positions]
+
+
+class RowCache:
+    """
+    Cours produits par chaque ligne des feuilles lors du dernier import
+    """
+
+    def __init__(self, sheets=None):
+        """
+        Args:
+            sheets (dict, optional): {feuille: {'signature', 'rows': [[empreinte, [cours]], ...]}}
+        """
+        self.sheets = dict(sheets or {})
+        # Lignes reprises, ajoutées et supprimées par feuille pendant cet import
+        self.changes = {}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Reconstruit le cache à partir de sa forme sérialisée (to_dict)
+        """
+        if not data or data.get('version') != ROW_CACHE_VERSION:
+            return cls()
+        return cls(data.get('sheets'))
+
+    def to_dict(self):
+        return {'version': ROW_CACHE_VERSION, 'sheets': self.sheets}
+
+    def for_sheet(self, sheet_name):
+        """
+        Cache réduit à une feuille, pour la traiter dans un autre thread (voir merge)
+        """
+        previous = self.sheets.get(sheet_name)
+        return RowCache({sheet_name: previous} if previous is not None else None)
+
+    def merge(self, other):
+        """
+        Reprend les feuilles et les changements d'un cache réduit (for_sheet)
+        """
+        self.sheets.update(other.sheets)
+        self.changes.update(other.changes)
+
+    def extract(self, sheet_name, df, signature, extract):
+        """
+        Cours d'une feuille, en n'analysant que les lignes nouvelles ou modifiées
+
+        Args:
+            sheet_name (str): Nom de la feuille
+            df (DataFrame | SheetTable): La feuille nettoyée
+            signature (dict): Colonnes et types de la feuille (frame_signature)
+            extract (callable): extract(frame, origins) -> cours; origins reçoit,
+                pour chaque cours, la position (dans frame) de sa ligne
+
+        Returns:
+            list: Cours de la feuille, dans l'ordre des lignes
+        """
+        hashes = row_hashes(df)
+        previous = self.sheets.get(sheet_name)
+        reusable = previous is not None and previous['signature'] == signature
+
+        available = defaultdict(deque)
+        if reusable:
+            for row_hash, row_courses in previous['rows']:
+                available[row_hash].append(row_courses)
+
+        reused = {}
+        missing = []
+        for position, row_hash in enumerate(hashes):
+            candidates = available.get(row_hash)
+            if candidates:
+                reused[position] = candidates.popleft()
+            else:
+                missing.append(position)
+
+        extracted = defaultdict(list)
+        if missing:
+            frame = df if len(missing) == len(hashes) else take_rows(df, missing)
+            origins = []
+            new_courses = extract(frame, origins)
+            for course, origin in zip(new_courses, origins):
+                extracted[missing[origin]].append(course)
+
+        courses = []
+        rows = []
+        for position, row_hash in enumerate(hashes):
+            if position in reused:
+                stored = reused[position]
+                courses.extend(Course.from_dict(course) for course in stored)
+            else:
+                row_courses = extracted.get(position, [])
+                stored = [course.to_dict() for course in row_courses]
+                courses.extend(row_courses)
+            rows.append([row_hash, stored])
+
+        self.sheets[sheet_name] = {'signature': signature, 'rows': rows}
+        if previous is None:
+            removed = 0
+        elif reusable:
+            removed = sum(len(candidates) for candidates in available.values())
+        else:
+            removed = len(previous['rows'])
+        self.changes[sheet_name] = {
+            'rows': len(hashes),
+            'reused': len(reused),
+            'added': len(missing),
+            'removed': removed,
+            'full': not reusable,
+        }
+        return courses
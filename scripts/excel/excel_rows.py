@@ -0,0 +1,130 @@
+"""
+Feuilles en lignes Python, sans pandas (moteur 'openpyxl').
+
+SheetTable garde les lignes lues par excel_reader et fournit les colonnes
+une à une, normalisées comme les colonnes d'un DataFrame après clean_data:
+    - colonne numérique (int/float) avec des cellules vides: flottants, NaN pour les vides
+    - colonne entièrement entière ou booléenne et complète: valeurs inchangées
+    - autres colonnes: '' pour les cellules vides
+Les cours extraits sont ainsi identiques à ceux du moteur pandas.
+"""
+import math
+from datetime import date, datetime, timedelta
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def normalize_column(values):
+    """
+    Normalise les valeurs d'une colonne comme pandas (from_records puis fillna(''))
+
+    Args:
+        values (list): Valeurs brutes de la colonne (None pour une cellule vide)
+
+    Returns:
+        list: Valeurs normalisées
+    """
+    present = [value for value in values if value is not None]
+    numeric = bool(present) and all(_is_number(value) for value in present)
+
+    if len(present) == len(values):
+        # Colonne complète: seul le mélange d'entiers et de flottants est converti
+        if numeric and any(isinstance(value, float) for value in present):
+            return [float(value) for value in values]
+        return list(values)
+
+    if numeric:
+        return [math.nan if value is None else float(value) for value in values]
+    return ['' if value is None else value for value in values]
+
+
+def parse_weekday(value):
+    """
+    Jour de la semaine d'une date de début (0=lundi), None si la valeur n'est pas une date
+
+    Args:
+        value: Cellule 'Start Date & Time' (datetime, date, texte ou nombre)
+
+    Returns:
+        int: Index du jour ou None
+    """
+    if isinstance(value, (datetime, date)):
+        return value.weekday()
+    if _is_number(value):
+        # Comme pandas.to_datetime: un nombre est un horodatage en nanosecondes
+        if math.isnan(value):
+            return None
+        return (datetime(1970, 1, 1) + timedelta(microseconds=value / 1000)).weekday()
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return datetime.fromisoformat(value.strip()).weekday()
+    except ValueError:
+        pass
+    try:
+        from dateutil import parser
+    except ImportError:  # dépendance optionnelle
+        return None
+    try:
+        return parser.parse(value).weekday()
+    except (ValueError, OverflowError):
+        return None
+
+
+class SheetTable:
+    """
+    Feuille chargée en mémoire sous forme de lignes, avec un accès par colonne
+    """
+
+    def __init__(self, name, columns, rows):
+        """
+        Args:
+            name (str): Nom de la feuille
+            columns (list): Noms des colonnes
+            rows (list): Tuples de valeurs, un par ligne non vide
+        """
+        self.name = name
+        self.columns = columns
+        self.rows = rows
+        self._index = {column: idx for idx, column in enumerate(columns)}
+        self._normalized = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def column(self, name, default=''):
+        """
+        Valeurs normalisées d'une colonne, ou valeur par défaut si la colonne est absente
+
+        Args:
+            name (str): Nom de la colonne
+            default: Valeur de chaque ligne si la colonne n'existe pas
+
+        Returns:
+            list: Une valeur par ligne
+        """
+        if name not in self._index:
+            return [default] * len(self.rows)
+        values = self._normalized.get(name)
+        if values is None:
+            idx = self._index[name]
+            values = self._normalized[name] = normalize_column([row[idx] for row in self.rows])
+        return values
+
+    def take(self, positions):
+        """
+        Sous-ensemble de lignes, avec les valeurs normalisées sur la feuille entière
+
+        Args:
+            positions (list): Positions des lignes à garder
+
+        Returns:
+            SheetTable: Les lignes, dans l'ordre des positions
+        """
+        table = SheetTable(self.name, self.columns, [self.rows[position] for position in positions])
+        for column in self.columns:
+            values = self.column(column)
+            table._normalized[column] = [values[position] for position in positions]
+        return table
@@ -0,0 +1,373 @@
+"""
+Instantané binaire en colonnes des cours extraits (format .ksnap).
+
+Relire un import précédent depuis le JSON indenté (save_to_json) oblige à
+analyser tout le fichier. L'instantané range les cours par colonnes:
+    - coach, niveau, pattern, jour, heure et type de planning: codes entiers
+      (uint16) vers un dictionnaire des valeurs distinctes
+    - minuteOfWeek: minute de la semaine en heure française (int16, -1 si
+      inconnue, voir excel_occurrences)
+    - lien Zoom et groupe Telegram: décalages (uint32) dans un bloc UTF-8
+
+Disposition du fichier (petit-boutiste):
+    MAGIC (8 octets) | longueur de l'en-tête (uint32) | en-tête JSON | données
+L'en-tête donne le nombre de cours, les dictionnaires et la position de
+chaque colonne; chaque colonne est alignée sur 8 octets.
+
+CourseSnapshot projette le fichier en mémoire (mmap) et lit les colonnes
+directement (memoryview): un filtre par coach, niveau ou jour compare des
+codes entiers sans reconstruire aucun cours. Les champs dérivés (name,
+description, instructor) sont recalculés par Course: to_dict() redonne
+exactement les dictionnaires de la sortie JSON.
+"""
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from excel_models import Course
+from excel_occurrences import minute_of_week
+
+MAGIC = b'KJSNAP\x00\x01'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = '.ksnap'
+
+_LENGTH = struct.Struct('<I')
+_ALIGNMENT = 8
+
+# Colonnes encodées par dictionnaire, dans l'ordre des arguments de Course
+DICTIONARY_COLUMNS = ('professorName', 'level', 'schedule', 'dayOfWeek', 'time', 'schedule_type')
+TEXT_COLUMNS = ('zoomLink', 'telegramGroup')
+MINUTES_COLUMN = 'minuteOfWeek'
+
+# Critères de CourseSnapshot.filter -> colonne
+FILTER_COLUMNS = {
+    'coach': 'professorName',
+    'level': 'level',
+    'pattern': 'schedule',
+    'day': 'dayOfWeek',
+    'time': 'time',
+    'schedule_type': 'schedule_type',
+}
+
+
+def is_snapshot(path):
+    """
+    Indique si un fichier est un instantané en colonnes (d'après son en-tête)
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _value_key(value):
+    # NaN != NaN: les valeurs sont comparées par leur forme JSON
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _little_endian(values):
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _encode_dictionary(values):
+    dictionary = []
+    codes_by_key = {}
+    codes = []
+    for value in values:
+        key = _value_key(value)
+        code = codes_by_key.get(key)
+        if code is None:
+            code = codes_by_key[key] = len(dictionary)
+            dictionary.append(value)
+        codes.append(code)
+    typecode = 'H' if len(dictionary) <= 0xFFFF else 'I'
+    return dictionary, array(typecode, codes)
+
+
+def _encode_text(values):
+    # Texte brut si toutes les valeurs sont des chaînes, sinon chaque valeur en JSON
+    encoding = 'utf-8' if all(isinstance(value, str) for value in values) else 'json'
+    offsets = array('I', [0])
+    chunks = []
+    size = 0
+    for value in values:
+        chunk = (value if encoding == 'utf-8' else json.dumps(value, ensure_ascii=False)).encode('utf-8')
+        chunks.append(chunk)
+        size += len(chunk)
+        offsets.append(size)
+    return encoding, offsets, b''.join(chunks)
+
+
+def encode_snapshot(courses):
+    """
+    Encode des cours au format instantané en colonnes
+
+    Args:
+        courses (list): Cours (Course ou dictionnaires produits par to_dict)
+
+    Returns:
+        bytes: Contenu du fichier
+    """
+    courses = list(courses)
+    sections = []
+    columns = []
+    position = 0
+
+    def add_section(data):
+        nonlocal position
+        offset = position
+        padding = -len(data) % _ALIGNMENT
+        sections.append(data + b'\x00' * padding)
+        position += len(data) + padding
+        return offset, len(data)
+
+    for name in DICTIONARY_COLUMNS:
+        dictionary, codes = _encode_dictionary([course[name] for course in courses])
+        offset, size = add_section(_little_endian(codes))
+        columns.append({'name': name, 'kind': 'dictionary', 'typecode': codes.typecode,
+                        'offset': offset, 'size': size, 'dictionary': dictionary})
+
+    minutes = array('h', [-1 if minute is None else minute
+                          for minute in (minute_of_week(course['dayOfWeek'], course['time']) for course in courses)])
+    offset, size = add_section(_little_endian(minutes))
+    columns.append({'name': MINUTES_COLUMN, 'kind': 'fixed', 'typecode': 'h', 'offset': offset, 'size': size})
+
+    for name in TEXT_COLUMNS:
+        encoding, offsets, blob = _encode_text([course[name] for course in courses])
+        offsets_offset, offsets_size = add_section(_little_endian(offsets))
+        data_offset, data_size = add_section(blob)
+        columns.append({'name': name, 'kind': 'text', 'encoding': encoding,
+                        'offsets': [offsets_offset, offsets_size], 'offset': data_offset, 'size': data_size})
+
+    header = json.dumps({'version': SNAPSHOT_VERSION, 'count': len(courses), 'columns': columns},
+                        ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    prefix = MAGIC + _LENGTH.pack(len(header)) + header
+    prefix += b'\x00' * (-len(prefix) % _ALIGNMENT)
+    return prefix + b''.join(sections)
+
+
+def write_snapshot(courses, path):
+    """
+    Écrit un instantané en colonnes
+
+    Args:
+        courses (list): Cours à enregistrer
+        path (str): Chemin du fichier (.ksnap)
+
+    Returns:
+        int: Taille du fichier en octets
+    """
+    data = encode_snapshot(courses)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+class CourseSnapshot:
+    """
+    Instantané en colonnes projeté en mémoire, lu sans désérialiser les cours
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Chemin du fichier .ksnap
+
+        Raises:
+            ValueError: Si le fichier n'est pas un instantané valide
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            self._load_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _load_header(self):
+        buffer = self._mmap
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} n'est pas un instantané de cours")
+        (header_size,) = _LENGTH.unpack_from(buffer, len(MAGIC))
+        header_start = len(MAGIC) + _LENGTH.size
+        header = json.loads(bytes(buffer[header_start:header_start + header_size]))
+        if header.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Version d'instantané non prise en charge: {header.get('version')}")
+
+        data_start = header_start + header_size
+        self._data_start = data_start + (-data_start % _ALIGNMENT)
+        self.count = header['count']
+        self.dictionaries = {}
+        self._codes = {}
+        self._text = {}
+        self._minutes = None
+        for column in header['columns']:
+            if column['kind'] == 'dictionary':
+                self.dictionaries[column['name']] = column['dictionary']
+                self._codes[column['name']] = self._array(column['offset'], column['size'], column['typecode'])
+            elif column['kind'] == 'fixed':
+                self._minutes = self._array(column['offset'], column['size'], column['typecode'])
+            else:
+                offsets_offset, offsets_size = column['offsets']
+                self._text[column['name']] = (column['encoding'],
+                                              self._array(offsets_offset, offsets_size, 'I'),
+                                              self._data_start + column['offset'])
+        self.columns = list(DICTIONARY_COLUMNS) + [MINUTES_COLUMN] + list(TEXT_COLUMNS)
+
+    def _array(self, offset, size, typecode):
+        start = self._data_start + offset
+        view = memoryview(self._mmap)[start:start + size]
+        self._views.append(view)
+        if sys.byteorder == 'little':
+            values = view.cast(typecode)
+            self._views.append(values)
+            return values
+        # Plateforme gros-boutiste: copie convertie plutôt qu'une vue directe
+        values = array(typecode, view.tobytes())
+        values.byteswap()
+        return values
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Libère les vues et la projection mémoire
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __len__(self):
+        return self.count
+
+    def value(self, column, position):
+        """
+        Valeur d'une cellule
+
+        Args:
+            column (str): Nom de la colonne
+            position (int): Rang du cours
+
+        Returns:
+            La valeur, telle que dans la sortie JSON
+        """
+        if column in self._codes:
+            return self.dictionaries[column][self._codes[column][position]]
+        if column == MINUTES_COLUMN:
+            minute = self._minutes[position]
+            return None if minute < 0 else minute
+        encoding, offsets, start = self._text[column]
+        raw = self._mmap[start + offsets[position]:start + offsets[position + 1]].decode('utf-8')
+        return raw if encoding == 'utf-8' else json.loads(raw)
+
+    def column(self, name):
+        """
+        Toutes les valeurs d'une colonne
+
+        Returns:
+            list: Une valeur par cours
+        """
+        if name in self._codes:
+            dictionary = self.dictionaries[name]
+            return [dictionary[code] for code in self._codes[name]]
+        return [self.value(name, position) for position in range(self.count)]
+
+    def __getitem__(self, position):
+        if not -self.count <= position < self.count:
+            raise IndexError(position)
+        position %= self.count
+        return Course(*(self.value(name, position) for name in DICTIONARY_COLUMNS[:5]),
+                      self.value('zoomLink', position), self.value('telegramGroup', position),
+                      self.value('schedule_type', position))
+
+    def __iter__(self):
+        for position in range(self.count):
+            yield self[position]
+
+    def _wanted_codes(self, column, wanted):
+        if isinstance(wanted, (str, int, float)) or wanted is None:
+            wanted = [wanted]
+        keys = {_value_key(value) for value in wanted}
+        return {code for code, value in enumerate(self.dictionaries[column]) if _value_key(value) in keys}
+
+    def filter(self, minutes=None, **criteria):
+        """
+        Rangs des cours qui satisfont tous les critères
+
+        Seuls les codes entiers sont lus: aucun cours n'est reconstruit.
+
+        Args:
+            minutes (tuple, optional): Plage (début, fin exclue) de minutes de la semaine
+            **criteria: coach, level, pattern, day, time ou schedule_type; une
+                valeur ou une liste de valeurs acceptées
+
+        Returns:
+            list: Rangs croissants des cours retenus
+
+        Raises:
+            TypeError: Pour un critère inconnu
+        """
+        positions = None
+        for criterion, wanted in criteria.items():
+            if criterion not in FILTER_COLUMNS:
+                raise TypeError(f"Critère de filtre inconnu: {criterion}")
+            column = FILTER_COLUMNS[criterion]
+            codes = self._codes[column]
+            accepted = self._wanted_codes(column, wanted)
+            if not accepted:
+                return []
+            if positions is None:
+                positions = [position for position, code in enumerate(codes) if code in accepted]
+            else:
+                positions = [position for position in positions if codes[position] in accepted]
+
+        if minutes is not None:
+            start, end = minutes
+            values = self._minutes
+            candidates = range(self.count) if positions is None else positions
+            positions = [position for position in candidates if start <= values[position] < end]
+
+        return list(range(self.count)) if positions is None else positions
+
+    def courses(self, positions=None):
+        """
+        Reconstruit des cours
+
+        Args:
+            positions (list, optional): Rangs à reconstruire (tous par défaut)
+
+        Returns:
+            list: Course, dans l'ordre des rangs
+        """
+        if positions is None:
+            positions = range(self.count)
+        return [self[position] for position in positions]
+
+
+def load_snapshot_courses(path):
+    """
+    Charge tous les cours d'un instantané en colonnes
+
+    Args:
+        path (str): Chemin du fichier .ksnap
+
+    Returns:
+        list: Liste des Course
+    """
+    with CourseSnapshot(path) as snapshot:
+        return snapshot.courses()
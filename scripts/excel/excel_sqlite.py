@@ -0,0 +1,86 @@
+"""
+Écriture directe des cours extraits dans la base SQLite de l'application.
+
+Tous les cours sont écrits dans une seule transaction, par executemany.
+Les cours existants sont retrouvés par leur identité stable (coach,
+niveau, pattern, jour, heure) puis mis à jour par id; les autres sont
+insérés. Le schéma de la table appartient aux migrations de
+l'application: aucune contrainte n'y est ajoutée ici. Les cours identiques
+à ceux de la base ne sont pas réécrits: un import sans changement ne
+produit aucune écriture.
+"""
+import logging
+import sqlite3
+
+from excel_diff import (
+    CHANGE_CREATED, CHANGE_UPDATED, DB_COURSE_COLUMNS, DEFAULT_DB_PATH,
+    diff_courses, merge_by_key, normalize_value, read_courses,
+)
+
+logger = logging.getLogger('excel_processor.sqlite')
+
+_INSERT_SQL = (
+    f"INSERT INTO courses ({', '.join(DB_COURSE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in DB_COURSE_COLUMNS)})"
+)
+
+_UPDATE_SQL = (
+    f"UPDATE courses SET {', '.join(f'{column} = ?' for column in DB_COURSE_COLUMNS)} WHERE id = ?"
+)
+
+
+def course_row(course):
+    """
+    Valeurs d'un cours dans l'ordre des colonnes de la table courses
+
+    Les valeurs sont normalisées en texte (identifiants Telegram sans '.0',
+    cellules vides en chaîne vide) pour que l'identité ne contienne jamais NULL.
+    """
+    return tuple(normalize_value(course.get(column)) for column in DB_COURSE_COLUMNS)
+
+
+def write_courses(courses, db_path=None):
+    """
+    Écrit les cours dans la base en une seule transaction
+
+    Args:
+        courses (list): Liste des cours extraits
+        db_path (str, optional): Chemin de la base (data/edutrack.db par défaut)
+
+    Returns:
+        dict: Résumé {'created': n, 'updated': n, 'unchanged': n}
+    """
+    connection = sqlite3.connect(db_path or DEFAULT_DB_PATH, isolation_level=None, cached_statements=256)
+    try:
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute("PRAGMA busy_timeout = 5000")
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Les lignes existantes sont retrouvées par identité: chaque changement 'updated' porte leur id
+            existing = read_courses(connection)
+
+            changes = diff_courses(existing, courses)
+            created = [change for change in changes if change['change'] == CHANGE_CREATED]
+            updated = [change for change in changes if change['change'] == CHANGE_UPDATED]
+
+            connection.executemany(_INSERT_SQL, [course_row(change['course']) for change in created])
+            connection.executemany(_UPDATE_SQL, [course_row(change['course']) + (change['id'],)
+                                                 for change in updated])
+
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+    finally:
+        connection.close()
+
+    total = len(merge_by_key(courses))
+    summary = {
+        'created': len(created),
+        'updated': len(updated),
+        'unchanged': total - len(created) - len(updated),
+    }
+    logger.info(f"Base mise à jour: {summary}")
+    return summary
@@ -0,0 +1,98 @@
+"""
+Analyse des titres de cours ("Salma Choufani - ABG - SS - 2:00pm").
+
+Une seule expression compilée parcourt le titre une fois et relève le
+pattern (MW, TT, SS, FS), le niveau (BBG, ABG, IG) et la première heure.
+Pattern et niveau doivent être des mots entiers: 'SS' dans "Class" ou 'IG'
+dans "Bigger" ne comptent pas (le séparateur peut être une espace, un tiret,
+un chiffre ou une ponctuation). Si plusieurs patterns ou niveaux sont
+présents, l'ordre des listes fixe la priorité, comme auparavant.
+
+Les titres se répètent beaucoup d'une ligne et d'une feuille à l'autre:
+les résultats sont mémorisés dans un cache LRU borné.
+"""
+import re
+from functools import lru_cache
+
+DEFAULT_CACHE_SIZE = 4096
+
+TIME_PATTERN = r'(\d+:\d+\s*(?:AM|PM|am|pm))'
+
+
+class TitleTokenizer:
+    """
+    Extrait (pattern, niveau, heure) d'un titre de cours en une passe
+    """
+
+    def __init__(self, schedule_patterns, course_levels, time_pattern=TIME_PATTERN,
+                 cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            schedule_patterns (list): Patterns reconnus, par ordre de priorité
+            course_levels (list): Niveaux reconnus, par ordre de priorité
+            time_pattern (str): Expression de l'heure (un groupe capturant)
+            cache_size (int): Nombre maximal de titres mémorisés
+        """
+        self.schedule_patterns = list(schedule_patterns)
+        self.course_levels = list(course_levels)
+        self._pattern_rank = {pattern: rank for rank, pattern in enumerate(self.schedule_patterns)}
+        self._level_rank = {level: rank for rank, level in enumerate(self.course_levels)}
+
+        # Mots les plus longs d'abord pour qu'un mot ne soit jamais coupé par un préfixe
+        words = sorted(set(self.schedule_patterns) | set(self.course_levels), key=len, reverse=True)
+        self.regex = re.compile(
+            f'(?P<time>{time_pattern})'
+            + '|(?<![A-Za-z])(?P<word>' + '|'.join(re.escape(word) for word in words) + ')(?![A-Za-z])'
+        )
+        # Présence d'un pattern (mot entier), sans groupe capturant: filtre des cellules d'une grille
+        self.pattern_regex = re.compile(
+            '(?<![A-Za-z])(?:'
+            + '|'.join(re.escape(pattern) for pattern in sorted(set(self.schedule_patterns), key=len, reverse=True))
+            + ')(?![A-Za-z])'
+        )
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    def _parse(self, title):
+        if not isinstance(title, str):
+            return None, None, None
+
+        pattern = level = time = None
+        for match in self.regex.finditer(title):
+            word = match.group('word')
+            if word is None:
+                if time is None:
+                    time = match.group('time')
+                continue
+            rank = self._pattern_rank.get(word)
+            if rank is not None and (pattern is None or rank < self._pattern_rank[pattern]):
+                pattern = word
+            rank = self._level_rank.get(word)
+            if rank is not None and (level is None or rank < self._level_rank[level]):
+                level = word
+        return pattern, level, time
+
+    def parse_many(self, titles):
+        """
+        Analyse une colonne de titres; chaque titre distinct n'est analysé qu'une fois
+
+        Args:
+            titles (iterable): Titres des cours
+
+        Returns:
+            tuple: (patterns, niveaux, heures) sous forme de listes, None si non trouvé
+        """
+        titles = list(titles)
+        parsed = {}
+        for title in titles:
+            if title not in parsed:
+                parsed[title] = self.parse(title)
+        patterns = [parsed[title][0] for title in titles]
+        levels = [parsed[title][1] for title in titles]
+        times = [parsed[title][2] for title in titles]
+        return patterns, levels, times
+
+    def cache_info(self):
+        """
+        Statistiques du cache LRU (hits, misses, maxsize, currsize)
+        """
+        return self.parse.cache_info()
@@ -0,0 +1,309 @@
+"""
+Surveillance d'un répertoire de dépôt: chaque classeur .xlsx créé ou
+modifié est réimporté automatiquement (mode --watch).
+
+Sous Linux, inotify (appelé via ctypes, sans dépendance) signale les
+fichiers écrits (IN_CLOSE_WRITE, IN_MODIFY) ou déplacés dans le répertoire
+(IN_MOVED_TO): rien n'est relu tant qu'aucun fichier ne change. Si inotify
+n'est pas disponible (autre système, limite de surveillances atteinte), le
+répertoire est relu à intervalle régulier: taille et date de modification
+des seuls fichiers .xlsx.
+
+Un fichier en cours d'écriture (copie, enregistrement par Excel) produit
+plusieurs événements: il n'est importé qu'après `debounce` secondes sans
+nouvel événement, si sa taille et sa date n'ont pas bougé pendant ce délai
+et que son archive zip est complète. Seul le classeur modifié est réimporté,
+et un classeur dont la taille et la date sont celles du dernier import ne
+l'est pas une seconde fois.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import time
+import zipfile
+
+logger = logging.getLogger('excel_processor.watch')
+
+DEFAULT_WATCH_DIR = 'attached_assets'
+DEFAULT_DEBOUNCE = 1.0
+DEFAULT_POLL_INTERVAL = 2.0
+
+# Constantes de <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0)
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+# struct inotify_event: wd, mask, cookie, len, puis le nom (len octets, complété par des zéros)
+_EVENT = struct.Struct('iIII')
+_READ_SIZE = 64 * 1024
+
+
+def is_workbook_name(name):
+    """
+    Indique si un nom de fichier est celui d'un classeur à importer
+
+    Les fichiers verrous d'Excel ('~$...') et les fichiers cachés (copies
+    temporaires) sont ignorés.
+    """
+    return name.endswith('.xlsx') and not name.startswith(('~$', '.'))
+
+
+def file_signature(path):
+    """
+    Taille et date de modification d'un fichier
+
+    Returns:
+        tuple: (taille, mtime en nanosecondes), None si le fichier n'existe plus
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def scan_workbooks(directory):
+    """
+    Signatures des classeurs d'un répertoire
+
+    Returns:
+        dict: {chemin: (taille, mtime)}
+    """
+    signatures = {}
+    try:
+        entries = list(os.scandir(directory))
+    except OSError as e:
+        logger.warning(f"Lecture du répertoire {directory} impossible: {str(e)}")
+        return signatures
+    for entry in entries:
+        if is_workbook_name(entry.name) and entry.is_file():
+            stat = entry.stat()
+            signatures[entry.path] = (stat.st_size, stat.st_mtime_ns)
+    return signatures
+
+
+class InotifyWatcher:
+    """
+    Événements inotify d'un répertoire, lus sans dépendance externe (ctypes)
+    """
+
+    mode = 'inotify'
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Répertoire à surveiller
+
+        Raises:
+            OSError: Si inotify n'est pas disponible
+        """
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify n'est pas disponible sur ce système")
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, f"{os.strerror(error)}: {directory}")
+
+    def read(self, timeout):
+        """
+        Attend des événements pendant au plus timeout secondes
+
+        Args:
+            timeout (float): Attente maximale (None: illimitée)
+
+        Returns:
+            set: Chemins des classeurs signalés
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return set()
+
+        paths = set()
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            _, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0'))
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                # File d'événements saturée: relire le répertoire
+                logger.warning("File inotify saturée, relecture du répertoire")
+                paths.update(scan_workbooks(self.directory))
+            elif name and is_workbook_name(name):
+                paths.add(os.path.join(self.directory, name))
+        return paths
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class PollingWatcher:
+    """
+    Relecture périodique d'un répertoire (quand inotify n'est pas disponible)
+    """
+
+    mode = 'polling'
+
+    def __init__(self, directory, interval=DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            directory (str): Répertoire à surveiller
+            interval (float): Secondes entre deux relectures
+        """
+        self.directory = directory
+        self.interval = interval
+        self._signatures = scan_workbooks(directory)
+        self._next_scan = time.monotonic() + interval
+
+    def read(self, timeout):
+        """
+        Attend la prochaine relecture (au plus timeout secondes)
+
+        Returns:
+            set: Chemins des classeurs nouveaux ou modifiés depuis la relecture précédente
+        """
+        wait = max(self._next_scan - time.monotonic(), 0)
+        if timeout is not None and wait > timeout:
+            time.sleep(timeout)
+            return set()
+        time.sleep(wait)
+        self._next_scan = time.monotonic() + self.interval
+
+        signatures = scan_workbooks(self.directory)
+        changed = {path for path, signature in signatures.items() if self._signatures.get(path) != signature}
+        self._signatures = signatures
+        return changed
+
+    def close(self):
+        pass
+
+
+class WorkbookWatcher:
+    """
+    Classeurs prêts à être réimportés, après anti-rebond des écritures partielles
+    """
+
+    def __init__(self, directory=DEFAULT_WATCH_DIR, debounce=DEFAULT_DEBOUNCE, poll_interval=None):
+        """
+        Args:
+            directory (str): Répertoire de dépôt des classeurs
+            debounce (float): Secondes sans événement avant d'importer un fichier
+            poll_interval (float, optional): Forcer la relecture périodique à cet
+                intervalle (par défaut: inotify, relecture toutes les 2 s à défaut)
+
+        Raises:
+            OSError: Si le répertoire n'existe pas
+        """
+        self.directory = os.path.abspath(directory)
+        if not os.path.isdir(self.directory):
+            raise OSError(f"Répertoire introuvable: {directory}")
+        self.debounce = debounce
+
+        self.backend = None
+        if poll_interval is None:
+            try:
+                self.backend = InotifyWatcher(self.directory)
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify indisponible ({str(e)}), relecture périodique du répertoire")
+        if self.backend is None:
+            self.backend = PollingWatcher(self.directory, poll_interval or DEFAULT_POLL_INTERVAL)
+
+        # Fichiers signalés en attente: {chemin: (échéance, signature au dernier événement)}
+        self._pending = {}
+        # Signature de chaque classeur lors de son dernier import (les fichiers présents
+        # au démarrage sont considérés comme déjà importés)
+        self._imported = scan_workbooks(self.directory)
+
+    @property
+    def mode(self):
+        return self.backend.mode
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.backend.close()
+
+    def _schedule(self, path, now):
+        self._pending[path] = (now + self.debounce, file_signature(path))
+
+    def poll(self, timeout=None):
+        """
+        Attend des changements et renvoie les classeurs prêts à être importés
+
+        Args:
+            timeout (float, optional): Attente maximale en secondes (None: jusqu'au prochain classeur prêt)
+
+        Returns:
+            list: Chemins triés des classeurs à réimporter (peut être vide)
+        """
+        now = time.monotonic()
+        wait = timeout
+        if self._pending:
+            until_due = max(min(deadline for deadline, _ in self._pending.values()) - now, 0)
+            wait = until_due if wait is None else min(wait, until_due)
+
+        for path in self.backend.read(wait):
+            self._schedule(path, time.monotonic())
+        return self._ready(time.monotonic())
+
+    def _ready(self, now):
+        ready = []
+        for path, (deadline, signature) in list(self._pending.items()):
+            if deadline > now:
+                continue
+            current = file_signature(path)
+            if current is None:
+                # Fichier supprimé ou renommé entre-temps
+                del self._pending[path]
+            elif current != signature:
+                # Toujours en cours d'écriture sans événement (scrutation): attendre encore
+                self._schedule(path, now)
+            elif current == self._imported.get(path):
+                del self._pending[path]
+            elif not zipfile.is_zipfile(path):
+                # Archive incomplète: la fin de l'écriture produira un nouvel événement
+                logger.debug(f"Classeur incomplet ignoré pour l'instant: {path}")
+                del self._pending[path]
+            else:
+                del self._pending[path]
+                self._imported[path] = current
+                ready.append(path)
+        return sorted(ready)
+
+    def run(self, on_change, stop=None, timeout=1.0):
+        """
+        Appelle on_change(chemin) pour chaque classeur prêt, jusqu'à ce que stop soit levé
+
+        Args:
+            on_change (callable): Reçoit le chemin du classeur à réimporter
+            stop (threading.Event, optional): Arrête la surveillance (Ctrl+C sinon)
+            timeout (float): Intervalle de vérification de stop, en secondes
+        """
+        logger.info(f"Surveillance de {self.directory} ({self.mode}, anti-rebond {self.debounce:g} s)")
+        while stop is None or not stop.is_set():
+            for path in self.poll(timeout):
+                on_change(path)
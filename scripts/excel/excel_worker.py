@@ -0,0 +1,532 @@
+"""
+Mode worker résident pour le processeur Excel.
+
+Au lieu de lancer un nouvel interpréteur Python (et de réimporter pandas et
+openpyxl) pour chaque import, le worker reste actif et traite des jobs
+encodés en JSON, un par ligne, reçus sur stdin ou sur une socket Unix.
+
+Format d'un job (id, progress et timeout optionnels):
+    {"id": "42", "excel_path": "/chemin/fichier.xlsx", "output_path": "optionnel.json", "no_cache": false,
+     "progress": true, "timeout": 120}
+
+Format d'une réponse:
+    {"id": "42", "event": "result", "status": "done", "ok": true, "count": 253, "output_path": "..."}
+    {"id": "42", "event": "result", "status": "done", "ok": true, "count": 253, "courses": [...]}
+    {"id": "42", "event": "result", "status": "failed|cancelled|timeout", "ok": false, "error": "..."}
+
+Sans id, le worker en attribue un. Avec "progress": true, le job émet aussi,
+sur le même flux et avant sa réponse:
+    {"id": "42", "event": "accepted"}
+    {"id": "42", "event": "progress", "stage": "read", "sheet": "Fix Schedule", "rows": 3000, "percent": 41.5}
+Les événements d'avancement sont espacés d'au moins PROGRESS_INTERVAL secondes.
+
+Messages de contrôle, traités immédiatement même pendant un job:
+    {"action": "status", "id": "42"} -> {"id": "42", "event": "status", "status": "running", "progress": {...}}
+    {"action": "cancel", "id": "42"} -> {"id": "42", "event": "cancel", "ok": true}
+L'annulation est coopérative: le job s'arrête au prochain point de contrôle
+(toutes les PROGRESS_ROWS lignes et à chaque feuille). Au-delà de son
+timeout, un job est d'abord annulé puis, après CANCEL_GRACE secondes, son
+processus est tué (tous ceux du pool si son pid n'a pas encore été signalé);
+le pool est alors redémarré et les autres jobs en cours dans ce pool échouent.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from excel_logging import configure_logging, logging_settings
+from excel_models import json_default
+
+logger = logging.getLogger('excel_processor.worker')
+
+PROGRESS_INTERVAL = 0.25
+CANCEL_GRACE = 2.0
+# Nombre de jobs terminés dont le statut reste consultable
+FINISHED_JOBS_KEPT = 100
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_CANCELLED = 'cancelled'
+STATUS_TIMEOUT = 'timeout'
+
+# File des événements et jobs annulés, partagés avec le processus parent (voir _warm_up)
+_events = None
+_cancelled = None
+
+
+def _warm_up(events=None, cancelled=None, log_settings=None):
+    """
+    Précharge les dépendances lourdes dans chaque processus worker
+
+    Args:
+        events (Queue, optional): File des événements vers le processus parent
+        cancelled (dict, optional): Identifiants des jobs dont l'annulation est demandée
+        log_settings (tuple, optional): Niveau et format des logs du parent
+    """
+    global _events, _cancelled
+    _events = events
+    _cancelled = cancelled
+    if log_settings:
+        configure_logging(*log_settings)
+    import pandas  # noqa: F401
+    import openpyxl  # noqa: F401
+    import excel_processor  # noqa: F401
+
+
+def _ping():
+    """
+    Tâche vide utilisée pour démarrer les processus avant le premier job
+    """
+    return os.getpid()
+
+
+class _JobReporter:
+    """
+    Rappel d'avancement d'un job: transmet les événements au parent et vérifie l'annulation
+
+    Le parent garde le dernier avancement de chaque job (requête "status") et
+    ne le relaie au client que si le job a demandé "progress".
+    """
+
+    def __init__(self, job_id):
+        """
+        Args:
+            job_id (str): Identifiant du job
+        """
+        self.job_id = job_id
+        self._last = 0.0
+
+    def send(self, event):
+        if _events is not None:
+            _events.put({'id': self.job_id, **event})
+
+    def __call__(self, event):
+        if _cancelled is not None and self.job_id in _cancelled:
+            from excel_processor import ImportCancelled
+            raise ImportCancelled(self.job_id)
+        now = time.monotonic()
+        if now - self._last >= PROGRESS_INTERVAL:
+            self._last = now
+            self.send({'event': 'progress', **event})
+
+
+def run_job(job, cache_options=None):
+    """
+    Exécute un job d'import dans le processus worker
+
+    Args:
+        job (dict): Job décodé (excel_path, output_path et no_cache optionnels)
+        cache_options (dict, optional): Arguments de CourseCache, None pour désactiver le cache
+
+    Returns:
+        dict: Réponse à renvoyer au client
+    """
+    from excel_processor import ExcelProcessor, ImportCancelled, open_cache
+
+    excel_path = job.get('excel_path')
+    if not excel_path or not os.path.exists(excel_path):
+        return {'ok': False, 'error': f"Excel file not found at {excel_path}"}
+
+    reporter = _JobReporter(job.get('id'))
+    # Le parent a besoin du pid pour tuer le processus si le job dépasse son timeout
+    reporter.send({'event': 'started', 'pid': os.getpid()})
+
+    cache = None if job.get('no_cache') else open_cache(cache_options)
+    processor = ExcelProcessor(excel_path, cache=cache, progress=reporter)
+    try:
+        courses = processor.process_with_error_handling()
+    except ImportCancelled:
+        logger.info(f"Job {job.get('id')} annulé")
+        return {'ok': False, 'status': STATUS_CANCELLED, 'error': "Job cancelled"}
+    if courses is None:
+        return {'ok': False, 'error': "Processing failed"}
+
+    if job.get('output_path'):
+        output_path = processor.save_to_json(courses, job['output_path'])
+        return {'ok': True, 'count': len(courses), 'output_path': output_path}
+
+    return {'ok': True, 'count': len(courses), 'courses': courses}
+
+
+def _worker_context():
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(['pandas', 'openpyxl'])
+    return context
+
+
+class _JobState:
+    """
+    Suivi d'un job dans le processus parent
+    """
+
+    __slots__ = ('id', 'listener', 'progress', 'status', 'pid', 'future')
+
+    def __init__(self, job_id, listener):
+        self.id = job_id
+        self.listener = listener
+        self.progress = None
+        self.status = STATUS_QUEUED
+        self.pid = None
+        self.future = None
+
+
+class WorkerPool:
+    """
+    Pool de processus worker qui se relance automatiquement après un crash
+    """
+
+    def __init__(self, workers=1, cache_options=None, timeout=None):
+        """
+        Initialise le pool.
+
+        Args:
+            workers (int): Nombre de processus worker (1 = jobs traités en séquence)
+            cache_options (dict, optional): Arguments de CourseCache, None pour désactiver le cache
+            timeout (float, optional): Durée maximale d'un job en secondes (sauf "timeout" du job)
+        """
+        self.workers = max(1, workers)
+        self.cache_options = cache_options
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._finished = OrderedDict()
+
+        # Canal partagé avec les workers: événements (worker -> parent) et annulations
+        self._manager = multiprocessing.Manager()
+        self._events = self._manager.Queue()
+        self._cancelled = self._manager.dict()
+        self._event_thread = threading.Thread(target=self._dispatch_events, name='excel-job-events', daemon=True)
+        self._event_thread.start()
+
+        self._executor = self._start()
+
+    def _start(self):
+        # Le pool peut être redémarré pendant que d'autres threads lisent stdin ou
+        # écrivent les réponses: un fork direct hériterait de leurs verrous. Les
+        # workers sont donc créés par un serveur de fork sans threads.
+        executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_worker_context(),
+                                       initializer=_warm_up,
+                                       initargs=(self._events, self._cancelled, logging_settings()))
+        # Démarrer les processus tout de suite pour que le premier job soit rapide
+        for future in [executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+        logger.info(f"Pool de {self.workers} worker(s) prêt")
+        return executor
+
+    def _restart(self, broken):
+        with self._lock:
+            if self._executor is broken:
+                logger.error("Un worker s'est arrêté brutalement, redémarrage du pool")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._start()
+
+    def _dispatch_events(self):
+        # Thread du parent: relaie les événements des workers au client du job
+        while True:
+            try:
+                event = self._events.get()
+            except (EOFError, OSError):
+                return
+            if event is None:
+                return
+            # Sous le verrou: aucun événement n'est relayé après la réponse finale du job
+            with self._lock:
+                state = self._jobs.get(event['id'])
+                if state is None:
+                    continue
+                if event['event'] == 'started':
+                    state.pid = event['pid']
+                    state.status = STATUS_RUNNING
+                    continue
+                state.progress = {key: value for key, value in event.items() if key not in ('id', 'event')}
+                if state.listener is not None:
+                    state.listener(event)
+
+    def run(self, job, listener=None):
+        """
+        Exécute un job et renvoie la réponse, en redémarrant le pool si besoin
+
+        Args:
+            job (dict): Job décodé
+            listener (callable, optional): Reçoit les événements du job (accepted, progress)
+                si le job demande "progress"
+
+        Returns:
+            dict: Réponse contenant l'identifiant du job
+        """
+        job = dict(job)
+        job_id = job['id'] = str(job.get('id') or uuid.uuid4().hex)
+        state = _JobState(job_id, listener if job.get('progress') else None)
+        with self._lock:
+            if job_id in self._jobs:
+                return {'id': job_id, 'event': 'result', 'status': STATUS_FAILED, 'ok': False,
+                        'error': f"Job {job_id} is already running"}
+            self._finished.pop(job_id, None)
+            self._jobs[job_id] = state
+            executor = self._executor
+        if state.listener is not None:
+            state.listener({'id': job_id, 'event': 'accepted'})
+
+        timeout = job.get('timeout', self.timeout)
+        status = None
+        try:
+            state.future = executor.submit(run_job, job, self.cache_options)
+            try:
+                response = state.future.result(timeout=timeout)
+            except FutureTimeoutError:
+                status = STATUS_TIMEOUT
+                response = self._stop(state, executor)
+        except BrokenProcessPool:
+            self._restart(executor)
+            response = {'ok': False, 'error': "Worker crashed while processing the job, pool restarted"}
+        except CancelledError:
+            response = {'ok': False, 'status': STATUS_CANCELLED, 'error': "Job cancelled"}
+        except Exception as e:
+            response = {'ok': False, 'error': str(e)}
+        finally:
+            self._cancelled.pop(job_id, None)
+
+        status = status or response.pop('status', None) or (STATUS_DONE if response.get('ok') else STATUS_FAILED)
+        if status == STATUS_TIMEOUT:
+            response = {'ok': False, 'error': f"Job exceeded its timeout ({timeout}s)"}
+        self._finish(state, status)
+        return {'id': job_id, 'event': 'result', 'status': status, **response}
+
+    def _stop(self, state, executor):
+        """
+        Arrête un job qui a dépassé son timeout: annulation, puis arrêt forcé du processus
+        (de tout le pool si son pid est inconnu) et redémarrage du pool; chaque attente
+        est bornée par CANCEL_GRACE
+
+        Returns:
+            dict: Réponse du job s'il s'est arrêté à temps
+        """
+        if state.future.cancel():
+            return {'ok': False}
+        self._cancelled[state.id] = True
+        try:
+            return state.future.result(timeout=CANCEL_GRACE)
+        except FutureTimeoutError:
+            pass
+        if state.pid is not None:
+            logger.error(f"Job {state.id} toujours actif après son timeout, arrêt du processus {state.pid}")
+            try:
+                os.kill(state.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        else:
+            # Le worker n'a pas (encore) signalé son pid: tous les processus du pool sont arrêtés
+            logger.error(f"Job {state.id} toujours actif après son timeout, arrêt des processus du pool")
+            for process in list((getattr(executor, '_processes', None) or {}).values()):
+                try:
+                    process.kill()
+                except (OSError, ValueError):
+                    pass
+        try:
+            return state.future.result(timeout=CANCEL_GRACE)
+        except (BrokenProcessPool, FutureTimeoutError):
+            self._restart(executor)
+        return {'ok': False}
+
+    def _finish(self, state, status):
+        with self._lock:
+            state.status = status
+            self._jobs.pop(state.id, None)
+            self._finished[state.id] = state
+            while len(self._finished) > FINISHED_JOBS_KEPT:
+                self._finished.popitem(last=False)
+
+    def cancel(self, job_id):
+        """
+        Demande l'annulation d'un job en attente ou en cours
+
+        Args:
+            job_id (str): Identifiant du job
+
+        Returns:
+            bool: False si le job est inconnu ou déjà terminé
+        """
+        with self._lock:
+            state = self._jobs.get(str(job_id))
+        if state is None:
+            return False
+        if state.future is None or not state.future.cancel():
+            self._cancelled[state.id] = True
+        return True
+
+    def status(self, job_id):
+        """
+        Statut et dernier avancement connu d'un job
+
+        Args:
+            job_id (str): Identifiant du job
+
+        Returns:
+            dict: {'id', 'event': 'status', 'status', 'progress'}
+        """
+        job_id = str(job_id)
+        with self._lock:
+            state = self._jobs.get(job_id) or self._finished.get(job_id)
+        if state is None:
+            return {'id': job_id, 'event': 'status', 'status': 'unknown', 'progress': None}
+        return {'id': job_id, 'event': 'status', 'status': state.status, 'progress': state.progress}
+
+    def control(self, message):
+        """
+        Traite un message de contrôle ({"action": "status" | "cancel", "id": ...})
+
+        Returns:
+            dict: Réponse à renvoyer au client
+        """
+        action = message.get('action')
+        job_id = message.get('id')
+        if action == 'status':
+            return self.status(job_id)
+        if action == 'cancel':
+            return {'id': job_id, 'event': 'cancel', 'ok': self.cancel(job_id)}
+        return {'id': job_id, 'ok': False, 'error': f"Unknown action: {action}"}
+
+    def shutdown(self):
+        with self._lock:
+            self._executor.shutdown(wait=True)
+        self._events.put(None)
+        self._event_thread.join()
+        self._manager.shutdown()
+
+
+def _decode_job(line):
+    """
+    Décode une ligne JSON en job
+
+    Returns:
+        tuple: (job, réponse d'erreur) - un seul des deux est renseigné
+    """
+    try:
+        job = json.loads(line)
+    except ValueError as e:
+        return None, {'id': None, 'ok': False, 'error': f"Invalid JSON: {e}"}
+    if not isinstance(job, dict):
+        return None, {'id': None, 'ok': False, 'error': "Job must be a JSON object"}
+    return job, None
+
+
+def _encode_response(response):
+    return json.dumps(response, ensure_ascii=False, default=json_default) + '\n'
+
+
+def serve_stdio(pool, concurrency=1, stdin=None, stdout=None):
+    """
+    Lit des jobs sur stdin et écrit les réponses sur stdout jusqu'à EOF
+
+    Args:
+        pool (WorkerPool): Pool de workers
+        concurrency (int): Nombre de jobs traités simultanément
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    write_lock = threading.Lock()
+
+    def respond(response):
+        with write_lock:
+            stdout.write(_encode_response(response))
+            stdout.flush()
+
+    def handle(job):
+        respond(pool.run(job, listener=respond))
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as dispatcher:
+        for line in stdin:
+            if not line.strip():
+                continue
+            job, error = _decode_job(line)
+            if error:
+                respond(error)
+            elif 'action' in job:
+                respond(pool.control(job))
+            else:
+                dispatcher.submit(handle, job)
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        write_lock = threading.Lock()
+
+        def respond(response):
+            with write_lock:
+                self.wfile.write(_encode_response(response).encode('utf-8'))
+                self.wfile.flush()
+
+        # Les jobs d'une connexion sont traités dans l'ordre; les messages de
+        # contrôle sont traités pendant qu'un job est en cours
+        with ThreadPoolExecutor(max_workers=1) as dispatcher:
+            for raw_line in self.rfile:
+                line = raw_line.decode('utf-8')
+                if not line.strip():
+                    continue
+                job, error = _decode_job(line)
+                if error:
+                    respond(error)
+                elif 'action' in job:
+                    respond(self.server.pool.control(job))
+                else:
+                    dispatcher.submit(lambda job=job: respond(self.server.pool.run(job, listener=respond)))
+
+
+class _JobServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def serve_socket(pool, socket_path):
+    """
+    Accepte des connexions sur une socket Unix; chaque connexion envoie des jobs ligne par ligne
+
+    Args:
+        pool (WorkerPool): Pool de workers
+        socket_path (str): Chemin de la socket Unix
+    """
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    with _JobServer(socket_path, _JobHandler) as server:
+        server.pool = pool
+        logger.info(f"Worker en écoute sur {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)
+
+
+def serve(workers=1, socket_path=None, cache_options=None, timeout=None):
+    """
+    Point d'entrée du mode worker
+
+    Args:
+        workers (int): Nombre de processus worker
+        socket_path (str, optional): Socket Unix; stdin/stdout si absent
+        cache_options (dict, optional): Arguments de CourseCache, None pour désactiver le cache
+        timeout (float, optional): Durée maximale par défaut d'un job, en secondes
+    """
+    pool = WorkerPool(workers, cache_options=cache_options, timeout=timeout)
+    try:
+        if socket_path:
+            serve_socket(pool, socket_path)
+        else:
+            serve_stdio(pool, concurrency=workers)
+    finally:
+        pool.shutdown()
@@ -0,0 +1,120 @@
+"""
+Générateur de classeurs de planning synthétiques.
+
+Produit des feuilles "Dynamic Schedule", "Fix Schedule" et "Message Schedule"
+avec exactement les colonnes attendues par validate_excel_structure, pour un
+nombre de lignes arbitraire. Le contenu est déterministe pour une graine donnée.
+"""
+import os
+import random
+from datetime import datetime, time, timedelta
+
+from openpyxl import Workbook
+
+DYNAMIC_COLUMNS = ['Topic ', 'Duration (Min)', 'Coach', 'Schedule for', 'Start Date & Time',
+                   'Zoom Link', 'ZOOM ID', 'TIME (GMT) ', 'TIME (France)']
+FIXED_COLUMNS = ['Salma Choufani - ABG - SS - 2:00pm', 'Salma Choufani', 'EMAIL', 'DAY',
+                 'TIME FORMATED (GMT+1)', 'TIME (GMT) ', 'TIME (France)', 'ASSISTANT', 'TELEGRAM GROUP ID']
+MESSAGE_COLUMNS = ['Telegram Chat Id', 'Telegram Message', 'Sending Date']
+
+COACHES = ['Mina Lepsanovic', 'Maimouna Koffi', 'Salma Choufani', 'Jean Dupont', 'Awa Diallo',
+           'Karim Benali', 'Sofia Rossi', 'Omar Traoré', 'Lea Martin', 'Yao Mensah']
+ASSISTANTS = ['Hiba Chary', 'Nadia Amrani', 'Paul Kouassi']
+LEVELS = ['BBG', 'ABG', 'IG']
+PATTERNS = ['MW', 'TT', 'FS', 'SS']
+PATTERN_DAYS = {'MW': ['Monday', 'Wednesday'], 'TT': ['Tuesday', 'Thursday'],
+                'FS': ['Friday', 'Saturday'], 'SS': ['Saturday', 'Sunday']}
+WEEK_START = datetime(2025, 3, 3)
+DAY_OFFSETS = {'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
+               'Friday': 4, 'Saturday': 5, 'Sunday': 6}
+
+
+def _slot(rng):
+    """
+    Créneau aléatoire: (heure France, titre d'heure '7:30pm')
+    """
+    hour = rng.randrange(8, 23)
+    minute = rng.choice([0, 30])
+    suffix = 'am' if hour < 12 else 'pm'
+    display_hour = hour if hour <= 12 else hour - 12
+    return hour, minute, f"{display_hour}:{minute:02d}{suffix}"
+
+
+def generate_rows(rows, seed=0):
+    """
+    Génère les lignes des trois feuilles
+
+    Args:
+        rows (int): Nombre de lignes par feuille
+        seed (int): Graine du générateur
+
+    Returns:
+        dict: Lignes (listes de valeurs) par nom de feuille
+    """
+    rng = random.Random(seed)
+    dynamic, fixed, messages = [], [], []
+
+    for idx in range(rows):
+        coach = rng.choice(COACHES)
+        level = rng.choice(LEVELS)
+        pattern = rng.choice(PATTERNS)
+        hour, minute, title_time = _slot(rng)
+        title = f"{coach} - {level} - {pattern} - {title_time}"
+        day = rng.choice(PATTERN_DAYS[pattern])
+        start = WEEK_START + timedelta(days=DAY_OFFSETS[day], hours=hour, minutes=minute)
+        zoom_id = 80000000000 + idx
+        group_id = -1001000000000 - idx
+        gmt = f"{(hour - 1) % 24}h {minute:02d} GMT"
+        france = f"{hour}h {minute:02d} France"
+
+        dynamic.append([title, 60, coach, f"{coach.split()[0].lower()}@example.com",
+                        start.strftime('%Y-%m-%d %H:%M:%S'), f"https://us02web.zoom.us/j/{zoom_id}",
+                        zoom_id, gmt, france])
+        fixed.append([title, coach, f"{coach.split()[0].lower()}@example.com", day,
+                      time(hour, minute), gmt, france, rng.choice(ASSISTANTS), group_id])
+        messages.append([group_id, f"Cours {title}\nZoom Link: https://us02web.zoom.us/j/{zoom_id}",
+                         start.strftime('%Y-%m-%d %H:%M:%S')])
+
+    return {
+        'Dynamic Schedule': (DYNAMIC_COLUMNS, dynamic),
+        'Fix Schedule': (FIXED_COLUMNS, fixed),
+        'Message Schedule': (MESSAGE_COLUMNS, messages),
+    }
+
+
+def write_workbook(path, rows, seed=0):
+    """
+    Écrit un classeur synthétique
+
+    Args:
+        path (str): Chemin du fichier .xlsx à créer
+        rows (int): Nombre de lignes par feuille
+        seed (int): Graine du générateur
+
+    Returns:
+        str: Chemin du fichier créé
+    """
+    workbook = Workbook(write_only=True)
+    for sheet_name, (columns, sheet_rows) in generate_rows(rows, seed).items():
+        worksheet = workbook.create_sheet(sheet_name)
+        worksheet.append(columns)
+        for row in sheet_rows:
+            worksheet.append(row)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    workbook.save(path)
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Génère un classeur de planning synthétique")
+    parser.add_argument('output', help="Chemin du fichier .xlsx à créer")
+    parser.add_argument('--rows', type=int, default=1000, help="Nombre de lignes par feuille (défaut: 1000)")
+    parser.add_argument('--seed', type=int, default=0, help="Graine du générateur (défaut: 0)")
+    args = parser.parse_args()
+
+    print(write_workbook(args.output, args.rows, args.seed))
@@ -0,0 +1,41 @@
+"""
+Configuration commune des tests des scripts Excel.
+
+Les modules de scripts/excel s'importent entre eux par leur nom (ils sont
+lancés depuis ce répertoire): le répertoire est ajouté au chemin d'import.
+"""
+import os
+import sys
+
+import pytest
+
+EXCEL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if EXCEL_DIR not in sys.path:
+    sys.path.insert(0, EXCEL_DIR)
+
+REFERENCE_WORKBOOK = os.path.join(
+    EXCEL_DIR, '..', '..', 'attached_assets', 'Kodjo English - Classes Schedules (2).xlsx'
+)
+
+
+@pytest.fixture
+def reference_workbook():
+    if not os.path.exists(REFERENCE_WORKBOOK):
+        pytest.skip("Classeur de référence absent")
+    return REFERENCE_WORKBOOK
+
+
+def save_workbook(path, sheets):
+    """
+    Écrit un classeur: {nom de la feuille: lignes (listes de valeurs)}
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for name, rows in sheets.items():
+        worksheet = workbook.create_sheet(name)
+        for row in rows:
+            worksheet.append(row)
+    workbook.save(path)
+    return str(path)
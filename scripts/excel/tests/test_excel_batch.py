@@ -0,0 +1,81 @@
+import json
+from datetime import datetime
+
+import pytest
+from conftest import save_workbook
+
+import excel_processor
+from excel_batch import process_batch, process_workbook
+
+MESSAGE_HEADER = ['Telegram Chat Id', 'Telegram Message', 'Sending Date']
+
+
+def _workbook(path, coach, messages):
+    return save_workbook(path, {
+        'Dynamic Schedule': [
+            ['Coach', 'Topic ', 'Zoom Link', 'TIME (France)', 'Start Date & Time'],
+            [coach, f'{coach} - ABG - MW - 7:30pm', 'https://zoom.us/j/1', '19:30', None],
+        ],
+        'Message Schedule': [MESSAGE_HEADER] + messages,
+    })
+
+
+@pytest.fixture
+def workbooks(tmp_path):
+    shared = [-1001, 'Rappel', datetime(2025, 3, 3, 20, 30)]
+    return [
+        _workbook(tmp_path / 'a.xlsx', 'Ann', [shared, [-1002, 'Bienvenue', datetime(2025, 3, 1, 9, 0)]]),
+        _workbook(tmp_path / 'b.xlsx', 'Bob', [shared]),
+    ]
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'openpyxl'])
+def test_process_workbook_uses_engine(workbooks, monkeypatch, engine):
+    engines = []
+    original = excel_processor.ExcelProcessor.__init__
+
+    def record(self, *args, **kwargs):
+        original(self, *args, **kwargs)
+        engines.append((self.engine, self.sheet_executor))
+
+    monkeypatch.setattr(excel_processor.ExcelProcessor, '__init__', record)
+    courses, messages = process_workbook(workbooks[0], engine=engine, sheet_executor='thread')
+    # Puis un processeur par feuille, dans les threads, avec le même moteur
+    assert engines == [(engine, 'thread')] + [(engine, None)] * 2
+    assert [course['professorName'] for course in courses] == ['Ann', 'Ann']
+    assert len(messages) == 2
+
+
+def test_batch_keeps_messages(workbooks):
+    results = []
+    courses, messages, failed = process_batch(
+        workbooks, workers=2, engine='openpyxl',
+        on_result=lambda path, courses, messages: results.append((path, len(courses), len(messages))),
+    )
+    assert failed == []
+    assert sorted(results) == [(workbooks[0], 2, 2), (workbooks[1], 2, 1)]
+    assert [course['professorName'] for course in courses] == ['Ann', 'Ann', 'Bob', 'Bob']
+    # Le message commun aux deux fichiers n'est repris qu'une fois
+    assert [message.text for message in messages] == ['Rappel', 'Bienvenue']
+
+
+def test_run_batch_writes_merged_outputs(workbooks, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    messages_path = tmp_path / 'messages.json'
+    created = []
+    original = excel_processor.ExcelProcessor.__init__
+
+    def record(self, excel_path, *args, **kwargs):
+        created.append(excel_path)
+        original(self, excel_path, *args, **kwargs)
+
+    monkeypatch.setattr(excel_processor.ExcelProcessor, '__init__', record)
+    assert excel_processor.run_batch(str(tmp_path), workers=1, messages_output=str(messages_path)) == 0
+
+    # Aucun processeur n'est construit sur le répertoire du lot
+    assert str(tmp_path) not in created
+    printed = dict(line.split('=', 1) for line in capsys.readouterr().out.splitlines() if '=' in line)
+    with open(tmp_path / printed['OUTPUT_PATH'], encoding='utf-8') as f:
+        assert [course['professorName'] for course in json.load(f)] == ['Ann', 'Ann', 'Bob', 'Bob']
+    assert printed['MESSAGE_COUNT'] == '2'
+    assert len(json.loads(messages_path.read_text(encoding='utf-8'))['messages']) == 2
@@ -0,0 +1,38 @@
+import json
+import os
+
+import excel_cache
+from excel_cache import CourseCache
+
+
+def _workbook(tmp_path):
+    path = tmp_path / 'planning.xlsx'
+    path.write_bytes(b'contenu')
+    return str(path)
+
+
+def test_entries_from_other_extractor_version_are_ignored(tmp_path, monkeypatch):
+    cache = CourseCache(str(tmp_path / 'cache'))
+    path = _workbook(tmp_path)
+    cache.put(path, [{'name': 'A'}])
+    cache.put_rows(path, {'version': 1, 'sheets': {}})
+    assert cache.get(path) == [{'name': 'A'}]
+    assert cache.get_rows(path) == {'version': 1, 'sheets': {}}
+
+    monkeypatch.setattr(excel_cache, 'EXTRACTOR_VERSION', excel_cache.EXTRACTOR_VERSION + 1)
+    assert cache.get(path) is None
+    assert cache.get_rows(path) is None
+
+
+def test_entries_without_extractor_version_are_ignored(tmp_path):
+    cache = CourseCache(str(tmp_path / 'cache'))
+    path = _workbook(tmp_path)
+    cache.put(path, [{'name': 'A'}])
+    entry_path = cache._entry_path(cache.fingerprint(path)['sha256'])
+    with open(entry_path, encoding='utf-8') as f:
+        entry = json.load(f)
+    del entry['extractor_version']
+    with open(entry_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f)
+    assert os.path.exists(entry_path)
+    assert cache.get(path) is None
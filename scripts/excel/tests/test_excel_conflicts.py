@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from conftest import save_workbook
+
+from excel_conflicts import ConflictDetector
+from excel_models import Course
+from excel_processor import main
+
+
+def test_mixed_type_coach_names_are_sorted():
+    courses = [
+        Course(42, 'ABG', 'MW', 'Monday', '7:30pm', 'https://zoom.us/j/1'),
+        Course(42.0, 'IG', 'MW', 'Monday', '8:00pm', 'https://zoom.us/j/2'),
+        Course('Ann', 'ABG', 'MW', 'Monday', '7:30pm', 'https://zoom.us/j/3'),
+        Course(' Ann', 'BBG', 'MW', 'Monday', '8:00pm', 'https://zoom.us/j/4'),
+    ]
+
+    report = ConflictDetector.from_courses(courses).to_dict()
+
+    assert report['summary'] == {'coach': 2, 'zoom': 0}
+    assert [conflict['key'] for conflict in report['conflicts']] == ['42', 'Ann']
+    assert [conflict['courses'][0]['positions'] for conflict in report['conflicts']] == [[0], [2]]
+
+
+@pytest.fixture
+def failing_detector(monkeypatch):
+    def fail(self):
+        raise RuntimeError("rapport impossible")
+
+    monkeypatch.setattr(ConflictDetector, 'to_dict', fail)
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    return save_workbook(tmp_path / 'courses.xlsx', {
+        'Dynamic Schedule': [
+            ['Coach', 'Topic ', 'Zoom Link', 'TIME (France)', 'Start Date & Time'],
+            ['Ann', 'Ann - ABG - MW - 7:30pm', 'https://zoom.us/j/1', '19:30', None],
+        ],
+    })
+
+
+def test_json_import_survives_conflict_failure(failing_detector, workbook, tmp_path, capsys):
+    output = tmp_path / 'courses.json'
+    conflicts = tmp_path / 'conflicts.json'
+
+    assert main([workbook, str(output), '--no-cache', '--conflicts-output', str(conflicts)]) == 0
+
+    printed = capsys.readouterr().out
+    assert f"OUTPUT_PATH={output}" in printed
+    assert 'CONFLICT' not in printed
+    assert len(json.loads(output.read_text(encoding='utf-8'))) == 2
+    assert not conflicts.exists()
+
+
+def test_ndjson_import_survives_conflict_failure(failing_detector, workbook, tmp_path):
+    output = tmp_path / 'courses.ndjson'
+
+    assert main([workbook, '--format', 'ndjson', '--output', str(output), '--no-cache']) == 0
+
+    records = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    types = [record.get('type') for record in records]
+    assert 'conflicts' not in types
+    assert types[-1] == 'metrics'
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pytest
+from conftest import save_workbook
+
+from excel_layouts import KIND_DYNAMIC, KIND_FIXED, KIND_GRID, detect_layout
+from excel_processor import ExcelProcessor
+
+
+@pytest.fixture
+def grid_workbook(tmp_path):
+    # Grille coach x créneaux: les cours de Dan sont à droite du dernier en-tête
+    return save_workbook(tmp_path / 'grid.xlsx', {'Coach Schedule': [
+        [None, None, 'Mon', 'Tue', 'Group ID'],
+        ['Alice', 'a@x', 'ABG MW 7:30pm', 'CLASS IG 8:00pm', -200],
+        [None, None, 'IG TT 1:00 PM', None, None],
+        ['Dan', 'd@x', None, None, 'grp', None, 'ABG SS 11:00am'],
+    ]})
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'openpyxl'])
+def test_grid_cells_past_header(grid_workbook, engine):
+    processor = ExcelProcessor(grid_workbook, engine=engine)
+    courses = processor.process_with_error_handling()
+    assert processor.sheet_kind('Coach Schedule') == KIND_GRID
+    assert [(course['name'], course['dayOfWeek'], course['telegramGroup']) for course in courses] == [
+        ('Alice - ABG - MW - 7:30pm', 'Monday', -200),
+        ('Alice - ABG - MW - 7:30pm', 'Wednesday', -200),
+        ('Dan - ABG - SS - 11:00am', 'Saturday', 'grp'),
+        ('Dan - ABG - SS - 11:00am', 'Sunday', 'grp'),
+    ]
+
+
+def test_detect_renamed_headers():
+    layout = detect_layout('Cours Schedule', ['topic', 'coach ', 'ZOOM LINK', 'Time (France)'])
+    assert layout.kind == KIND_DYNAMIC
+    assert layout.apply(['topic', 'coach ', 'ZOOM LINK', 'Time (France)']) == [
+        'Topic ', 'Coach', 'Zoom Link', 'TIME (France)']
+
+    columns = ['John Doe - IG - TT - 7:00pm', 'John Doe', 'EMAIL', 'Day', 'TIME (France)', 'TELEGRAM GROUP ID']
+    layout = detect_layout('Planning', columns)
+    assert layout.kind == KIND_FIXED
+    assert layout.apply(columns)[:2] == ['Salma Choufani - ABG - SS - 2:00pm', 'Salma Choufani']
+
+
+def test_unrecognized_header_falls_back_to_sheet_name():
+    assert detect_layout('Fix Schedule', ['x', 'y']).kind == KIND_FIXED
+    assert detect_layout('Other Schedule', ['x', 'y']).kind is None
+
+
+@pytest.fixture
+def renamed_workbook(tmp_path):
+    # Aucun nom de feuille ne contient "Schedule" ni "Message"
+    return save_workbook(tmp_path / 'renamed.xlsx', {
+        'Notes': [['Remarque'], ['Vacances en août']],
+        'Planning': [
+            ['Coach', 'Topic ', 'Zoom Link', 'TIME (France)', 'Start Date & Time'],
+            ['Ann', 'Ann - ABG - MW - 7:30pm', 'https://zoom.us/j/1', '19:30', None],
+        ],
+        'Envois': [
+            ['Telegram Chat Id', 'Telegram Message', 'Sending Date'],
+            [-1001, 'Rappel', datetime(2025, 3, 3, 20, 30)],
+        ],
+    })
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'openpyxl'])
+@pytest.mark.parametrize('sheet_executor', [None, 'thread'])
+def test_sheets_routed_by_header_whatever_their_name(renamed_workbook, engine, sheet_executor):
+    events = []
+    processor = ExcelProcessor(renamed_workbook, engine=engine, sheet_executor=sheet_executor,
+                               progress=events.append)
+    courses = processor.process_with_error_handling()
+
+    assert [(course['name'], course['dayOfWeek']) for course in courses] == [
+        ('Ann - ABG - MW - 7:30pm', 'Monday'),
+        ('Ann - ABG - MW - 7:30pm', 'Wednesday'),
+    ]
+    assert [message.chat_id for message in processor.messages] == [-1001]
+    assert processor.sheet_kind('Planning') == KIND_DYNAMIC
+    assert 'sheets_unrecognized' not in processor.metrics.to_dict()['counters']
+    if sheet_executor is None:
+        assert events[-1]['percent'] == 100.0
@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+from conftest import save_workbook
+
+from excel_messages import ScheduledMessage, extract_messages, parse_sending_date
+from excel_processor import ExcelProcessor
+
+MESSAGE_HEADER = ['Telegram Chat Id', 'Telegram Message', 'Sending Date']
+
+
+@pytest.mark.parametrize('value', [None, float('nan'), pd.NaT, pd.NA, '', '  ', 'demain'])
+def test_parse_sending_date_rejects_missing_values(value):
+    assert parse_sending_date(value) is None
+
+
+@pytest.mark.parametrize('value', [
+    '2025-03-03T19:30:00+00:00',
+    datetime(2025, 3, 3, 19, 30, tzinfo=timezone.utc),
+    pd.Timestamp('2025-03-03 19:30', tz='UTC'),
+])
+def test_parse_sending_date_converts_aware_values_to_france(value):
+    assert parse_sending_date(value) == datetime(2025, 3, 3, 20, 30)
+
+
+def test_extract_messages_counts_missing_dates():
+    dates = pd.Series([datetime(2025, 3, 3, 20, 30), None, datetime(2025, 3, 4, 9, 0)])
+    assert dates.dtype.kind == 'M'
+    messages, skipped = extract_messages([-1001, -1002, -1003], ['a', 'b', 'c'], list(dates))
+    assert [message.chat_id for message in messages] == [-1001, -1003]
+    assert skipped == {'missing_chat_or_message': 0, 'invalid_sending_date': 1}
+
+
+@pytest.fixture
+def message_workbook(tmp_path):
+    return save_workbook(tmp_path / 'messages.xlsx', {
+        'Dynamic Schedule': [
+            ['Coach', 'Topic ', 'Zoom Link', 'TIME (France)', 'Start Date & Time'],
+            ['Ann', 'Ann - ABG - MW - 7:30pm', 'https://zoom.us/j/1', '19:30', None],
+        ],
+        # Colonne de dates avec une cellule vide: pandas y met NaT
+        'Message Schedule': [MESSAGE_HEADER,
+                             [-1001, 'Rappel', datetime(2025, 3, 3, 20, 30)],
+                             [-1002, 'Sans date', None],
+                             [-1003, 'Bienvenue', datetime(2025, 3, 4, 9, 0)]],
+        'Message Schedule 2': [MESSAGE_HEADER,
+                               [-1004, 'Illisible', 'demain'],
+                               [-1005, 'UTC', '2025-03-03T19:30:00+00:00']],
+    })
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'openpyxl'])
+def test_engines_skip_missing_sending_dates(message_workbook, engine):
+    processor = ExcelProcessor(str(message_workbook), engine=engine)
+    list(processor.iter_courses())
+
+    serialized = [message.to_dict() for message in processor.messages]
+    assert [message['telegramChatId'] for message in serialized] == [-1001, -1003, -1005]
+    assert serialized[2]['sendingDate'] == '2025-03-03T20:30:00'
+    assert [ScheduledMessage.from_dict(message) for message in serialized] == processor.messages
+    sheets = processor.metrics.to_dict()['sheets']
+    assert sheets['Message Schedule']['rows_skipped'] == {'invalid_sending_date': 1}
+    assert sheets['Message Schedule 2']['rows_skipped'] == {'invalid_sending_date': 1}
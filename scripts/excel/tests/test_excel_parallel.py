@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pytest
+from conftest import save_workbook
+
+from excel_cache import CourseCache
+from excel_processor import ExcelProcessor
+
+DYNAMIC_HEADER = ['Coach', 'Topic ', 'Zoom Link', 'TIME (France)', 'Start Date & Time']
+FIXED_HEADER = ['Salma Choufani - ABG - SS - 2:00pm', 'Salma Choufani', 'EMAIL', 'DAY', 'TIME (France)',
+                'TELEGRAM GROUP ID']
+MESSAGE_HEADER = ['Telegram Chat Id', 'Telegram Message', 'Sending Date']
+
+
+def _workbook(path, last_coach='Cleo'):
+    return save_workbook(path, {
+        'Dynamic Schedule': [
+            DYNAMIC_HEADER,
+            ['Ann', 'Ann - ABG - MW - 7:30pm', 'https://zoom.us/j/1', '19:30', None],
+            ['Bob', 'Bob - IG - TT - 8:00pm', 'https://zoom.us/j/2', '20:00', None],
+            [None, None, None, None, None],
+        ],
+        'Fix Schedule': [
+            FIXED_HEADER,
+            [f'{last_coach} - BBG - FS - 6:00pm', last_coach, 'c@x', 'Friday', '18:00', -300],
+        ],
+        'Message Schedule': [
+            MESSAGE_HEADER,
+            [-1001, 'Rappel', datetime(2025, 3, 3, 20, 30)],
+            [-1002, 'Sans date', None],
+        ],
+    })
+
+
+def _summary(processor, courses):
+    metrics = processor.metrics.to_dict()
+    return {
+        'courses': [course.to_dict() for course in courses],
+        'messages': [message.to_dict() for message in processor.messages],
+        'counters': metrics['counters'],
+        'sheets': metrics['sheets'],
+        'layouts': {name: layout.kind for name, layout in processor.sheet_layouts.items()},
+    }
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'openpyxl'])
+def test_thread_sheets_merge_like_sequential(tmp_path, engine):
+    path = _workbook(tmp_path / 'planning.xlsx')
+    sequential = ExcelProcessor(path, engine=engine)
+    threaded = ExcelProcessor(path, engine=engine, sheet_executor='thread')
+
+    expected = _summary(sequential, sequential.process_with_error_handling())
+    assert _summary(threaded, threaded.process_with_error_handling()) == expected
+    assert len(expected['courses']) == 5 and len(expected['messages']) == 1
+
+
+def test_thread_sheets_reuse_row_cache(tmp_path):
+    cache = CourseCache(str(tmp_path / 'cache'))
+    path = _workbook(tmp_path / 'planning.xlsx')
+    first = ExcelProcessor(path, cache=cache, sheet_executor='thread')
+    first.process_with_error_handling()
+
+    _workbook(path, last_coach='Dora')
+    second = ExcelProcessor(path, cache=cache, sheet_executor='thread')
+    courses = second.process_with_error_handling()
+
+    assert [course['professorName'] for course in courses] == ['Ann', 'Ann', 'Bob', 'Bob', 'Dora']
+    changes = second.row_cache.changes
+    assert list(changes) == ['Dynamic Schedule', 'Fix Schedule']
+    assert (changes['Dynamic Schedule']['reused'], changes['Dynamic Schedule']['added']) == (2, 0)
+    assert (changes['Fix Schedule']['reused'], changes['Fix Schedule']['added']) == (0, 1)
+    assert set(cache.get_rows(path)['sheets']) == {'Dynamic Schedule', 'Fix Schedule'}
+
+
+def test_thread_sheets_report_progress_to_the_caller(tmp_path):
+    events = []
+    path = _workbook(tmp_path / 'planning.xlsx')
+    processor = ExcelProcessor(path, sheet_executor='thread', progress=events.append)
+    processor.process_with_error_handling()
+
+    assert {event['sheet'] for event in events if event['stage'] == 'read'} == {
+        'Dynamic Schedule', 'Fix Schedule', 'Message Schedule'}
+    assert max(event['percent'] for event in events) == 100.0
@@ -0,0 +1,65 @@
+import re
+import zipfile
+
+import pandas as pd
+import pytest
+from conftest import save_workbook
+
+from excel_processor import ExcelProcessor
+from excel_reader import iter_sheets
+
+
+def _read(path):
+    sheets = {}
+    for sheet in iter_sheets(path):
+        rows = list(sheet.rows)
+        sheets[sheet.name] = (sheet.all_columns(), rows)
+    return sheets
+
+
+def _stale_dimensions(source, target):
+    # Réécrit la balise <dimension> de chaque feuille avec une plage trop petite
+    with zipfile.ZipFile(source) as zin, zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename.startswith('xl/worksheets/sheet'):
+                data = re.sub(rb'<dimension ref="[^"]*"\s*/>', b'<dimension ref="A1:D6"/>', data)
+            zout.writestr(item, data)
+    return str(target)
+
+
+def test_cells_past_header_become_unnamed_columns(tmp_path):
+    path = save_workbook(tmp_path / 'grid.xlsx', {'Coach Schedule': [
+        [None, None, 'Mon', 'Group ID'],
+        ['Alice', 'a@x', 'ABG MW 7:30pm', -200],
+        ['Dan', 'd@x', None, 'grp', None, 'ABG SS 11:00am'],
+    ]})
+    columns, rows = _read(path)['Coach Schedule']
+    assert columns == list(pd.read_excel(path, sheet_name='Coach Schedule').columns)
+    assert columns[-2:] == ['Unnamed: 4', 'Unnamed: 5']
+    assert rows[1][5] == 'ABG SS 11:00am'
+
+
+def test_stale_dimension_is_ignored(tmp_path):
+    source = save_workbook(tmp_path / 'source.xlsx', {'Dynamic Schedule': [
+        ['Coach', 'Topic ', 'Zoom Link', 'TIME (France)', 'Start Date & Time'],
+    ] + [[f'Coach {idx}', f'Coach {idx} - ABG - MW - 7:30pm', f'https://zoom.us/j/{idx}', '19:30', None]
+         for idx in range(10)]})
+    path = _stale_dimensions(source, tmp_path / 'stale.xlsx')
+    columns, rows = _read(path)['Dynamic Schedule']
+    assert len(columns) == 5
+    assert len(rows) == len(pd.read_excel(path, sheet_name='Dynamic Schedule')) == 10
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'openpyxl'])
+def test_stale_dimension_reference_workbook(tmp_path, reference_workbook, engine):
+    from openpyxl import load_workbook
+
+    # Enregistré par openpyxl, le classeur déclare ses dimensions
+    saved = tmp_path / 'saved.xlsx'
+    load_workbook(reference_workbook).save(saved)
+    path = _stale_dimensions(saved, tmp_path / 'stale.xlsx')
+    expected = ExcelProcessor(reference_workbook, engine=engine).process_with_error_handling()
+    courses = ExcelProcessor(path, engine=engine).process_with_error_handling()
+    assert courses is not None
+    assert [course.to_dict() for course in courses] == [course.to_dict() for course in expected]
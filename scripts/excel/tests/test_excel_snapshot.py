@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from excel_models import Course
+from excel_occurrences import minute_of_week
+from excel_processor import ExcelProcessor
+from excel_snapshot import FILTER_COLUMNS, CourseSnapshot, write_snapshot
+
+NAN = float('nan')
+
+# Cellules vides ou NaN laissées par pandas dans les colonnes du classeur
+INCOMPLETE_COURSES = [
+    Course('Ann', 'ABG', 'MW', 'Monday', NAN, NAN, '', 'dynamic'),
+    Course('Ann', '', 'MW', 'Wednesday', '7:30pm', '', NAN, 'dynamic'),
+    Course(NAN, 'IG', 'TT', 'Tuesday', '8:00pm', 'https://zoom.us/j/2', -1001, 'fixed'),
+    Course('', 'BBG', '', NAN, '', None, None, 'fixed'),
+]
+
+
+def _key(value):
+    # NaN != NaN: comparaison par la forme JSON, comme le dictionnaire de l'instantané
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+@pytest.fixture
+def courses(reference_workbook):
+    processor = ExcelProcessor(reference_workbook)
+    return list(processor.iter_courses()) + INCOMPLETE_COURSES
+
+
+@pytest.fixture
+def snapshot(courses, tmp_path):
+    path = tmp_path / 'courses.ksnap'
+    write_snapshot(courses, str(path))
+    with CourseSnapshot(str(path)) as snapshot:
+        yield snapshot
+
+
+def test_records_match_course_dicts(courses, snapshot):
+    assert len(snapshot) == len(courses)
+    assert _key([course.to_dict() for course in snapshot]) == _key([course.to_dict() for course in courses])
+    assert _key(snapshot[-1].to_dict()) == _key(courses[-1].to_dict())
+    minutes = [minute_of_week(course['dayOfWeek'], course['time']) for course in courses]
+    assert snapshot.column('minuteOfWeek') == minutes
+
+
+def _expected(courses, **criteria):
+    return [position for position, course in enumerate(courses)
+            if all(_key(course.to_dict()[FILTER_COLUMNS[criterion]]) == _key(wanted)
+                   for criterion, wanted in criteria.items())]
+
+
+def test_filter_by_coach_and_day(courses, snapshot):
+    coaches = {_key(course['professorName']): course['professorName'] for course in courses}
+    days = {_key(course['dayOfWeek']): course['dayOfWeek'] for course in courses}
+    assert len(coaches) > 2 and len(days) > 2
+    for coach in coaches.values():
+        assert snapshot.filter(coach=coach) == _expected(courses, coach=coach)
+        for day in days.values():
+            assert snapshot.filter(coach=coach, day=day) == _expected(courses, coach=coach, day=day)
+    for day in days.values():
+        assert snapshot.filter(day=day) == _expected(courses, day=day)
+
+
+def test_filter_missing_values(courses, snapshot):
+    first = len(courses) - len(INCOMPLETE_COURSES)
+    assert snapshot.filter(coach=NAN) == [first + 2]
+    assert snapshot.filter(coach='', day=NAN) == [first + 3]
+    assert snapshot.filter(coach='Ann', level='') == [first + 1]
+    assert snapshot.filter(coach='Personne') == []
@@ -0,0 +1,86 @@
+import sqlite3
+
+import pytest
+
+from excel_models import Course
+from excel_sqlite import write_courses
+
+# Table courses telle que créée par l'application (data/edutrack.db)
+COURSES_TABLE = """
+CREATE TABLE courses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    instructor TEXT NOT NULL,
+    dayOfWeek TEXT NOT NULL,
+    time TEXT NOT NULL,
+    zoomLink TEXT,
+    courseNumber TEXT,
+    professorName TEXT,
+    level TEXT,
+    schedule TEXT,
+    telegramGroup TEXT,
+    zoomId TEXT,
+    startDateTime TEXT,
+    duration INTEGER
+)
+"""
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'edutrack.db')
+    connection = sqlite3.connect(path)
+    connection.execute(COURSES_TABLE)
+    connection.commit()
+    connection.close()
+    return path
+
+
+def _courses(zoom='https://zoom.us/j/1'):
+    return [
+        Course('Ann', 'ABG', 'MW', 'Monday', '7:30pm', zoom, '', 'dynamic').to_dict(),
+        Course('Ann', 'ABG', 'MW', 'Wednesday', '7:30pm', zoom, '', 'dynamic').to_dict(),
+        Course('Bob', 'IG', 'TT', 'Tuesday', '8:00pm', '', -1001, 'fixed').to_dict(),
+    ]
+
+
+def _rows(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return connection.execute("SELECT id, dayOfWeek, zoomLink FROM courses ORDER BY id").fetchall()
+    finally:
+        connection.close()
+
+
+def _indexes(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return [name for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'courses'")]
+    finally:
+        connection.close()
+
+
+def test_updates_existing_rows_by_identity(db_path):
+    assert write_courses(_courses(), db_path) == {'created': 3, 'updated': 0, 'unchanged': 0}
+    ids = [row[0] for row in _rows(db_path)]
+
+    assert write_courses(_courses(), db_path) == {'created': 0, 'updated': 0, 'unchanged': 3}
+    assert write_courses(_courses('https://zoom.us/j/2'), db_path) == {'created': 0, 'updated': 2, 'unchanged': 1}
+    rows = _rows(db_path)
+    assert [row[0] for row in rows] == ids
+    assert [row[2] for row in rows] == ['https://zoom.us/j/2', 'https://zoom.us/j/2', '']
+
+
+def test_schema_is_left_unchanged(db_path):
+    write_courses(_courses(), db_path)
+    assert _indexes(db_path) == []
+
+    # L'import par nom de l'application peut toujours insérer une ligne de même identité
+    connection = sqlite3.connect(db_path)
+    connection.execute("INSERT INTO courses (name, instructor, dayOfWeek, time, professorName, level, schedule) "
+                       "VALUES ('Ann - ABG - MW - 7:30pm', 'Kodjo', 'Monday', '7:30pm', 'Ann', 'ABG', 'MW')")
+    connection.commit()
+    connection.close()
+    assert write_courses(_courses(), db_path)['created'] == 0
+
@@ -0,0 +1,68 @@
+import pytest
+
+from excel_processor import ExcelProcessor
+from excel_titles import TitleTokenizer
+
+# (titre, (pattern, niveau, heure) attendus). Pattern et niveau sont des mots
+# entiers: les titres marqués "changé" donnaient un autre résultat avec l'ancienne
+# recherche par sous-chaîne.
+TITLE_CORPUS = [
+    ("Salma Choufani - ABG - SS - 2:00pm", ('SS', 'ABG', '2:00pm')),
+    ("Jahnvi Mahtani - IG - SS - 11:00am", ('SS', 'IG', '11:00am')),
+    ("Ann - BBG - MW - 7:30pm", ('MW', 'BBG', '7:30pm')),
+    ("Bob - IG - TT - 8:00 PM", ('TT', 'IG', '8:00 PM')),
+    ("Cid - ABG - FS - 10:15 am", ('FS', 'ABG', '10:15 am')),
+    ("A-IG-TT-7:30pm", ('TT', 'IG', '7:30pm')),
+    ("X - BBG/FS - 10:00am", ('FS', 'BBG', '10:00am')),
+    ("X - ABG - SS2 - 1:00pm", ('SS', 'ABG', '1:00pm')),
+    # Plusieurs patterns ou niveaux: l'ordre des listes fixe la priorité; première heure
+    ("X - IG ABG - TT MW - 7:30pm 8:00pm", ('MW', 'ABG', '7:30pm')),
+    # Changé: 'SS' dans "CLASS", 'IG' dans "BIGGER", 'SS' dans "JESSICA"
+    ("CLASS IG 8:00pm", (None, 'IG', '8:00pm')),
+    ("BIGGER - ABG - MW - 7:30pm", ('MW', 'ABG', '7:30pm')),
+    ("BIGGER - MW - 7:30pm", ('MW', None, '7:30pm')),
+    ("JESSICA - ABG - Sunday", (None, 'ABG', None)),
+    ("Jessica - ABG - Sunday", (None, 'ABG', None)),
+    # Changé: mots collés
+    ("X - ABGMW - 9:00am", (None, None, '9:00am')),
+    # Sans heure reconnue
+    ("Dan - ABG - SS - 19h30", ('SS', 'ABG', None)),
+    ("Dan - ABG - SS - 7pm", ('SS', 'ABG', None)),
+    ("", (None, None, None)),
+    ("misc", (None, None, None)),
+    (None, (None, None, None)),
+    (7, (None, None, None)),
+    (float('nan'), (None, None, None)),
+]
+
+
+@pytest.fixture(scope='module')
+def tokenizer():
+    processor = ExcelProcessor(None)
+    return TitleTokenizer(processor.schedule_patterns, processor.course_level_patterns, processor.time_pattern)
+
+
+@pytest.mark.parametrize('title, expected', TITLE_CORPUS)
+def test_parse(tokenizer, title, expected):
+    assert tokenizer.parse(title) == expected
+
+
+def test_parse_many_matches_parse(tokenizer):
+    titles = [title for title, _ in TITLE_CORPUS] * 3
+    patterns, levels, times = tokenizer.parse_many(titles)
+    assert list(zip(patterns, levels, times)) == [expected for _, expected in TITLE_CORPUS] * 3
+
+
+def test_processor_helpers_use_tokenizer():
+    processor = ExcelProcessor(None)
+    for title, (pattern, level, time) in TITLE_CORPUS:
+        if not isinstance(title, str):
+            continue
+        assert processor.extract_course_pattern(title) == pattern
+        assert processor.extract_course_level(title) == level
+        assert processor.extract_time(title) == time
+
+
+def test_pattern_regex_matches_whole_words(tokenizer):
+    assert tokenizer.pattern_regex.search("ABG MW 7:30pm")
+    assert not tokenizer.pattern_regex.search("CLASS IG 8:00pm")
@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import excel_worker
+from excel_worker import WorkerPool, _JobState
+
+
+class _Process:
+    def __init__(self, future, dies=True):
+        self.future = future
+        self.dies = dies
+        self.killed = False
+
+    def kill(self):
+        self.killed = True
+        if self.dies:
+            self.future.set_exception(BrokenProcessPool("Processus tué"))
+
+
+class _Executor:
+    def __init__(self, processes):
+        self._processes = processes
+        self.stopped = False
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.stopped = True
+
+
+def _pool(executor):
+    # Pool sans processus: seul l'arrêt d'un job est testé
+    pool = WorkerPool.__new__(WorkerPool)
+    pool._lock = threading.Lock()
+    pool._cancelled = {}
+    pool._executor = executor
+    pool._start = lambda: 'nouveau pool'
+    return pool
+
+
+def _running_job():
+    state = _JobState('42', None)
+    state.future = Future()
+    state.future.set_running_or_notify_cancel()
+    return state
+
+
+@pytest.fixture(autouse=True)
+def short_grace(monkeypatch):
+    monkeypatch.setattr(excel_worker, 'CANCEL_GRACE', 0.05)
+
+
+@pytest.mark.parametrize('dies', [True, False])
+def test_stop_without_pid_kills_and_recycles_pool(dies):
+    state = _running_job()
+    processes = {1: _Process(state.future, dies), 2: _Process(state.future, dies=False)}
+    executor = _Executor(processes)
+    pool = _pool(executor)
+
+    assert pool._stop(state, executor) == {'ok': False}
+    assert pool._cancelled == {'42': True}
+    assert all(process.killed for process in processes.values())
+    assert executor.stopped
+    assert pool._executor == 'nouveau pool'
+
+
+def test_stop_returns_response_of_cooperative_job():
+    state = _running_job()
+    executor = _Executor({})
+    pool = _pool(executor)
+    threading.Timer(0.01, state.future.set_result, [{'ok': False, 'status': 'cancelled'}]).start()
+
+    assert pool._stop(state, executor) == {'ok': False, 'status': 'cancelled'}
+    assert not executor.stopped
@@ -1,4 +1,3 @@
-import pandas as pd
 import json
 import os
 import re
@@ -33,6 +32,9 @@ class ExcelProcessor:
         self.schedule_patterns = ['MW', 'TT', 'SS', 'FS']
         self.time_pattern = r'(\d+:\d+\s*(?:AM|PM|am|pm))'
         
+        # Une cellule décrit un cours si elle contient un pattern de planning
+        self.course_token_regex = '|'.join(re.escape(pattern) for pattern in self.schedule_patterns)
+        
     def validate_excel_structure(self, df, sheet_name):
         """
         Vérifie la structure du fichier Excel
@@ -61,6 +63,9 @@ class ExcelProcessor:
         Returns:
             dict: Un dictionnaire contenant les DataFrames pour chaque feuille pertinente
         """
+        # pandas n'est importé qu'au chargement d'un classeur (démarrage rapide)
+        import pandas as pd
+        
         try:
             # Lire le fichier Excel
             excel_data = pd.ExcelFile(self.excel_path, engine='openpyxl')
@@ -71,19 +76,16 @@ class ExcelProcessor:
             # Traiter chaque feuille
             for sheet_name in sheet_names:
                 if "Schedule" in sheet_name:
-                    df = pd.read_excel(
-                        self.excel_path,
-                        sheet_name=sheet_name,
-                        engine='openpyxl'
-                    )
+                    # Valider la structure d'après la ligne d'en-tête seule, avant de lire la feuille
+                    header = excel_data.parse(sheet_name, nrows=0)
+                    if not self.validate_excel_structure(header, sheet_name):
+                        logger.warning(f"Structure invalide pour la feuille '{sheet_name}', ignorée "
+                                       f"(les feuilles Dynamic/Fix sont traitées par scripts/excel/excel_processor.py)")
+                        continue
                     
-                    # Valider la structure
-                    if self.validate_excel_structure(df, sheet_name):
-                        # Nettoyer les données
-                        df = self.clean_data(df)
-                        data_frames[sheet_name] = df
-                    else:
-                        logger.warning(f"Structure invalide pour la feuille '{sheet_name}', ignorée")
+                    # Nettoyer les données
+                    df = self.clean_data(excel_data.parse(sheet_name))
+                    data_frames[sheet_name] = df
             
             if not data_frames:
                 logger.error("Aucune feuille valide trouvée dans le fichier Excel")
@@ -178,6 +180,41 @@ class ExcelProcessor:
         
         return pattern_to_days.get(pattern, [])
     
+    def find_course_cells(self, df, rows):
+        """
+        Repère les cellules de cours d'une grille coach x créneaux
+        
+        Les cellules texte des lignes retenues sont mises à plat (ligne par
+        ligne) et testées en une seule passe vectorisée: seules les cellules
+        qui contiennent un pattern de cours sont renvoyées, le coût suit le
+        nombre de cellules remplies plutôt que la surface de la grille.
+        
+        Args:
+            df (DataFrame): La feuille nettoyée
+            rows (list): Positions des lignes à examiner (lignes avec un coach)
+            
+        Returns:
+            list: Couples (position de la ligne, texte de la cellule), dans l'ordre lignes puis colonnes
+        """
+        import pandas as pd
+        
+        # Seules les colonnes de type object peuvent contenir du texte
+        text_columns = [col for col in df.columns if df[col].dtype == object]
+        if not rows or not text_columns:
+            return []
+        
+        cells = pd.Series(df[text_columns].to_numpy(dtype=object)[rows].ravel())
+        try:
+            matches = cells.str.contains(self.course_token_regex, na=False)
+        except AttributeError:
+            # Aucune cellule texte
+            return []
+        
+        positions = matches.to_numpy().nonzero()[0]
+        values = cells.to_numpy()
+        width = len(text_columns)
+        return [(rows[position // width], values[position]) for position in positions]
+    
     def process_course_data(self, data_frames):
         """
         Traite les données des cours à partir des DataFrames
@@ -193,49 +230,46 @@ class ExcelProcessor:
         for sheet_name, df in data_frames.items():
             schedule_type = "dynamic" if "Dynamic" in sheet_name else "fixed"
             
-            # Obtenir l'index de la première ligne avec des données
-            start_row = 0
-            while start_row < len(df) and not df.iloc[start_row][self.dynamic_sheet_columns['coach_name']]:
-                start_row += 1
+            coach_names = df[self.dynamic_sheet_columns['coach_name']].tolist()
+            coach_emails = df[self.dynamic_sheet_columns['coach_email']].tolist()
+            group_column = self.dynamic_sheet_columns['telegram_group']
+            groups = df[group_column].tolist() if group_column in df.columns else [''] * len(df)
             
-            for idx, row in df.iloc[start_row:].iterrows():
-                coach_name = row[self.dynamic_sheet_columns['coach_name']]
-                coach_email = row[self.dynamic_sheet_columns['coach_email']]
+            # Lignes qui contiennent un coach
+            coach_rows = [idx for idx, coach_name in enumerate(coach_names)
+                          if isinstance(coach_name, str) and coach_name.strip()]
+            
+            parsed = {}
+            for row_idx, cell_value in self.find_course_cells(df, coach_rows):
+                if cell_value not in parsed:
+                    parsed[cell_value] = (self.extract_course_pattern(cell_value),
+                                          self.extract_course_level(cell_value),
+                                          self.extract_time(cell_value))
+                course_pattern, course_level, course_time = parsed[cell_value]
                 
-                # Vérifier si cette ligne contient un coach
-                if isinstance(coach_name, str) and coach_name.strip():
-                    # Parcourir toutes les colonnes pour trouver les cours
-                    for col in df.columns:
-                        cell_value = row[col]
+                # Si les informations essentielles sont présentes
+                if course_pattern and course_level and course_time:
+                    coach_name = coach_names[row_idx]
+                    days = self.extract_days_from_pattern(course_pattern)
+                    
+                    # Créer un cours pour chaque jour
+                    for day_idx, day in enumerate(days):
+                        course = {
+                            'name': f"{coach_name} - {course_level} - {course_pattern} - {course_time}",
+                            'coach': coach_name,
+                            'level': course_level,
+                            'schedule_pattern': course_pattern,
+                            'day_of_week': day,
+                            'time': course_time,
+                            'coach_email': coach_emails[row_idx],
+                            'schedule_type': schedule_type,
+                            'telegram_group': groups[row_idx],
+                            'zoom_link': '',  # Sera rempli ultérieurement
+                            'description': f"Cours de {course_level} avec {coach_name}, {course_pattern} à {course_time}"
+                        }
                         
-                        # Si la cellule n'est pas vide et contient un pattern de cours
-                        if isinstance(cell_value, str) and any(pattern in cell_value for pattern in self.schedule_patterns):
-                            course_pattern = self.extract_course_pattern(cell_value)
-                            course_level = self.extract_course_level(cell_value)
-                            course_time = self.extract_time(cell_value)
-                            
-                            # Si les informations essentielles sont présentes
-                            if course_pattern and course_level and course_time:
-                                days = self.extract_days_from_pattern(course_pattern)
-                                
-                                # Créer un cours pour chaque jour
-                                for day_idx, day in enumerate(days):
-                                    course = {
-                                        'name': f"{coach_name} - {course_level} - {course_pattern} - {course_time}",
-                                        'coach': coach_name,
-                                        'level': course_level,
-                                        'schedule_pattern': course_pattern,
-                                        'day_of_week': day,
-                                        'time': course_time,
-                                        'coach_email': coach_email,
-                                        'schedule_type': schedule_type,
-                                        'telegram_group': row.get(self.dynamic_sheet_columns['telegram_group'], ''),
-                                        'zoom_link': '',  # Sera rempli ultérieurement
-                                        'description': f"Cours de {course_level} avec {coach_name}, {course_pattern} à {course_time}"
-                                    }
-                                    
-                                    courses.append(course)
-                                    logger.info(f"Cours extrait: {course['name']} (Jour {day})")
+                        courses.append(course)
+                        logger.info(f"Cours extrait: {course['name']} (Jour {day})")
         
         return courses
     
@@ -1184,11 +1184,14 @@ export async function registerRoutes(app: Express): Promise<Server> {
       console.log(`Importing Excel file from: ${filePath}`);
 
       // Fonction pour exécuter le script Python
-      const processExcelFile = (excelPath: string): Promise<string> => {
+      const processExcelFile = (excelPath: string, conflictsPath: string): Promise<string> => {
         return new Promise((resolve, reject) => {
           console.log(`Traitement du fichier Excel: ${excelPath}`);
 
-          const args = [pathModule.resolve('./scripts/excel/excel_processor.py'), excelPath];
+          const args = [
+            pathModule.resolve('./scripts/excel/excel_processor.py'), excelPath,
+            '--conflicts-output', conflictsPath
+          ];
 
           const pythonProcess = spawn('python', args, { stdio: ['pipe', 'pipe', 'pipe'] });
 
@@ -1224,8 +1227,9 @@ export async function registerRoutes(app: Express): Promise<Server> {
         });
       };
 
-      // Process the Excel file
-      const jsonPath = await processExcelFile(filePath);
+      // Process the Excel file (with the schedule conflicts report: coach double-booking, shared Zoom links)
+      const conflictsPath = pathModule.resolve(`temp_conflicts_${Date.now()}.json`);
+      const jsonPath = await processExcelFile(filePath, conflictsPath);
 
       // Load the courses from the JSON file
       const loadCoursesFromJson = async (jsonPath: string) => {
@@ -1275,10 +1279,19 @@ export async function registerRoutes(app: Express): Promise<Server> {
       };
       const results = await updateCoursesInDatabase(courses);
 
+      let conflicts = null;
+      try {
+        conflicts = JSON.parse(await fs.promises.readFile(conflictsPath, 'utf8'));
+      } catch (err) {
+        console.warn("Warning: Could not read conflicts report:", err);
+      }
+
       // Clean up temporary files
       try {
-        if (fs.existsSync(jsonPath)) {
-          fs.unlinkSync(jsonPath);
+        for (const tempPath of [jsonPath, conflictsPath]) {
+          if (fs.existsSync(tempPath)) {
+            fs.unlinkSync(tempPath);
+          }
         }
       } catch (err) {
         console.warn("Warning: Could not delete temporary file:", err);
@@ -1288,7 +1301,8 @@ export async function registerRoutes(app: Express): Promise<Server> {
       return res.status(200).json({
         success: true,
         message: `Excel import completed successfully: ${results.created + results.updated + results.errors} courses processed`,
-        details: results
+        details: results,
+        conflicts
       });
     } catch (error) {
       handleError(error, res);